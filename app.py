@@ -9,10 +9,32 @@ import cv2
 from PIL import Image
 import io
 import base64
+import hashlib
 import threading
 import queue
 import plotly.express as px
 
+from modules.archive import MonthArchive, keys_between, month_key
+from modules.atomic_files import atomic_write
+from modules.attendance_log import AttendanceLog
+from modules.attendance_store import SQLiteAttendanceStore
+from modules.checkin_index import CheckinIndex
+from modules.data_cleaning import entry_time_micros, format_hhmm
+from modules.employee_directory import EmployeeDirectory
+from modules.excel_renderer import status_stats_lines, write_styled_report
+from modules.frame_cache import FrameCache
+from modules.ingest_server import IngestServer
+from modules.ingestion import INGEST_LOCK, ingest_batch, new_processing_details, time_based_statuses
+from modules.metrics import Metrics
+from modules.model_registry import ModelRegistry
+from modules.predict_attendance import predict_attendance
+from modules.report_manifest import frame_digest, manifest_status, record_report, report_is_fresh
+from modules.report_worker import DebouncedWorker
+from modules.schema import concat_typed, filter_dates, from_typed, to_typed
+from modules.spool import FAILED_DIR, SpoolConsumer, write_spool_batch
+from modules.status_lookup import get_status_lookup
+from modules.status_summary import summarize_status_counts
+
 # Set page config
 st.set_page_config(
     page_title="MSN Global IT - AI Attendance System",
@@ -34,14 +56,16 @@ if 'camera_active' not in st.session_state:
     st.session_state.camera_active = False
 if 'face_detection_active' not in st.session_state:
     st.session_state.face_detection_active = False
-if 'refresh_timestamp' not in st.session_state:
-    st.session_state.refresh_timestamp = 0
 if 'last_face_check' not in st.session_state:
     st.session_state.last_face_check = 0
 if 'uploaded_csv_data' not in st.session_state:
     st.session_state.uploaded_csv_data = None
 if 'uploaded_csv_filename' not in st.session_state:
     st.session_state.uploaded_csv_filename = None
+if 'uploaded_csv_digest' not in st.session_state:
+    st.session_state.uploaded_csv_digest = None
+if 'csv_uploader_key' not in st.session_state:
+    st.session_state.csv_uploader_key = 0
 if 'last_notification' not in st.session_state:
     st.session_state.last_notification = None
 if 'notification_type' not in st.session_state:
@@ -169,8 +193,326 @@ st.markdown("""
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-EXCEL_DIR = os.path.join(BASE_DIR, 'excels')
+# ATTENDANCE_EXCEL_DIR / ATTENDANCE_SHARED_DIR relocate the app's data (benchmarks run against a scratch copy)
+EXCEL_DIR = os.environ.get('ATTENDANCE_EXCEL_DIR') or os.path.join(BASE_DIR, 'excels')
 os.makedirs(EXCEL_DIR, exist_ok=True)
+ATTENDANCE_LOG_DIR = os.path.join(EXCEL_DIR, 'logs')
+ATTENDANCE_DB = os.path.join(EXCEL_DIR, 'attendance.db')
+# 'sqlite' (indexed, default) or 'log' (append-only JSON lines)
+ATTENDANCE_BACKEND = os.environ.get('ATTENDANCE_BACKEND', 'sqlite')
+CHECKIN_INDEX_FILE = os.path.join(EXCEL_DIR, 'checkin_index.json')
+# Closed months compacted into one columnar file per month (modules.archive)
+ARCHIVE_DIR = os.path.join(EXCEL_DIR, 'archive')
+REPORT_MANIFEST = os.path.join(EXCEL_DIR, 'report_manifest.json')
+# Directory shared with the face recognition app
+SHARED_DIR = os.environ.get('ATTENDANCE_SHARED_DIR') or os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared')
+# Attendance CSV written by the face recognition app
+ATTENDANCE_CSV = os.path.join(SHARED_DIR, 'attendance_log.csv')
+# Recognized-ID batches handed over by the face recognition app: complete files renamed
+# into the spool directory (modules.spool.write_spool_batch); the legacy single JSON file
+# is still adopted into the spool when a producer writes it
+RECOGNIZED_ID_FILE = os.path.join(SHARED_DIR, 'recognized_id.json')
+SPOOL_DIR = os.path.join(SHARED_DIR, 'spool')
+EMPLOYEE_CSV = os.path.join(SHARED_DIR, 'employees_data.csv')
+# Matches shown by the Manual Attendance employee search
+EMPLOYEE_PICKER_LIMIT = 20
+# Roster used until an employee CSV is uploaded
+DEFAULT_EMPLOYEES = pd.DataFrame({
+    'Employee ID': ['MSN001', 'MSN002', 'MSN003', 'MSN004', 'MSN005', 'MSN006', 'MSN007', 'MSN009'],
+    'Name': ['Ramsha Tariq', 'Tehreem Siddiqui', 'Rayyan Ahmad', 'Maryam Sheikh', 'Samreen Fatima', 'Taskeen Abbas', 'Muhammad Shaf', 'Hammad Hassan']
+})
+# Local HTTP ingestion endpoint (POST /events, GET /stats); port 0 disables it
+INGEST_PORT = int(os.environ.get('ATTENDANCE_INGEST_PORT', '8765'))
+# Set ATTENDANCE_METRICS_FILE to also write the Prometheus metrics to a textfile (node_exporter)
+METRICS_FILE = os.environ.get('ATTENDANCE_METRICS_FILE')
+# Cleared entries stay recoverable (Undo Clear) this long before compaction drops them
+UNDO_WINDOW_SECONDS = float(os.environ.get('ATTENDANCE_UNDO_WINDOW', '600'))
+# Live widgets (metrics, Today's Attendance, notifications) re-render on this timer via fragments
+LIVE_REFRESH_SECONDS = float(os.environ.get('ATTENDANCE_LIVE_REFRESH', '2'))
+# Status model and its compiled minute-of-day lookup table
+RF_MODEL_PATH = os.path.join(SHARED_DIR, 'best_rf_model.pkl')
+STATUS_LOOKUP_FILE = os.path.join(EXCEL_DIR, 'status_lookup.npz')
+# Set VALIDATE_STATUS_LOOKUP=1 to check every lookup against live model.predict
+VALIDATE_STATUS_LOOKUP = os.environ.get('VALIDATE_STATUS_LOOKUP') == '1'
+
+# Attendance store - one instance per process, shared by all sessions
+@st.cache_resource
+def get_attendance_store(backend=ATTENDANCE_BACKEND):
+    if backend == 'log':
+        return AttendanceLog(ATTENDANCE_LOG_DIR)
+    return SQLiteAttendanceStore(ATTENDANCE_DB)
+
+# Per-stage counters and latency histograms (Performance panel, GET /metrics)
+@st.cache_resource
+def get_metrics():
+    metrics = Metrics()
+    if METRICS_FILE:
+        metrics.start_textfile_writer(METRICS_FILE)
+    return metrics
+
+# Loaded ML models - one per model file version, shared by all sessions
+@st.cache_resource
+def get_model_registry():
+    return ModelRegistry()
+
+# Employee master indexed by ID, re-read only when the CSV changes
+@st.cache_resource
+def get_employee_directory():
+    return EmployeeDirectory(EMPLOYEE_CSV, DEFAULT_EMPLOYEES)
+
+# Parsed attendance frames keyed by the store files' stat() signature
+@st.cache_resource
+def get_frame_cache():
+    return FrameCache()
+
+def cached_attendance(key, month_year, loader):
+    """Serve a value derived from the month's attendance from the shared frame cache"""
+    store = get_attendance_store()
+    return get_frame_cache().get(key, store.source_paths(month_year), loader)
+
+def invalidate_attendance_cache():
+    """Called by the write path after every change to the attendance store"""
+    get_frame_cache().invalidate()
+
+# Who-checked-in-today index shared by all sessions; built once per process
+@st.cache_resource
+def get_checkin_index():
+    month_year = get_month_year()
+    index = CheckinIndex(CHECKIN_INDEX_FILE)
+    index.sync_store(get_month_store(month_year), month_year)
+    index.sync_csv(ATTENDANCE_CSV)
+    index.save()
+    return index
+
+def regenerate_reports(store, month_year):
+    """Rebuild a month's Attendance_Report and Monthly_Employee_Report workbooks"""
+    df = store.load(month_year)
+    if df.empty:
+        return
+    create_styled_excel_report(df[['Employee ID', 'Name', 'Status']], f'Attendance_Report_{month_year}.xlsx')
+    
+    employee_df = load_employee_data()
+    if employee_df is not None and not employee_df.empty:
+        summary_df = build_monthly_summary(df, employee_df)
+        create_styled_excel_report(summary_df, f'Monthly_Employee_Report_{month_year}.xlsx')
+
+# Report rebuilds run in the background once marks go quiet for a couple of seconds
+@st.cache_resource
+def get_report_worker():
+    store = get_attendance_store()
+    return DebouncedWorker(lambda month_year: regenerate_reports(store, month_year),
+                           quiet_period=2.0, max_delay=30.0, name='report-worker')
+
+# Tombstone compactor - drops cleared records for good once their undo window has passed
+@st.cache_resource
+def get_tombstone_compactor():
+    store = get_attendance_store()
+
+    def compact(_):
+        removed = store.compact(min_age=UNDO_WINDOW_SECONDS)
+        if removed:
+            print(f"✅ Compacted {removed} cleared record(s)")
+        if store.tombstones():
+            worker.request()  # a newer clear is still inside its undo window
+
+    worker = DebouncedWorker(compact, quiet_period=UNDO_WINDOW_SECONDS, max_delay=UNDO_WINDOW_SECONDS,
+                             name='tombstone-compactor')
+    worker.request()  # clears left over from a previous run
+    return worker
+
+# Spool consumer - ingests recognized-ID batches in the background as soon as they land
+@st.cache_resource
+def get_spool_consumer():
+    return SpoolConsumer(
+        SPOOL_DIR,
+        ingest_face_recognition_entries,
+        legacy_file=RECOGNIZED_ID_FILE,
+        observe=get_metrics().observe,
+        # Keep the batch for a retry unless every entry was saved or deduplicated
+        accept=lambda outcome: not outcome[0]["failed_entries"]
+    )
+
+# Ingestion server - detection events over localhost HTTP, group-committed by a worker thread
+@st.cache_resource
+def get_ingest_server():
+    if not INGEST_PORT:
+        return None
+    try:
+        return IngestServer(
+            ingest_face_recognition_entries,
+            port=INGEST_PORT,
+            observe=get_metrics().observe,
+            metrics_text=get_metrics().prometheus_text,
+            # Batches that keep failing wait with the spool's failed batches for "Retry Failed Batches"
+            dead_letter=lambda entries: write_spool_batch(SPOOL_DIR, entries, FAILED_DIR)
+        )
+    except OSError as e:
+        print(f"⚠️ Ingestion server not started on port {INGEST_PORT}: {e}")
+        return None
+
+# Month archive - a background thread compacts every closed month once
+@st.cache_resource
+def get_month_archive():
+    archive = MonthArchive(ARCHIVE_DIR)
+    threading.Thread(target=compact_closed_months, args=(archive,), name='archive-compactor', daemon=True).start()
+    return archive
+
+def known_months():
+    """Every month with attendance in the store or as a raw workbook, oldest first"""
+    months = set(get_attendance_store().months())
+    for filename in os.listdir(EXCEL_DIR):
+        if filename.startswith('Attendance_Raw_') and filename.endswith('.xlsx'):
+            months.add(filename[len('Attendance_Raw_'):-len('.xlsx')])
+    keyed = {}
+    for month_year in months:
+        try:
+            keyed[month_key(month_year)] = month_year
+        except ValueError:
+            continue
+    return [keyed[key] for key in sorted(keyed)]
+
+def compact_closed_months(archive):
+    """Compact every month before the current one that is not archived yet"""
+    current = month_key(get_month_year())
+    for month_year in known_months():
+        if month_key(month_year) >= current or archive.has_month(month_year):
+            continue
+        try:
+            df = get_month_store(month_year).load(month_year)
+            if not df.empty:
+                entry = archive.compact(month_year, to_typed(df))
+                print(f"✅ Archived {month_year}: {entry['rows']} rows")
+        except Exception as e:
+            print(f"⚠️ Could not archive {month_year}: {e}")
+
+def query_attendance(start=None, end=None, emp_id=None, status=None, columns=None):
+    """
+    Typed attendance rows (modules.schema) across months: archived months are
+    read from their partitions, the rest (the current month and anything not
+    compacted yet) from the attendance store.
+    """
+    archive = get_month_archive()
+    archived = archive.query(start, end, emp_id, status, columns)
+    keyed = {month_key(month_year): month_year for month_year in known_months() if not archive.has_month(month_year)}
+    frames = [archived]
+    for key in keys_between(keyed, start, end):
+        df = load_month_attendance(keyed[key])
+        if df.empty:
+            continue
+        typed = filter_dates(to_typed(df), start, end)
+        if emp_id is not None:
+            typed = typed[typed['Employee ID'] == str(emp_id)]
+        if status is not None:
+            typed = typed[typed['Status'] == status]
+        frames.append(typed[archived.columns].reset_index(drop=True))
+    return concat_typed(frames)[archived.columns]
+
+def get_raw_file(month_year=None):
+    """Path of the monthly raw attendance workbook (an export of the attendance store)"""
+    return os.path.join(EXCEL_DIR, f'Attendance_Raw_{month_year or get_month_year()}.xlsx')
+
+def get_month_store(month_year):
+    """Attendance store for a month, importing a raw workbook written before the store existed"""
+    store = get_attendance_store()
+    if not store.has_segment(month_year):
+        store.import_excel(get_raw_file(month_year), month_year)
+    return store
+
+def has_month_attendance(month_year=None):
+    """Whether any attendance has been recorded for the month"""
+    month_year = month_year or get_month_year()
+    return cached_attendance(
+        ('has_month', month_year), month_year,
+        lambda: get_month_store(month_year).has_segment(month_year)
+    )
+
+def load_month_attendance(month_year=None):
+    """Load a month's attendance records (cached; treat the frame as read-only)"""
+    month_year = month_year or get_month_year()
+    return cached_attendance(
+        ('month', month_year), month_year,
+        lambda: get_month_store(month_year).load(month_year)
+    )
+
+def load_today_attendance():
+    """Today's attendance records (cached indexed date lookup)"""
+    month_year, today_date = get_month_year(), get_today_date()
+    return cached_attendance(
+        ('day', today_date), month_year,
+        lambda: get_month_store(month_year).query(start=today_date, end=today_date)
+    )
+
+def get_today_status_counts():
+    """Today's status counts: {'Present': n, 'Late': n, 'Absent': n, 'Leave': n, 'Total': n}"""
+    month_year, today_date = get_month_year(), get_today_date()
+    return cached_attendance(
+        ('day_summary', today_date), month_year,
+        lambda: get_month_store(month_year).day_summary(today_date)
+    )
+
+def load_live_snapshot():
+    """
+    Everything the live widgets show for today, rebuilt only when the attendance
+    store changes and shared by every open dashboard.
+    """
+    month_year, today_date = get_month_year(), get_today_date()
+
+    def build():
+        counts = {'Present': 0, 'Late': 0, 'Absent': 0, 'Leave': 0, 'Total': 0}
+        display_df = None
+        status_counts = {}
+        has_data = has_month_attendance(month_year)
+        if has_data:
+            counts = get_today_status_counts()
+            today_df = load_today_attendance()
+            if not today_df.empty:
+                # Show enhanced information including time
+                if 'Entry_Time' in today_df.columns:
+                    display_df = today_df[['Employee ID', 'Name', 'Status', 'Entry_Time']].copy()
+                    # Times and strings alike go through the columnar parser
+                    display_df['Entry_Time_Display'] = format_hhmm(entry_time_micros(display_df['Entry_Time']))
+                    display_df = display_df[['Employee ID', 'Name', 'Status', 'Entry_Time_Display']]
+                    display_df.columns = ['Employee ID', 'Name', 'Status', 'Entry Time']
+                else:
+                    display_df = today_df[['Employee ID', 'Name', 'Status']].copy()
+                status_counts = today_df['Status'].value_counts().to_dict()
+        return {
+            'has_data': has_data,
+            'counts': counts,
+            'display_df': display_df,
+            'status_counts': status_counts,
+            'version': get_frame_cache().version,
+            'built_at': datetime.now(),
+        }
+
+    return cached_attendance(('live', today_date), month_year, build)
+
+def export_raw_excel(month_year=None):
+    """Materialize the monthly raw Excel workbook from the attendance store"""
+    month_year = month_year or get_month_year()
+    return get_month_store(month_year).export_excel(month_year, get_raw_file(month_year))
+
+def append_attendance_record(record):
+    """Append one attendance record to the current month in the attendance store"""
+    append_attendance_records([record])
+
+def append_attendance_records(records):
+    """Append a batch of attendance records to the current month in one store write"""
+    month_year = get_month_year()
+    store = get_month_store(month_year)
+    metrics = get_metrics()
+    with metrics.time('store_write'):
+        store.append_many(records, month_year)
+    metrics.inc('records_written', len(records))
+    invalidate_attendance_cache()
+    index = get_checkin_index()
+    index.add_many((record['Employee ID'], record['Date']) for record in records)
+    index.mark_store_synced(store, month_year)
+
+def is_marked_today(emp_id):
+    """O(1) check against the check-in index whether an employee is marked for today"""
+    with get_metrics().time('duplicate_check'):
+        return get_checkin_index().contains(emp_id, get_today_date())
 
 # Default credentials - Only manager
 DEFAULT_ADMIN = {
@@ -190,8 +532,10 @@ def load_credentials():
 
 # Save credentials
 def save_credentials(credentials):
-    with open("credentials.json", 'w') as f:
-        json.dump(credentials, f, indent=2)
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(credentials, f, indent=2)
+    atomic_write("credentials.json", write)
 
 # Authenticate user
 def authenticate(username, password):
@@ -200,24 +544,8 @@ def authenticate(username, password):
 
 # Load employee data
 def load_employee_data():
-    # First check if we have uploaded CSV data in session state
-    if st.session_state.uploaded_csv_data is not None:
-        return pd.DataFrame(st.session_state.uploaded_csv_data)
-    
-    # Otherwise load from file
-    emp_file = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared', 'employees_data.csv')
-    if os.path.exists(emp_file):
-        try:
-            return pd.read_csv(emp_file)
-        except:
-            pass
-    
-    # Create default employee data with actual names
-    default_data = {
-        'Employee ID': ['MSN001', 'MSN002', 'MSN003', 'MSN004', 'MSN005', 'MSN006', 'MSN007', 'MSN009'],
-        'Name': ['Ramsha Tariq', 'Tehreem Siddiqui', 'Rayyan Ahmad', 'Maryam Sheikh', 'Samreen Fatima', 'Taskeen Abbas', 'Muhammad Shaf', 'Hammad Hassan']
-    }
-    return pd.DataFrame(default_data)
+    """Employee master from the shared directory (read-only frame, safe in background threads)"""
+    return get_employee_directory().frame()
 
 # Mark attendance
 def mark_attendance(emp_id, name):
@@ -227,126 +555,64 @@ def mark_attendance(emp_id, name):
     entry_time = now.replace(second=0, microsecond=0).time()
     
     # Use simple time-based prediction instead of RF model
-    status = fallback_time_based_prediction(entry_time)
+    with get_metrics().time('prediction'):
+        status = fallback_time_based_prediction(entry_time)
     
     print(f"⏰ Time-based prediction for {emp_id}: {entry_time.strftime('%H:%M')} - Status: {status}")
     
-    # Load existing data
-    raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-    
-    try:
-        if os.path.exists(raw_file):
-            df_existing = pd.read_excel(raw_file)
-        else:
-            df_existing = pd.DataFrame(columns=[
-                'Employee ID', 'Name', 'Date', 'Entry_Time', 'Status'
-            ])
-    except Exception as e:
-        print(f"Error loading existing data: {e}")
-        df_existing = pd.DataFrame(columns=[
-            'Employee ID', 'Name', 'Date', 'Entry_Time', 'Status'
-            ])
-
-    # Check for duplicate - more robust check
-    already_marked = False
-    if not df_existing.empty:
-        today_entries = df_existing[df_existing['Date'] == today_date_col]
-        if not today_entries.empty:
-            already_marked = (today_entries['Employee ID'] == emp_id).any()
-
-    if already_marked:
-        return False, f"Employee {name} ({emp_id}) already marked attendance today"
-
     # Create new record
-    new_record = pd.DataFrame([{
+    new_record = {
         'Employee ID': emp_id,
         'Name': name,
         'Date': today_date_col,
         'Entry_Time': entry_time,
         'Status': status
-    }])
+    }
 
-    # Save combined data
-    try:
-        df_combined = pd.concat([df_existing, new_record], ignore_index=True)
-        df_combined.to_excel(raw_file, index=False)
-        print(f"✅ Saved attendance data for {emp_id}")
-    except Exception as e:
-        print(f"❌ Error saving data: {e}")
-        return False, f"Failed to save attendance data for {name} ({emp_id})"
+    with INGEST_LOCK:
+        # Check for duplicate against the attendance store
+        if is_marked_today(emp_id):
+            return False, f"Employee {name} ({emp_id}) already marked attendance today"
+
+        # Append to the attendance store - the raw Excel file is exported from it on demand
+        try:
+            append_attendance_record(new_record)
+            print(f"✅ Saved attendance data for {emp_id}")
+        except Exception as e:
+            print(f"❌ Error saving data: {e}")
+            return False, f"Failed to save attendance data for {name} ({emp_id})"
     
-    # Auto-generate styled Excel report
-    try:
-        # Create actual file (without entry time, with colors)
-        actual_df = df_combined.drop('Entry_Time', axis=1, errors='ignore')
-        # Only keep ID, Name, Status for main Excel
-        actual_df = actual_df[['Employee ID', 'Name', 'Status']]
-        actual_filename = f'Attendance_Report_{get_month_year()}.xlsx'
-        
-        # Use the new styling function
-        create_styled_excel_report(actual_df, actual_filename)
-        
-        # Force cache clear for immediate display update
-        st.cache_data.clear()
-        
-        return True, f"Marked {name} ({emp_id}) as {status} at {entry_time.strftime('%H:%M')}"
-    except Exception as e:
-        print(f"Warning: Excel styling failed: {e}")
-        # Continue without styling
-        return True, f"Marked {name} ({emp_id}) as {status} at {entry_time.strftime('%H:%M')}"
+    # Regenerate the styled Excel reports in the background
+    get_report_worker().request(get_month_year())
     
-    return False, f"Failed to mark attendance for {name} ({emp_id})"
+    return True, f"Marked {name} ({emp_id}) as {status} at {entry_time.strftime('%H:%M')}"
 
 def predict_attendance_with_rf_model(emp_id, name, entry_time):
-    """Use the best RF model to predict attendance status"""
+    """Use the best RF model to predict attendance status (via its compiled lookup table)"""
     try:
-        # Load the best RF model
-        model_path = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared', 'best_rf_model.pkl')
-        
-        if not os.path.exists(model_path):
-            print(f"❌ RF model not found at: {model_path}")
-            # Fallback to simple time-based logic
-            return fallback_time_based_prediction(entry_time)
-        
-        # Load the model
-        model = joblib.load(model_path)
-        print(f"✅ RF model loaded successfully")
-        
-        # Create a sample DataFrame for prediction
-        sample_data = pd.DataFrame([{
-            'Employee ID': emp_id,
-            'Name': name,
-            'Date': get_today_date(),
-            'Entry_Time': entry_time
-        }])
-        
-        # Import the prediction function from the correct path
-        # Use the modules from face_recognition_app
-        face_recognition_modules_path = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'modules')
-        sys.path.insert(0, face_recognition_modules_path)  # Insert at beginning to prioritize
-        
-        # Clear any cached imports to force reload
-        import importlib
-        for module_name in ['predict_attendance', 'data_cleaning', 'feature_engineering', 'leave_calculator']:
-            if module_name in sys.modules:
-                del sys.modules[module_name]
-        
-        from predict_attendance import predict_attendance
-        
-        # Use the RF model to predict
-        try:
-            df_predictions, leave_summary = predict_attendance(sample_data, model)
-            
-            # Get the predicted status
-            predicted_status = df_predictions['Status'].iloc[0]
-            print(f"🤖 RF Model predicted: {predicted_status}")
-            
-            return predicted_status
-        except Exception as e:
-            print(f"❌ RF Model prediction failed: {e}")
+        if not os.path.exists(RF_MODEL_PATH):
+            print(f"❌ RF model not found at: {RF_MODEL_PATH}")
             # Fallback to simple time-based logic
             return fallback_time_based_prediction(entry_time)
-        
+
+        registry = get_model_registry()
+        with registry.timed(RF_MODEL_PATH):
+            # Rebuilt automatically when the model file changes
+            lookup = get_status_lookup(RF_MODEL_PATH, STATUS_LOOKUP_FILE, load_model=registry.get)
+            predicted_status = lookup.predict(entry_time)
+
+            if VALIDATE_STATUS_LOOKUP:
+                # Live model.predict on this entry alone
+                entry = pd.DataFrame({'Employee ID': [emp_id], 'Name': [name], 'Date': [''], 'Entry_Time': [entry_time]})
+                expected = str(predict_attendance(entry, registry.get(RF_MODEL_PATH))[0]['Status'].iloc[0])
+                if expected != predicted_status:
+                    print(f"❌ Status lookup mismatch for {emp_id} at {entry_time}: "
+                          f"lookup {predicted_status}, model {expected}")
+                    predicted_status = expected
+
+        print(f"🤖 RF Model predicted: {predicted_status}")
+        return predicted_status
+
     except Exception as e:
         print(f"❌ Error using RF model: {e}")
         # Fallback to simple time-based logic
@@ -378,77 +644,41 @@ def mark_attendance_with_time(emp_id, name, time_str):
     today_date_col = get_today_date()
     
     # Use RF model for prediction
-    status = predict_attendance_with_rf_model(emp_id, name, test_time)
+    with get_metrics().time('prediction'):
+        status = predict_attendance_with_rf_model(emp_id, name, test_time)
     
     print(f"⏰ RF Model test prediction for {emp_id}: {test_time.strftime('%H:%M')} - Status: {status}")
     
-    # Load existing data
-    raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-    
-    try:
-        if os.path.exists(raw_file):
-            df_existing = pd.read_excel(raw_file)
-        else:
-            df_existing = pd.DataFrame(columns=[
-                'Employee ID', 'Name', 'Date', 'Entry_Time', 'Status'
-            ])
-    except Exception as e:
-        df_existing = pd.DataFrame(columns=[
-            'Employee ID', 'Name', 'Date', 'Entry_Time', 'Status'
-        ])
-
-    # Check for duplicate
-    already_marked = False
-    if not df_existing.empty:
-        today_entries = df_existing[df_existing['Date'] == today_date_col]
-        if not today_entries.empty:
-            already_marked = (today_entries['Employee ID'] == emp_id).any()
-
-    if already_marked:
-        return False, f"Employee {name} ({emp_id}) already marked attendance today"
-
     # Create new record with test time
-    new_record = pd.DataFrame([{
+    new_record = {
         'Employee ID': emp_id,
         'Name': name,
         'Date': today_date_col,
         'Entry_Time': test_time,
         'Status': status
-    }])
+    }
+
+    with INGEST_LOCK:
+        # Check for duplicate against the attendance store
+        if is_marked_today(emp_id):
+            return False, f"Employee {name} ({emp_id}) already marked attendance today"
 
-    # Save combined data
-    df_combined = pd.concat([df_existing, new_record], ignore_index=True)
-    df_combined.to_excel(raw_file, index=False)
+        # Append to the attendance store
+        append_attendance_record(new_record)
     
-    # Auto-generate styled Excel report
-    try:
-        actual_df = df_combined.drop('Entry_Time', axis=1, errors='ignore')
-        actual_df = actual_df[['Employee ID', 'Name', 'Status']]
-        actual_filename = f'Attendance_Report_{get_month_year()}.xlsx'
-        create_styled_excel_report(actual_df, actual_filename)
-        st.cache_data.clear()
-        return True, f"Test: Marked {name} ({emp_id}) as {status} at {test_time.strftime('%H:%M')}"
-    except Exception as e:
-        pass
+    # Regenerate the styled Excel reports in the background
+    get_report_worker().request(get_month_year())
     
-    return False, f"Failed to mark test attendance for {name} ({emp_id})"
+    return True, f"Test: Marked {name} ({emp_id}) as {status} at {test_time.strftime('%H:%M')}"
 
 def auto_update_daily_excel():
-    """Auto-update daily Excel report"""
+    """Auto-update daily Excel report (queued once per process; marks queue the rest)"""
     try:
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            df = pd.read_excel(raw_file)
-            if not df.empty:
-                # Create actual file (without entry time, with colors)
-                actual_df = df.drop('Entry_Time', axis=1, errors='ignore')
-                # Only keep ID, Name, Status for main Excel
-                actual_df = actual_df[['Employee ID', 'Name', 'Status']]
-                actual_filename = f'Attendance_Report_{get_month_year()}.xlsx'
-                
-                # Use the new styling function
-                create_styled_excel_report(actual_df, actual_filename)
-                return True
+        worker = get_report_worker()
+        status = worker.status()
+        if status['runs'] == 0 and status['requests'] == 0 and has_month_attendance():
+            worker.request(get_month_year())
+            return True
     except Exception as e:
         print(f"Error auto-updating Excel: {e}")
         return False
@@ -467,7 +697,6 @@ def get_month_year():
     return datetime.now().strftime("%B_%Y")
 
 import base64
-import joblib
 import sys
 import os
 
@@ -490,138 +719,33 @@ def get_logo_base64():
         print(f"Error loading logo: {e}")
         return ""
 
+# Report titles
+ATTENDANCE_REPORT_TITLE = " MSN GLOBAL IT SOLUTIONS - Attendance Sheet"
+
+def monthly_report_title():
+    return f" MSN GLOBAL IT SOLUTIONS - Monthly Employee Report ({get_month_year()})"
+
 # Excel styling function
 def style_excel(file_path):
     """Apply professional styling to Excel file with black, red, white theme and total statistics"""
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-    from openpyxl import load_workbook
-
-    wb = load_workbook(file_path)
-    ws = wb.active
-
-    # First, let's get the original data before inserting rows
-    original_data = []
-    for row in ws.iter_rows(min_row=2):  # Skip header row
-        row_data = [cell.value for cell in row]
-        if any(row_data):  # Only add non-empty rows
-            original_data.append(row_data)
-
-    # Calculate total statistics from original data
-    total_present = sum(1 for row in original_data if row and len(row) > 2 and row[2] == 'Present')
-    total_late = sum(1 for row in original_data if row and len(row) > 2 and row[2] == 'Late')
-    total_absent = sum(1 for row in original_data if row and len(row) > 2 and row[2] == 'Absent')
-    total_leave = sum(1 for row in original_data if row and len(row) > 2 and row[2] == 'Leave')
-    total_entries = len(original_data)
-
-    # Insert and style title row
-    ws.insert_rows(1)
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=ws.max_column)
-    title_cell = ws.cell(row=1, column=1)
-    title_cell.value = " MSN GLOBAL IT SOLUTIONS - Attendance Sheet"
-    title_cell.font = Font(size=16, bold=True, color="FF0000", name="Calibri")
-    title_cell.fill = PatternFill("solid", fgColor="000000")  # Black background
-    title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    # Insert statistics rows
-    for i in range(5):
-        ws.insert_rows(2)
-    
-    # Add statistics
-    stats_data = [
-        f"Total Entries: {total_entries}",
-        f"Total Present: {total_present}",
-        f"Total Late: {total_late}",
-        f"Total Absent: {total_absent}",
-        f"Total Leave: {total_leave}"
-    ]
-    
-    for i, stat in enumerate(stats_data, 2):
-        cell = ws.cell(row=i, column=1)
-        cell.value = stat
-        cell.font = Font(size=12, bold=True, color="FFFFFF", name="Calibri")
-        cell.fill = PatternFill("solid", fgColor="1C1C1C")  # Dark background for stats (no blue)
-        cell.alignment = Alignment(horizontal="left", vertical="center")
-        # Merge cells for statistics
-        ws.merge_cells(start_row=i, start_column=1, end_row=i, end_column=ws.max_column)
-
-    # Define fills and fonts
-    header_fill = PatternFill("solid", fgColor="C80000")  # Red for headers
-    row_fill_1 = PatternFill("solid", fgColor="1C1C1C")   # Almost black
-    row_fill_2 = PatternFill("solid", fgColor="EDEDED")   # Light gray
-
-    border = Border(
-        left=Side(style='thin', color='000000'),
-        right=Side(style='thin', color='000000'),
-        top=Side(style='thin', color='000000'),
-        bottom=Side(style='thin', color='000000')
-    )
+    df = pd.read_excel(file_path)
+    with get_metrics().time('report_render'):
+        write_styled_report(df, file_path, ATTENDANCE_REPORT_TITLE, status_stats_lines(df))
 
-    # Style column headers (now at row 8)
-    for col in range(1, ws.max_column + 1):
-        cell = ws.cell(row=8, column=col)
-        cell.fill = header_fill
-        cell.font = Font(bold=True, color="FFFFFF", name="Calibri")  # White bold text
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = border
-
-    # Style body cells with alternating row colors (starting from row 9)
-    for i, row in enumerate(ws.iter_rows(min_row=9, max_row=ws.max_row, min_col=1, max_col=ws.max_column)):
-        fill = row_fill_1 if i % 2 == 0 else row_fill_2
-        font_color = "FFFFFF" if fill == row_fill_1 else "000000"
-        for cell in row:
-            cell.fill = fill
-            cell.font = Font(name="Calibri", color=font_color)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-
-    # Auto-adjust column widths
-    for col in ws.columns:
-        max_length = max(len(str(cell.value or "")) for cell in col)
-        ws.column_dimensions[get_column_letter(col[0].column)].width = max_length + 3
-
-    # Save styled workbook
-    wb.save(file_path)
+def build_monthly_summary(df, employee_df):
+    """Per-employee status totals for the month, one row per employee in the master"""
+    return summarize_status_counts(df, employee_df)
 
 def create_monthly_employee_report():
     """Create monthly employee-wise report with total statistics for each employee"""
     try:
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            df = pd.read_excel(raw_file)
+        if has_month_attendance():
+            df = load_month_attendance()
             if not df.empty:
                 # Load employee data
                 employee_df = load_employee_data()
                 if employee_df is not None and not employee_df.empty:
-                    # Create employee-wise summary
-                    employee_summary = []
-                    
-                    for _, emp_row in employee_df.iterrows():
-                        emp_id = emp_row['Employee ID']
-                        emp_name = emp_row['Name']
-                        
-                        # Get all entries for this employee
-                        emp_entries = df[df['Employee ID'] == emp_id]
-                        
-                        # Calculate statistics for this employee
-                        total_present = len(emp_entries[emp_entries['Status'] == 'Present'])
-                        total_late = len(emp_entries[emp_entries['Status'] == 'Late'])
-                        total_absent = len(emp_entries[emp_entries['Status'] == 'Absent'])
-                        total_leave = len(emp_entries[emp_entries['Status'] == 'Leave'])
-                        total_entries = len(emp_entries)
-                        
-                        employee_summary.append({
-                            'Employee ID': emp_id,
-                            'Name': emp_name,
-                            'Total Present': total_present,
-                            'Total Late': total_late,
-                            'Total Absent': total_absent,
-                            'Total Leave': total_leave,
-                            'Total Entries': total_entries
-                        })
-                    
-                    # Create DataFrame
-                    summary_df = pd.DataFrame(employee_summary)
+                    summary_df = build_monthly_summary(df, employee_df)
                     
                     # Save to Excel with styling
                     monthly_filename = f'Monthly_Employee_Report_{get_month_year()}.xlsx'
@@ -639,72 +763,28 @@ def create_monthly_employee_report():
 
 def style_monthly_excel(file_path):
     """Apply professional styling to monthly employee report"""
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-    from openpyxl import load_workbook
-
-    wb = load_workbook(file_path)
-    ws = wb.active
-
-    # Insert and style title row
-    ws.insert_rows(1)
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=ws.max_column)
-    title_cell = ws.cell(row=1, column=1)
-    title_cell.value = f" MSN GLOBAL IT SOLUTIONS - Monthly Employee Report ({get_month_year()})"
-    title_cell.font = Font(size=16, bold=True, color="FF0000", name="Calibri")
-    title_cell.fill = PatternFill("solid", fgColor="000000")  # Black background
-    title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    # Define fills and fonts
-    header_fill = PatternFill("solid", fgColor="C80000")  # Red for headers
-    row_fill_1 = PatternFill("solid", fgColor="1C1C1C")   # Almost black
-    row_fill_2 = PatternFill("solid", fgColor="EDEDED")   # Light gray
-
-    border = Border(
-        left=Side(style='thin', color='000000'),
-        right=Side(style='thin', color='000000'),
-        top=Side(style='thin', color='000000'),
-        bottom=Side(style='thin', color='000000')
-    )
-
-    # Style column headers (now at row 3)
-    for col in range(1, ws.max_column + 1):
-        cell = ws.cell(row=3, column=col)
-        cell.fill = header_fill
-        cell.font = Font(bold=True, color="FFFFFF", name="Calibri")  # White bold text
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = border
-
-    # Style body cells with alternating row colors (starting from row 4)
-    for i, row in enumerate(ws.iter_rows(min_row=4, max_row=ws.max_row, min_col=1, max_col=ws.max_column)):
-        fill = row_fill_1 if i % 2 == 0 else row_fill_2
-        font_color = "FFFFFF" if fill == row_fill_1 else "000000"
-        for cell in row:
-            cell.fill = fill
-            cell.font = Font(name="Calibri", color=font_color)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-
-    # Auto-adjust column widths
-    for col in ws.columns:
-        max_length = max(len(str(cell.value or "")) for cell in col)
-        ws.column_dimensions[get_column_letter(col[0].column)].width = max_length + 3
-
-    # Save styled workbook
-    wb.save(file_path)
+    df = pd.read_excel(file_path)
+    with get_metrics().time('report_render'):
+        write_styled_report(df, file_path, monthly_report_title())
 
 def create_styled_excel_report(df, filename):
-    """Create Excel report with professional styling"""
-    # Save unstyled DataFrame
+    """Create Excel report with professional styling (no-op when the inputs are unchanged)"""
     file_path = os.path.join(EXCEL_DIR, filename)
-    df.to_excel(file_path, index=False, sheet_name="Employee Report")
     
-    # Apply styling based on filename
-    if 'Monthly_Employee_Report' in filename:
-        style_monthly_excel(file_path)
-    else:
-        style_excel(file_path)
+    # Skip the rebuild if the manifest says this file was built from identical data
+    is_monthly = 'Monthly_Employee_Report' in filename
+    digest = frame_digest(df, filename, get_month_year() if is_monthly else '')
+    if report_is_fresh(REPORT_MANIFEST, file_path, digest):
+        return file_path
+    
+    # Write the styled workbook in a single streaming pass
+    with get_metrics().time('report_render'):
+        if is_monthly:
+            write_styled_report(df, file_path, monthly_report_title())
+        else:
+            write_styled_report(df, file_path, ATTENDANCE_REPORT_TITLE, status_stats_lines(df))
     
+    record_report(REPORT_MANIFEST, file_path, digest, len(df))
     return file_path
 
 # Login page
@@ -743,11 +823,6 @@ def main_dashboard():
     # Auto-update daily Excel
     auto_update_daily_excel()
     
-    # Continuous face recognition monitoring
-    if st.session_state.auto_refresh:
-        continuous_face_monitoring()
-        monitor_face_recognition_file()
-    
     # Smaller aesthetic header
     logo_b64 = get_logo_base64()
     if logo_b64:
@@ -816,25 +891,109 @@ def main_dashboard():
             st.markdown("**🔴 Auto Refresh:** OFF")
         
         # Face recognition status
-        json_status = check_json_file_status()
-        if json_status["exists"]:
-            if json_status["size"] > 0:
-                st.markdown("**🟢 Face Recognition:** Data Available")
-            else:
-                st.markdown("**🟡 Face Recognition:** Waiting for Data")
+        spool_status = get_spool_consumer().status()
+        if not spool_status['alive']:
+            st.markdown("**🔴 Face Recognition:** Listener stopped")
+        elif spool_status['pending'] > 0:
+            st.markdown(f"**🟢 Face Recognition:** Ingesting {spool_status['pending']} batch(es)")
+        elif spool_status['last_batch_at']:
+            st.markdown(f"**🟢 Face Recognition:** Last batch {spool_status['last_batch_at'].strftime('%H:%M:%S')} "
+                        f"({spool_status['last_latency_ms']:.0f} ms, {spool_status['mode']})")
         else:
-            st.markdown("**🔴 Face Recognition:** Not Connected")
+            st.markdown(f"**🟡 Face Recognition:** Waiting for Data ({spool_status['mode']})")
+        if spool_status['retrying']:
+            st.markdown(f"**🟡 Face Recognition:** Retrying {spool_status['retrying']} failed batch(es)")
+        if spool_status['failed']:
+            st.markdown(f"**🔴 Failed batches:** {spool_status['failed']} in spool/failed")
+            if st.button("🔁 Retry Failed Batches", use_container_width=True):
+                get_spool_consumer().retry_failed()
+                st.rerun()
+        
+        # Background report status
+        report_status = get_report_worker().status()
+        last_report = report_status['last_completed']
+        last_report_text = last_report.strftime('%H:%M:%S') if last_report else "Never"
+        if report_status['last_error']:
+            st.markdown(f"**🔴 Reports:** Failed ({report_status['last_error']})")
+        elif report_status['stale']:
+            st.markdown(f"**🟡 Reports:** Updating (last built {last_report_text})")
+        else:
+            st.markdown(f"**🟢 Reports:** Up to date (last built {last_report_text})")
+        
+        with st.expander("📡 Ingestion Server"):
+            ingest_server = get_ingest_server()
+            if ingest_server is None:
+                st.markdown("Not running")
+            else:
+                ingest_stats = ingest_server.stats()
+                st.markdown(f"`http://{ingest_server.address[0]}:{ingest_server.address[1]}/events`")
+                st.markdown(f"**Queue:** {ingest_stats['queue_depth']} / {ingest_stats['queue_capacity']}")
+                st.markdown(f"**Accepted / Rejected:** {ingest_stats['accepted']} / {ingest_stats['rejected']}")
+                st.markdown(f"**Commits:** {ingest_stats['commits']} "
+                            f"(mean {ingest_stats['commit_ms_mean'] or 0} ms, p95 {ingest_stats['commit_ms_p95'] or 0} ms)")
+                if ingest_stats['dead_lettered']:
+                    st.markdown(f"**🔴 Moved to failed batches:** {ingest_stats['dead_lettered']} event(s)")
+                if ingest_stats['last_error']:
+                    st.markdown(f"**🔴 Last error:** {ingest_stats['last_error']}")
+        
+        with st.expander("🤖 Model"):
+            model_df = get_model_registry().stats()
+            if model_df.empty:
+                st.markdown("No model loaded yet")
+            else:
+                st.dataframe(model_df, use_container_width=True, hide_index=True)
+        
+        with st.expander("⏱️ Performance"):
+            metrics = get_metrics()
+            perf_df = metrics.snapshot()
+            if perf_df.empty:
+                st.markdown("No timings recorded yet")
+            else:
+                st.dataframe(perf_df, use_container_width=True, hide_index=True)
+            for name, value in sorted(metrics.counters().items()):
+                st.markdown(f"**{name.replace('_', ' ').capitalize()}:** {value:g}")
+            ingest_server = get_ingest_server()
+            if ingest_server is not None:
+                st.markdown(f"Prometheus: `http://{ingest_server.address[0]}:{ingest_server.address[1]}/metrics`")
+            if METRICS_FILE:
+                st.markdown(f"Textfile: `{METRICS_FILE}`")
+            st.download_button("⬇️ Metrics (Prometheus text)", metrics.prometheus_text(),
+                               file_name="attendance_metrics.prom", mime="text/plain", use_container_width=True)
+        
+        with st.expander("🗄️ Archive"):
+            archive = get_month_archive()
+            partitions_df = archive.partitions()
+            if partitions_df.empty:
+                st.markdown("No closed months archived yet")
+            else:
+                st.dataframe(partitions_df, use_container_width=True, hide_index=True)
+            archive_emp = st.text_input("Employee ID", key="archive_emp")
+            archive_range = st.date_input("Dates", value=(), key="archive_range")
+            archive_status = st.selectbox("Status", ["Any", "Present", "Late", "Absent", "Leave"], key="archive_status")
+            if st.button("🔎 Query", use_container_width=True, key="archive_query"):
+                range_start, range_end = (tuple(archive_range) + (None, None))[:2]
+                try:
+                    result_df = from_typed(query_attendance(
+                        range_start, range_end or range_start,
+                        emp_id=archive_emp.strip() or None,
+                        status=None if archive_status == "Any" else archive_status
+                    ))
+                    st.markdown(f"**{len(result_df)}** row(s)")
+                    st.dataframe(result_df, use_container_width=True, hide_index=True)
+                except Exception as e:
+                    st.error(f"❌ Error querying attendance: {str(e)}")
+        
+        with st.expander("📄 Report Manifest"):
+            manifest_df = manifest_status(REPORT_MANIFEST, EXCEL_DIR)
+            if manifest_df.empty:
+                st.markdown("No reports built yet")
+            else:
+                st.dataframe(manifest_df, use_container_width=True, hide_index=True)
         
        
         
-        # Display notification if exists
-        if st.session_state.last_notification is not None:
-            if st.session_state.notification_type == "success":
-                st.success("✅ Attendance marked successfully!")
-            elif st.session_state.notification_type == "error":
-                st.error(st.session_state.last_notification)
-            elif st.session_state.notification_type == "info":
-                st.info(st.session_state.last_notification)
+        # Display notification if exists (live)
+        run_live(render_live_notifications)
         
         
         # CSV upload
@@ -848,6 +1007,8 @@ def main_dashboard():
                 if st.button("🗑️ Remove Current File", type="secondary", use_container_width=True):
                     st.session_state.uploaded_csv_data = None
                     st.session_state.uploaded_csv_filename = None
+                    st.session_state.uploaded_csv_digest = None
+                    st.session_state.csv_uploader_key += 1  # clear the uploader so the file is not re-applied
                     st.success("✅ File removed!")
                     st.rerun()
             with col2:
@@ -855,21 +1016,26 @@ def main_dashboard():
                     df_display = pd.DataFrame(st.session_state.uploaded_csv_data)
                     st.dataframe(df_display, use_container_width=True)
         
-        uploaded_file = st.file_uploader("Choose CSV file", type=['csv'])
+        uploaded_file = st.file_uploader("Choose CSV file", type=['csv'],
+                                         key=f"employee_csv_{st.session_state.csv_uploader_key}")
         if uploaded_file is not None:
-            try:
-                df_upload = pd.read_csv(uploaded_file)
-                if 'Employee ID' in df_upload.columns and 'Name' in df_upload.columns:
-                    emp_file = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared', 'employees_data.csv')
-                    df_upload.to_csv(emp_file, index=False)
-                    st.session_state.uploaded_csv_data = df_upload.to_dict('records') # Store data in session state
-                    st.session_state.uploaded_csv_filename = uploaded_file.name
-                    st.success("✅ Employee data updated!")
-                    st.rerun()
-                else:
-                    st.error("❌ CSV must have 'Employee ID' and 'Name' columns")
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
+            # The uploader hands back the same file on every rerun; only new contents are
+            # parsed and written, so the roster's mtime (and every reader's reload) moves once per upload
+            digest = hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).hexdigest()
+            if digest != st.session_state.uploaded_csv_digest:
+                try:
+                    df_upload = pd.read_csv(uploaded_file)
+                    if 'Employee ID' in df_upload.columns and 'Name' in df_upload.columns:
+                        get_employee_directory().replace(df_upload)
+                        st.session_state.uploaded_csv_data = df_upload.to_dict('records') # Store data in session state
+                        st.session_state.uploaded_csv_filename = uploaded_file.name
+                        st.session_state.uploaded_csv_digest = digest
+                        st.success("✅ Employee data updated!")
+                        st.rerun()
+                    else:
+                        st.error("❌ CSV must have 'Employee ID' and 'Name' columns")
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
         
         # Logout
         st.markdown("### 🚪 Account")
@@ -888,10 +1054,9 @@ def main_dashboard():
         
         with control_col1:
             if st.button("📊 Generate Report", type="primary", use_container_width=True, key="gen_report"):
-                raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-                if os.path.exists(raw_file):
+                if has_month_attendance():
                     try:
-                        df = pd.read_excel(raw_file)
+                        df = load_month_attendance()
                         if not df.empty:
                             # Create actual file (without entry time, with colors)
                             actual_df = df.drop('Entry_Time', axis=1, errors='ignore')
@@ -901,6 +1066,8 @@ def main_dashboard():
                             
                             # Use the new styling function
                             create_styled_excel_report(actual_df, actual_filename)
+                            # Materialize the raw workbook from the attendance store as well
+                            export_raw_excel()
                             st.success("✅ Excel report generated and saved!")
                         else:
                             st.markdown("""
@@ -927,14 +1094,18 @@ def main_dashboard():
         
         with control_col3:
             if st.button("🗑️ Clear Entries", type="secondary", use_container_width=True, key="clear_entries"):
-                raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-                if os.path.exists(raw_file):
+                if has_month_attendance():
                     try:
-                        df = pd.read_excel(raw_file)
-                        today_date = get_today_date()
-                        # Remove today's entries
-                        df_filtered = df[df['Date'] != today_date]
-                        df_filtered.to_excel(raw_file, index=False)
+                        month_year = get_month_year()
+                        # Hide today's entries behind a tombstone; marks arriving meanwhile are kept
+                        store = get_month_store(month_year)
+                        # Under the ingest lock, so no batch commits between the delete and the index update
+                        with INGEST_LOCK:
+                            store.delete_date(get_today_date(), month_year)
+                            invalidate_attendance_cache()
+                            get_checkin_index().remove_date(get_today_date())
+                            get_checkin_index().mark_store_synced(store, month_year)
+                        get_tombstone_compactor().request()
                         st.success("✅ Today's entries cleared!")
                         st.rerun()
                     except Exception as e:
@@ -945,14 +1116,35 @@ def main_dashboard():
                         <p style="margin: 0; color: white;">ℹ️ No data to clear</p>
                     </div>
                     """, unsafe_allow_html=True)
+            
+            # Undo the latest clear of today while it has not been compacted
+            month_year = get_month_year()
+            cleared = [tombstone for tombstone in get_attendance_store().tombstones(month_year)
+                       if tombstone['date'] == get_today_date()]
+            if cleared and st.button("↩️ Undo Clear", type="secondary", use_container_width=True, key="undo_clear"):
+                try:
+                    store = get_month_store(month_year)
+                    # Employees who checked in again since the clear would end up with two entries
+                    with INGEST_LOCK:
+                        conflicts = store.undo_conflicts(cleared[0]['id'])
+                        if not conflicts:
+                            restored = store.undo_delete(cleared[0]['id'])
+                            invalidate_attendance_cache()
+                            get_checkin_index().sync_store(store, month_year)
+                    if conflicts:
+                        st.error(f"❌ Cannot undo: {len(conflicts)} employee(s) checked in again since the clear "
+                                 f"({', '.join(map(str, conflicts[:10]))}{', ...' if len(conflicts) > 10 else ''})")
+                    else:
+                        st.success(f"✅ Restored {restored} entr{'y' if restored == 1 else 'ies'}!")
+                        st.rerun()
+                except Exception as e:
+                    st.error(f"❌ Error restoring entries: {str(e)}")
         
         with control_col4:
             if st.button("📊 Export Data", type="secondary", use_container_width=True, key="export_data"):
-                raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-                if os.path.exists(raw_file):
+                if has_month_attendance():
                     try:
-                        df = pd.read_excel(raw_file)
-                        today_df = df[df['Date'] == get_today_date()]
+                        today_df = load_today_attendance()
                         if not today_df.empty:
                             csv_data = today_df.to_csv(index=False)
                             # Use a container to show download button
@@ -980,64 +1172,28 @@ def main_dashboard():
                     </div>
                     """, unsafe_allow_html=True)
         
-        # Status metrics
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            try:
-                df = pd.read_excel(raw_file)
-                today_count = len(df[df['Date'] == get_today_date()])
-                
-                # Calculate metrics for today
-                today_df = df[df['Date'] == get_today_date()]
-                present_count = len(today_df[today_df['Status'] == 'Present'])
-                late_count = len(today_df[today_df['Status'] == 'Late'])
-                absent_count = len(today_df[today_df['Status'] == 'Absent'])
-                
-                # Calculate total metrics (all time)
-                total_present = len(df[df['Status'] == 'Present'])
-                total_late = len(df[df['Status'] == 'Late'])
-                total_absent = len(df[df['Status'] == 'Absent'])
-                
-                # Calculate leave (assuming leave is marked as 'Leave' or 'Absent' for specific cases)
-                total_leave = len(df[df['Status'] == 'Leave']) if 'Leave' in df['Status'].values else 0
-                
-                # Display today's metrics
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("✅ Present Today", present_count)
-                with col2:
-                    st.metric("⏰ Late Today", late_count)
-                with col3:
-                    st.metric("❌ Absent Today", absent_count)
-                with col4:
-                    st.metric("📊 Total Entries", today_count)
-                
-            except Exception as e:
-                st.error(f"❌ Error loading metrics: {str(e)}")
-        else:
-            # Show zero metrics if no data
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("✅ Present Today", 0)
-            with col2:
-                st.metric("⏰ Late Today", 0)
-            with col3:
-                st.metric("❌ Absent Today", 0)
-            with col4:
-                st.metric("📊 Total Entries", 0)
+        # Status metrics (live)
+        run_live(render_today_metrics)
         
         # Manual attendance
         st.markdown("### 👤 Manual Attendance")
         
-        employee_df = load_employee_data()
-        if employee_df is not None and not employee_df.empty:
-            employee_options = [f"{row['Employee ID']} - {row['Name']}" for _, row in employee_df.iterrows()]
-            selected_employee = st.selectbox("Select Employee", employee_options)
+        directory = get_employee_directory()
+        if len(directory):
+            # Only the top matches from the server-side prefix index are sent to the browser
+            query = st.text_input("Search Employee", placeholder=f"ID or name ({len(directory)} employees)")
+            matches = directory.search(query, limit=EMPLOYEE_PICKER_LIMIT)
+            selected = st.selectbox(
+                "Select Employee", range(len(matches)),
+                format_func=lambda i: f"{matches[i]['Employee ID']} - {matches[i]['Name']}"
+            )
+            if not matches:
+                st.info(f"ℹ️ No employee matches '{query}'")
             
             if st.button("✅ Mark Attendance", type="primary"):
-                if selected_employee:
-                    emp_id = selected_employee.split(" - ")[0]
-                    name = selected_employee.split(" - ")[1]
+                if selected is not None:
+                    emp_id = matches[selected]['Employee ID']
+                    name = matches[selected]['Name']
                     success, message = mark_attendance(emp_id, name)
                     if success:
                         st.success(message)
@@ -1053,372 +1209,215 @@ def main_dashboard():
         
         # Current time info
         st.markdown("### ⏰ Current Time")
-        current_time = datetime.now()
+        run_live(render_current_time)
         
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("🕐 Current Time", current_time.strftime("%H:%M:%S"))
-        with col2:
-            st.metric("📅 Date", current_time.strftime("%Y-%m-%d"))
-        with col3:
-            st.metric("📊 Status", "Active")
-        
-        # Attendance data with enhanced display
+        # Attendance data with enhanced display (live)
         st.markdown("### 📊 Today's Attendance")
-        
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            try:
-                df = pd.read_excel(raw_file)
-                today_df = df[df['Date'] == get_today_date()]
-                
-                if not today_df.empty:
-                    # Show enhanced information including time
-                    if 'Entry_Time' in today_df.columns:
-                        # Format time for display - use .copy() to avoid SettingWithCopyWarning
-                        display_df = today_df[['Employee ID', 'Name', 'Status', 'Entry_Time']].copy()
-                        display_df['Entry_Time_Display'] = display_df['Entry_Time'].apply(
-                            lambda x: x.strftime('%H:%M') if hasattr(x, 'strftime') else str(x)
-                        )
-                        display_df = display_df[['Employee ID', 'Name', 'Status', 'Entry_Time_Display']]
-                        display_df.columns = ['Employee ID', 'Name', 'Status', 'Entry Time']
-                    else:
-                        display_df = today_df[['Employee ID', 'Name', 'Status']].copy()
-                    
-                    # Add color coding to the dataframe
-                    st.dataframe(display_df, use_container_width=True)
-                    
-                    # Show summary statistics
-                    st.markdown("#### 📈 Attendance Summary")
-                    status_counts = today_df['Status'].value_counts()
-                    for status, count in status_counts.items():
-                        if status == 'Present':
-                            st.success(f"✅ {status}: {count} employee(s)")
-                        elif status == 'Late':
-                            st.warning(f"⏰ {status}: {count} employee(s)")
-                        elif status == 'Absent':
-                            st.error(f"❌ {status}: {count} employee(s)")
-                        else:
-                            st.info(f"📊 {status}: {count} employee(s)")
-                else:
-                    st.markdown("""
-                    <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
-                        <p style="margin: 0; color: white;">ℹ️ No attendance data for today</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            except Exception as e:
-                st.error(f"❌ Error loading attendance data: {str(e)}")
-        else:
-            st.markdown("""
-            <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
-                <p style="margin: 0; color: white;">ℹ️ No attendance data available</p>
-            </div>
-            """, unsafe_allow_html=True)
+        run_live(render_today_attendance)
     
     with col2:
         # Empty column for balance
         pass
     
-    # Auto refresh
+
+# Live widgets: each runs as a fragment that re-renders on its own timer while
+# Auto Refresh is on, without re-executing the page. Their data comes from
+# load_live_snapshot(), which is only rebuilt when the attendance store changes.
+def run_live(render):
+    render = get_metrics().wrap('dashboard_fragment', render)
+    st.fragment(render, run_every=LIVE_REFRESH_SECONDS if st.session_state.auto_refresh else None)()
+
+def render_live_notifications():
     if st.session_state.auto_refresh:
-        current_time = time.time()
-        if current_time - st.session_state.refresh_timestamp > 5:
-            st.session_state.refresh_timestamp = current_time
-            st.cache_data.clear()
-            st.rerun()
+        continuous_face_monitoring()
+        monitor_face_recognition_file()
+    
+    if st.session_state.last_notification is not None:
+        if st.session_state.notification_type == "success":
+            st.success("✅ Attendance marked successfully!")
+        elif st.session_state.notification_type == "error":
+            st.error(st.session_state.last_notification)
+        elif st.session_state.notification_type == "info":
+            st.info(st.session_state.last_notification)
+
+def render_today_metrics():
+    try:
+        # Today's metrics come from one indexed GROUP BY over today's date
+        today_counts = load_live_snapshot()['counts']
+        
+        # Display today's metrics
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("✅ Present Today", today_counts['Present'])
+        with col2:
+            st.metric("⏰ Late Today", today_counts['Late'])
+        with col3:
+            st.metric("❌ Absent Today", today_counts['Absent'])
+        with col4:
+            st.metric("📊 Total Entries", today_counts['Total'])
+    except Exception as e:
+        st.error(f"❌ Error loading metrics: {str(e)}")
+
+def render_current_time():
+    current_time = datetime.now()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("🕐 Current Time", current_time.strftime("%H:%M:%S"))
+    with col2:
+        st.metric("📅 Date", current_time.strftime("%Y-%m-%d"))
+    with col3:
+        st.metric("📊 Status", "Active")
+
+def render_today_attendance():
+    try:
+        snapshot = load_live_snapshot()
+    except Exception as e:
+        st.error(f"❌ Error loading attendance data: {str(e)}")
+        return
+    
+    if not snapshot['has_data']:
+        st.markdown("""
+        <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
+            <p style="margin: 0; color: white;">ℹ️ No attendance data available</p>
+        </div>
+        """, unsafe_allow_html=True)
+    elif snapshot['display_df'] is None:
+        st.markdown("""
+        <div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 8px; margin: 5px 0; border: 2px solid #1976D2;">
+            <p style="margin: 0; color: white;">ℹ️ No attendance data for today</p>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        # Add color coding to the dataframe
+        st.dataframe(snapshot['display_df'], use_container_width=True)
+        
+        # Show summary statistics
+        st.markdown("#### 📈 Attendance Summary")
+        for status, count in snapshot['status_counts'].items():
+            if status == 'Present':
+                st.success(f"✅ {status}: {count} employee(s)")
+            elif status == 'Late':
+                st.warning(f"⏰ {status}: {count} employee(s)")
+            elif status == 'Absent':
+                st.error(f"❌ {status}: {count} employee(s)")
+            else:
+                st.info(f"📊 {status}: {count} employee(s)")
+    st.caption(f"Data version {snapshot['version']} · updated {snapshot['built_at'].strftime('%H:%M:%S')}")
 
 def continuous_face_monitoring():
-    """Continuously monitor for face recognition data and auto-save"""
+    """Surface batches the spool consumer ingested since this session last looked"""
     try:
-        current_time = time.time()
-        # Check every 2 seconds for better performance
-        if current_time - st.session_state.last_face_check > 2.0:
-            st.session_state.last_face_check = current_time
-            
-            # Check for face recognition data
-            success, message = process_multiple_face_recognition()
+        consumer = get_spool_consumer()
+        if 'spool_seen_seq' not in st.session_state:
+            st.session_state.spool_seen_seq = consumer.status()['last_seq']
+        
+        results = consumer.results_since(st.session_state.spool_seen_seq)
+        if results:
+            st.session_state.spool_seen_seq = results[-1]['seq']
+            success, message = summarize_spool_results(results)
             if success:
-                # Store notification in session state
+                # Store notification in session state (shown by the live notifications fragment)
                 st.session_state.last_notification = message
                 st.session_state.notification_type = "success"
-                time.sleep(0.1)  # Brief pause to show the message
-                st.rerun()
     except Exception as e:
         print(f"Error in continuous face monitoring: {e}")
 
 def monitor_face_recognition_file():
-    """Monitor the face recognition JSON file for changes and auto-refresh"""
+    """Make sure the spool consumer is running (it watches the spool and the legacy JSON file)"""
     try:
-        if os.path.exists(RECOGNIZED_ID_FILE):
-            # Check if file has been modified recently
-            file_stat = os.stat(RECOGNIZED_ID_FILE)
-            current_time = time.time()
-            
-            # If file was modified in the last 3 seconds and we haven't checked recently
-            if (current_time - file_stat.st_mtime < 3 and 
-                current_time - st.session_state.last_face_check > 2.0):
-                st.session_state.last_face_check = current_time
-                success, message = process_multiple_face_recognition()
-                if success:
-                    # Store notification in session state
-                    st.session_state.last_notification = message
-                    st.session_state.notification_type = "success"
-                    time.sleep(0.1)
-                    st.rerun()
-        else:
-            # Keep monitoring even if no JSON file exists
-            current_time = time.time()
-            if current_time - st.session_state.last_face_check > 5:  # Check every 5 seconds
-                st.session_state.last_face_check = current_time
-                # Keep the system ready for face detection
+        consumer = get_spool_consumer()
+        if not consumer.status()['alive']:
+            print("⚠️ Spool consumer stopped - restarting")
+            get_spool_consumer.clear()
+            get_spool_consumer()
     except Exception as e:
-        print(f"Error monitoring face recognition file: {e}")
+        print(f"Error monitoring face recognition spool: {e}")
+
+def merge_spool_results(results):
+    """Combine spool results into (processing_details, messages, errors)"""
+    processing_details = new_processing_details(0)
+    messages, errors = [], []
+    for result in results:
+        if result['error']:
+            errors.append(f"{result['file']}: {result['error']}")
+            continue
+        details, batch_messages = result['outcome']
+        processing_details["total_entries"] += details["total_entries"]
+        processing_details["processed_ids"] |= details["processed_ids"]
+        for key in ("duplicate_entries", "successful_entries", "failed_entries", "skipped_entries"):
+            processing_details[key].extend(details[key])
+        messages.extend(batch_messages)
+    return processing_details, messages, errors
+
+def summarize_spool_results(results):
+    """(success, message) for a set of spool results"""
+    processing_details, messages, errors = merge_spool_results(results)
+    messages = messages + [f"❌ {error}" for error in errors]
+    success_count = len(processing_details["successful_entries"])
+    if success_count > 0:
+        return True, f"✅ Face Recognition: {success_count} attendance(s) marked - {', '.join(messages)}"
+    return False, f"No new attendance marked - {', '.join(messages)}"
+
+def ingest_face_recognition_entries(entries):
+    """
+    Mark a whole batch of recognized IDs: one duplicate snapshot, one directory lookup,
+    one status prediction and one store write. Returns (processing_details, messages).
+    """
+    index = get_checkin_index()
+    metrics = get_metrics()
+    today_date_col = get_today_date()
+    # The duplicate snapshot stays valid until the commit: no other path marks meanwhile
+    with INGEST_LOCK:
+        with metrics.time('duplicate_check'):
+            # Pick up rows the face recognition app appended to its CSV since the last check
+            try:
+                index.sync_csv(ATTENDANCE_CSV)
+            except Exception as e:
+                print(f"Duplicate check: CSV sync error - {str(e)}")
+            checked_in = index.checked_in(today_date_col)
+
+        entry_time = datetime.now().replace(second=0, microsecond=0).time()
+        processing_details, messages = ingest_batch(
+            entries,
+            date_str=today_date_col,
+            entry_time=entry_time,
+            checked_in=checked_in,
+            commit=append_attendance_records,
+            lookup_names=metrics.wrap('name_resolution', get_employee_directory().names),
+            predict_statuses=metrics.wrap('prediction', time_based_statuses)
+        )
+    metrics.inc('detections_ingested', len(entries))
+
+    if processing_details["successful_entries"]:
+        print(f"✅ Saved {len(processing_details['successful_entries'])} attendance record(s) in one write")
+        # Regenerate the styled Excel reports in the background
+        get_report_worker().request(get_month_year())
+    return processing_details, messages
 
 def process_multiple_face_recognition():
-    """Process multiple face recognition IDs from JSON file"""
+    """Process pending face recognition batches now (normally the spool consumer already has)"""
     try:
-        print(f"🔍 Checking JSON file: {RECOGNIZED_ID_FILE}")
-        
-        if not os.path.exists(RECOGNIZED_ID_FILE):
-            print("❌ JSON file does not exist")
-            return False, "No face recognition data available"
-        
-        file_size = os.path.getsize(RECOGNIZED_ID_FILE)
-        print(f"📄 JSON file size: {file_size} bytes")
-        
-        if file_size == 0:
-            print("❌ JSON file is empty")
+        results = get_spool_consumer().drain()
+        if not results:
             return False, "No new detection data"
         
-        # Read JSON content
-        try:
-            with open(RECOGNIZED_ID_FILE, 'r') as f:
-                data = json.load(f)
-            print(f"✅ JSON data loaded: {type(data)}")
-        except Exception as e:
-            print(f"❌ Error reading JSON: {e}")
-            return False, f"Error reading JSON file: {str(e)}"
-        
-        # Handle both single entry and multiple entries
-        entries = []
-        if isinstance(data, list):
-            entries = data  # Multiple entries
-            print(f"📋 Found {len(entries)} entries in list")
-        else:
-            entries = [data]  # Single entry
-            print("📋 Found single entry")
-        
-        if not entries:
-            print("❌ No valid entries found")
-            return False, "No valid entries found"
-        
-        # Process all entries (removed time filtering for now)
-        success_count = 0
-        messages = []
-        processed_ids = set()  # Track processed IDs to avoid duplicates
-        
-        for i, entry in enumerate(entries):
-            print(f"🔍 Processing entry {i+1}: {entry}")
-            
-            emp_id = entry.get('employee_id')
-            name = entry.get('name', '')
-            unique_id = entry.get('unique_id', '')
-            
-            if not emp_id:
-                print(f"❌ Entry {i+1}: Missing employee_id")
-                continue
-            
-            if not unique_id:
-                print(f"❌ Entry {i+1}: Missing unique_id")
-                continue
-            
-            # Skip if already processed this unique ID
-            if unique_id in processed_ids:
-                print(f"⚠️ Entry {i+1}: Already processed unique_id {unique_id}")
-                continue
-            
-            processed_ids.add(unique_id)
-            print(f"✅ Processing unique_id: {unique_id}")
-            
-            # Check for duplicate before processing
-            if is_duplicate_attendance_streamlit(emp_id):
-                print(f"⚠️ {emp_id}: Already marked today")
-                messages.append(f"⚠️ {emp_id}: Already marked today")
-                continue
-            
-            if not name:
-                # Try to get name from employee CSV data
-                try:
-                    employee_df = load_employee_data()
-                    if employee_df is not None and not employee_df.empty:
-                        emp_row = employee_df[employee_df['Employee ID'] == emp_id]
-                        if not emp_row.empty:
-                            name = emp_row['Name'].iloc[0]
-                            print(f"✅ Found name for {emp_id}: {name}")
-                except Exception as e:
-                    print(f"Error getting employee name from CSV: {e}")
-                    name = f"Employee {emp_id}"
-            
-            print(f"🎯 Marking attendance for {emp_id} ({name})")
-            success, message = mark_attendance(emp_id, name or f"Employee {emp_id}")
-            
-            if success:
-                success_count += 1
-                messages.append(f"✅ {name or emp_id} ({emp_id})")
-                print(f"✅ Successfully marked attendance for {emp_id}")
-            else:
-                messages.append(f"❌ {emp_id}: {message}")
-                print(f"❌ Failed to mark attendance for {emp_id}: {message}")
-        
-        # Clear the JSON file after processing all entries
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-            print("🗑️ Cleared JSON file after processing")
-        except Exception as e:
-            print(f"⚠️ Error clearing JSON file: {e}")
-        
-        if success_count > 0:
-            result_message = f"✅ Face Recognition: {success_count} attendance(s) marked - {', '.join(messages)}"
-            print(f"🎉 Success: {result_message}")
-            return True, result_message
-        else:
-            result_message = f"No new attendance marked - {', '.join(messages)}"
-            print(f"ℹ️ No success: {result_message}")
-            return False, result_message
-            
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON decode error: {e}")
-        # Clear corrupted JSON file
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-            print("🗑️ Cleared corrupted JSON file")
-        except:
-            pass
-        return False, "Cleared corrupted data"
+        success, result_message = summarize_spool_results(results)
+        print(f"{'🎉 Success' if success else 'ℹ️ No success'}: {result_message}")
+        return success, result_message
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         return False, f"Error processing data: {str(e)}"
-    
-    return False, None
 
 def process_multiple_face_recognition_enhanced():
     """Enhanced version with detailed feedback and better duplicate prevention"""
     try:
-        if not os.path.exists(RECOGNIZED_ID_FILE):
-            return False, "ℹ️ No JSON file found - Face recognition app may not be running", None
-        
-        file_size = os.path.getsize(RECOGNIZED_ID_FILE)
-        if file_size == 0:
-            return False, "ℹ️ JSON file is empty - No new detection data", None
+        results = get_spool_consumer().drain()
+        if not results:
+            return False, "ℹ️ No pending face recognition batches - Face recognition app may be idle", None
         
-        # Read JSON content
-        with open(RECOGNIZED_ID_FILE, 'r') as f:
-            data = json.load(f)
-        
-        # Handle both single entry and multiple entries
-        entries = []
-        if isinstance(data, list):
-            entries = data  # Multiple entries
-        else:
-            entries = [data]  # Single entry
-        
-        if not entries:
-            return False, "❌ No valid entries found in JSON", None
-        
-        # Filter entries to only process recent ones (within last 30 seconds)
-        current_time = datetime.now()
-        recent_entries = []
-        for entry in entries:
-            try:
-                timestamp_str = entry.get('timestamp', '')
-                if timestamp_str:
-                    entry_time = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    time_diff = (current_time - entry_time).total_seconds()
-                    if time_diff < 30:  # Only process entries from last 30 seconds
-                        recent_entries.append(entry)
-                    else:
-                        print(f"⏰ Skipping old entry for {entry.get('employee_id', 'Unknown')} (age: {time_diff:.1f}s)")
-            except Exception as e:
-                print(f"❌ Error parsing timestamp: {e}")
-                continue
-        
-        if not recent_entries:
-            return False, "❌ No recent entries found in JSON", None
-        
-        entries = recent_entries  # Use only recent entries
-        
-        # Processing details for feedback
-        processing_details = {
-            "total_entries": len(entries),
-            "processed_ids": set(),
-            "duplicate_entries": [],
-            "successful_entries": [],
-            "failed_entries": [],
-            "skipped_entries": []
-        }
-        
-        success_count = 0
-        messages = []
-        
-        for i, entry in enumerate(entries):
-            emp_id = entry.get('employee_id')
-            name = entry.get('name', '')
-            unique_id = entry.get('unique_id', '')
-            timestamp = entry.get('timestamp', '')
-            
-            # Validate entry
-            if not emp_id or not unique_id:
-                processing_details["skipped_entries"].append(f"Entry {i+1}: Missing employee_id or unique_id")
-                continue
-            
-            # Check for duplicate unique_id
-            if unique_id in processing_details["processed_ids"]:
-                processing_details["duplicate_entries"].append(f"{emp_id} (unique_id: {unique_id})")
-                continue
-            
-            processing_details["processed_ids"].add(unique_id)
-            
-            # Check for duplicate attendance (same employee, same day)
-            if is_duplicate_attendance_streamlit(emp_id):
-                processing_details["skipped_entries"].append(f"{emp_id}: Already marked attendance today")
-                messages.append(f"⚠️ {emp_id}: Already marked today")
-                continue
-            
-            # Get employee name if not provided
-            if not name:
-                try:
-                    employee_df = load_employee_data()
-                    if employee_df is not None and not employee_df.empty:
-                        emp_row = employee_df[employee_df['Employee ID'] == emp_id]
-                        if not emp_row.empty:
-                            name = emp_row['Name'].iloc[0]
-                except Exception as e:
-                    print(f"Error getting employee name from CSV: {e}")
-                    name = f"Employee {emp_id}"
-            
-            # Mark attendance
-            success, message = mark_attendance(emp_id, name or f"Employee {emp_id}")
-            if success:
-                success_count += 1
-                processing_details["successful_entries"].append({
-                    "employee_id": emp_id,
-                    "name": name or f"Employee {emp_id}",
-                    "timestamp": timestamp,
-                    "unique_id": unique_id
-                })
-                messages.append(f"✅ {name or emp_id} ({emp_id})")
-            else:
-                processing_details["failed_entries"].append({
-                    "employee_id": emp_id,
-                    "error": message
-                })
-                messages.append(f"❌ {emp_id}: {message}")
-        
-        # Clear the JSON file after processing
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-        except:
-            pass
+        processing_details, messages, errors = merge_spool_results(results)
+        success_count = len(processing_details["successful_entries"])
         
         # Prepare detailed feedback
         details = {
@@ -1444,21 +1443,18 @@ def process_multiple_face_recognition_enhanced():
         if processing_details["duplicate_entries"]:
             details["🔄 Duplicate Entries"] = processing_details["duplicate_entries"]
         
+        if errors:
+            # Failed batches stay in the spool (claimed/ while retrying, then failed/)
+            details["❌ Error"] = errors
+        
         if success_count > 0:
             return True, f"✅ Face Recognition: {success_count} attendance(s) marked successfully", details
         else:
-            return False, f"ℹ️ No new attendance marked - {', '.join(messages)}", details
+            return False, f"ℹ️ No new attendance marked - {', '.join(messages + errors)}", details
             
-    except json.JSONDecodeError:
-        # Clear corrupted JSON file
-        try:
-            os.remove(RECOGNIZED_ID_FILE)
-        except:
-            pass
-        return False, "❌ Corrupted JSON data - File cleared", {"❌ Error": "JSON file was corrupted and has been cleared"}
     except Exception as e:
-        print(f"Error reading face recognition JSON: {e}")
-        return False, f"❌ Error processing JSON: {str(e)}", {"❌ Error": str(e)}
+        print(f"Error processing face recognition spool: {e}")
+        return False, f"❌ Error processing spool: {str(e)}", {"❌ Error": str(e)}
 
 def check_json_file_status():
     """Check the status of the JSON file and return detailed information"""
@@ -1515,74 +1511,17 @@ def check_json_file_status():
 
 def is_duplicate_attendance_streamlit(emp_id):
     """Enhanced duplicate check - Check if this specific employee already marked attendance today"""
-    today_date = get_today_date()
-    
-    # Check multiple data sources for duplicates
-    sources_checked = []
-    
-    # 1. Check Excel file (primary source)
-    try:
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            df = pd.read_excel(raw_file)
-            if not df.empty and 'Date' in df.columns and 'Employee ID' in df.columns:
-                today_entries = df[df['Date'] == today_date]
-                this_employee_entries = today_entries[today_entries['Employee ID'] == emp_id]
-                if len(this_employee_entries) > 0:
-                    sources_checked.append(f"Excel: {len(this_employee_entries)} entry(ies) found")
-                    return True
-                else:
-                    sources_checked.append("Excel: No entries found")
-            else:
-                sources_checked.append("Excel: Invalid data structure")
-    except Exception as e:
-        sources_checked.append(f"Excel: Error - {str(e)}")
+    index = get_checkin_index()
     
-    # 2. Check CSV file (backup source)
-    try:
-        csv_file = os.path.join(os.path.dirname(BASE_DIR), 'face_recognition_app', 'shared', 'attendance_log.csv')
-        if os.path.exists(csv_file):
-            df = pd.read_csv(csv_file, on_bad_lines='skip', engine='python')
-            if not df.empty and 'Date' in df.columns and 'Employee ID' in df.columns:
-                today_entries = df[df['Date'] == today_date]
-                this_employee_entries = today_entries[today_entries['Employee ID'] == emp_id]
-                if len(this_employee_entries) > 0:
-                    sources_checked.append(f"CSV: {len(this_employee_entries)} entry(ies) found")
-                    return True
-                else:
-                    sources_checked.append("CSV: No entries found")
-            else:
-                sources_checked.append("CSV: Invalid data structure")
-    except Exception as e:
-        sources_checked.append(f"CSV: Error - {str(e)}")
-    
-    # 3. Check for any other attendance files in the system
-    try:
-        # Check if there are any other attendance files for today
-        attendance_files = []
-        for file in os.listdir(EXCEL_DIR):
-            if file.startswith('Attendance_') and file.endswith('.xlsx'):
-                attendance_files.append(file)
+    with get_metrics().time('duplicate_check'):
+        # Pick up rows the face recognition app appended to its CSV since the last check
+        try:
+            index.sync_csv(ATTENDANCE_CSV)
+        except Exception as e:
+            print(f"Duplicate check for {emp_id}: CSV sync error - {str(e)}")
         
-        for file in attendance_files:
-            try:
-                file_path = os.path.join(EXCEL_DIR, file)
-                df = pd.read_excel(file_path)
-                if not df.empty and 'Date' in df.columns and 'Employee ID' in df.columns:
-                    today_entries = df[df['Date'] == today_date]
-                    this_employee_entries = today_entries[today_entries['Employee ID'] == emp_id]
-                    if len(this_employee_entries) > 0:
-                        sources_checked.append(f"{file}: {len(this_employee_entries)} entry(ies) found")
-                        return True
-            except Exception as e:
-                sources_checked.append(f"{file}: Error - {str(e)}")
-    except Exception as e:
-        sources_checked.append(f"File scan: Error - {str(e)}")
-    
-    # Log the check results for debugging
-    print(f"Duplicate check for {emp_id}: {'; '.join(sources_checked)}")
-    
-    return False  # This employee hasn't marked attendance today
+        # One index lookup covers the attendance store (including imported Excel data) and the CSV
+        return index.contains(emp_id, get_today_date())
 
 def get_last_sync_time():
     """Get the last sync time from the JSON file"""
@@ -1615,21 +1554,17 @@ def get_sync_status():
 
 def get_today_attendance_summary():
     """Get summary of today's attendance"""
-    today_date = get_today_date()
     summary = {'present': 0, 'late': 0, 'absent': 0, 'total': 0}
     
     try:
-        raw_file = os.path.join(EXCEL_DIR, f'Attendance_Raw_{get_month_year()}.xlsx')
-        if os.path.exists(raw_file):
-            df = pd.read_excel(raw_file)
-            if not df.empty and 'Date' in df.columns and 'Status' in df.columns:
-                today_entries = df[df['Date'] == today_date]
-                if not today_entries.empty:
-                    summary['present'] = len(today_entries[today_entries['Status'] == 'Present'])
-                    summary['late'] = len(today_entries[today_entries['Status'] == 'Late'])
-                    summary['absent'] = len(today_entries[today_entries['Status'] == 'Absent'])
-                    summary['total'] = len(today_entries)
-                    return summary
+        if has_month_attendance():
+            today_counts = get_today_status_counts()
+            if today_counts['Total'] > 0:
+                summary['present'] = today_counts['Present']
+                summary['late'] = today_counts['Late']
+                summary['absent'] = today_counts['Absent']
+                summary['total'] = today_counts['Total']
+                return summary
     except Exception as e:
         print(f"Error getting attendance summary: {e}")
     
@@ -1637,10 +1572,15 @@ def get_today_attendance_summary():
 
 # Main app logic
 def main():
-    if not st.session_state.logged_in:
-        login_page()
-    else:
-        main_dashboard()
+    # Background ingestion runs per process, independent of open sessions
+    get_spool_consumer()
+    get_ingest_server()
+    
+    with get_metrics().time('dashboard_rerun'):
+        if not st.session_state.logged_in:
+            login_page()
+        else:
+            main_dashboard()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Parse sidecar benchmark: a month's raw workbook and the employee CSV parsed
+cold, served from the sidecar, and re-validated by hash after a touch.
+
+Run from the project root:
+    python -m benchmarks.bench_parse_cache --employees 1000 --days 31
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time as clock
+
+import pandas as pd
+
+from benchmarks.synthetic import month_dates, synthetic_month, synthetic_roster
+from modules.parse_cache import invalidate, read_cached
+
+
+def timed(fn) -> tuple:
+    started = clock.perf_counter()
+    result = fn()
+    return result, clock.perf_counter() - started
+
+
+def run(employees: int, days: int, workdir: str) -> dict:
+    roster = synthetic_roster(employees)
+    raw_file = os.path.join(workdir, 'Attendance_Raw_Benchmark.xlsx')
+    employee_csv = os.path.join(workdir, 'employees_data.csv')
+    synthetic_month(roster, month_dates(days)).to_excel(raw_file, index=False)
+    roster.to_csv(employee_csv, index=False)
+
+    results = {}
+    for label, path, reader in (('raw workbook', raw_file, pd.read_excel), ('employee csv', employee_csv, pd.read_csv)):
+        invalidate(path, 'bench')
+        cold, cold_s = timed(lambda: read_cached(path, reader, key='bench'))
+        warm, warm_s = timed(lambda: read_cached(path, reader, key='bench'))
+        os.utime(path)  # same content, new mtime: hashed, not parsed
+        touched, touched_s = timed(lambda: read_cached(path, reader, key='bench'))
+        assert warm.equals(cold) and touched.equals(cold), f"{label}: sidecar frame differs"
+        results[label] = {'rows': len(cold), 'cold_s': cold_s, 'sidecar_s': warm_s, 'touched_s': touched_s}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=31)
+    args = parser.parse_args()
+    workdir = tempfile.mkdtemp(prefix='attendance-sidecar-')
+    try:
+        results = run(args.employees, args.days, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    for label, result in results.items():
+        print(f"✅ {label} ({result['rows']:,} rows): parse {result['cold_s'] * 1000:.0f} ms, "
+              f"sidecar {result['sidecar_s'] * 1000:.1f} ms, touched (hash check) {result['touched_s'] * 1000:.1f} ms "
+              f"({result['cold_s'] / result['sidecar_s']:.0f}x faster)")
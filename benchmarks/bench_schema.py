@@ -0,0 +1,50 @@
+"""
+Typed attendance schema benchmark: memory and date-range filtering for a year of
+history, raw object columns vs modules.schema's typed columns.
+
+Run from the project root:
+    python -m benchmarks.bench_schema --employees 1000 --days 365
+"""
+import argparse
+import time as clock
+from datetime import date, timedelta
+
+from benchmarks.synthetic import synthetic_month, synthetic_roster
+from modules.schema import filter_dates, from_typed, memory_bytes, to_typed
+from modules.status_summary import filter_date_range
+
+
+def run(employees: int, days: int) -> dict:
+    start_day = date(date.today().year - 1, 1, 1)
+    dates = [start_day + timedelta(days=offset) for offset in range(days)]
+    raw = synthetic_month(synthetic_roster(employees), dates)
+
+    started = clock.perf_counter()
+    typed = to_typed(raw)
+    convert = clock.perf_counter() - started
+
+    month_start, month_end = dates[len(dates) // 2], dates[min(len(dates) // 2 + 30, len(dates) - 1)]
+    started = clock.perf_counter()
+    raw_month = filter_date_range(raw, month_start.strftime('%d/%m/%Y'), month_end.strftime('%d/%m/%Y'))
+    raw_filter = clock.perf_counter() - started
+    started = clock.perf_counter()
+    typed_month = filter_dates(typed, month_start, month_end)
+    typed_filter = clock.perf_counter() - started
+
+    assert raw_month.index.equals(typed_month.index), "filtered rows differ"
+    assert from_typed(typed_month)['Date'].equals(raw_month['Date'].astype(object)), "dates differ"
+    return {
+        'rows': len(raw), 'raw_mb': memory_bytes(raw) / 1e6, 'typed_mb': memory_bytes(typed) / 1e6,
+        'convert_s': convert, 'raw_filter_s': raw_filter, 'typed_filter_s': typed_filter,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+    result = run(args.employees, args.days)
+    print(f"✅ {result['rows']:,} rows: raw {result['raw_mb']:.1f} MB, typed {result['typed_mb']:.1f} MB "
+          f"({result['raw_mb'] / result['typed_mb']:.1f}x smaller, converted in {result['convert_s']:.2f}s)")
+    print(f"   one-month filter: raw {result['raw_filter_s'] * 1000:.1f} ms, typed {result['typed_filter_s'] * 1000:.1f} ms")
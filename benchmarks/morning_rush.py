@@ -0,0 +1,298 @@
+"""
+Morning-rush load simulator for the face recognition -> dashboard pipeline.
+
+Plays the face recognition app: people arrive between 08:50 and 09:20, each is
+detected one or more times by one of several cameras whose clocks are skewed,
+and detections are published in the recognized_id.json entry format
+({'employee_id', 'name', 'unique_id', 'timestamp'}) through the spool directory
+or the localhost ingestion server, on an accelerated clock. The app runs
+headless in the same process; a watcher polls the attendance store and the run
+reports detection-to-persisted latency percentiles, lost and duplicated
+records, and throughput.
+
+Run from the project root:
+    python -m benchmarks.morning_rush --people 500 --speed 60
+    python -m benchmarks.morning_rush --transport http --record rush.json
+    python -m benchmarks.morning_rush --replay rush.json --speed 600
+"""
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time as clock
+import urllib.error
+import urllib.request
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.run_benchmarks import git_commit, import_app
+from benchmarks.synthetic import synthetic_roster
+from modules.spool import write_spool_batch
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# ---- Scenario
+def rush_scenario(roster: pd.DataFrame, people: int = 500, start: time = time(8, 50), end: time = time(9, 20),
+                  cameras: int = 3, max_skew_seconds: float = 30.0, max_repeats: int = 4,
+                  retransmit_ratio: float = 0.02, day: Optional[date] = None, seed: int = 7) -> List[dict]:
+    """
+    Detection events for `people` arrivals, sorted by simulated arrival time.
+
+    Arrivals peak around the middle of the window (triangular distribution);
+    each person is seen 1..`max_repeats` times a second or two apart, each time
+    by a random camera whose clock is off by up to `max_skew_seconds`. A share
+    of detections is sent twice with the same unique_id, like a producer retry.
+    Each event carries the entry fields plus 'at' (seconds since window start)
+    and 'camera'.
+    """
+    rng = np.random.default_rng(seed)
+    day = day or date.today()
+    window_start = datetime.combine(day, start)
+    window = (datetime.combine(day, end) - window_start).total_seconds()
+    skews = rng.uniform(-max_skew_seconds, max_skew_seconds, cameras)
+    chosen = roster.iloc[rng.choice(len(roster), size=min(people, len(roster)), replace=False)]
+
+    events = []
+    for emp_id, name in zip(chosen['Employee ID'], chosen['Name']):
+        at = rng.triangular(0, window / 2, window)
+        for repeat in range(int(rng.integers(1, max_repeats + 1))):
+            camera = int(rng.integers(cameras))
+            seen = window_start + timedelta(seconds=at + skews[camera])
+            event = {
+                'employee_id': emp_id,
+                'name': name,
+                'unique_id': f"{emp_id}-{int(at * 1000)}-{repeat}",
+                'timestamp': seen.strftime(TIMESTAMP_FORMAT),
+                'at': round(float(at), 3),
+                'camera': camera,
+            }
+            events.append(event)
+            if rng.random() < retransmit_ratio:
+                events.append(dict(event, at=round(float(at) + 0.5, 3)))
+            at += rng.uniform(0.3, 2.0)
+    return sorted(events, key=lambda event: event['at'])
+
+
+def load_recording(path: str) -> List[dict]:
+    """
+    Events from a recorded day: a JSON list (or JSON lines) of entries. Entries
+    without 'at' are scheduled by their timestamp, relative to the earliest one.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().strip()
+    events = json.loads(text) if text.startswith('[') else [json.loads(line) for line in text.splitlines() if line]
+    if events and any('at' not in event for event in events):
+        stamps = pd.to_datetime(pd.Series([event.get('timestamp') for event in events]), errors='coerce')
+        offsets = (stamps - stamps.min()).dt.total_seconds().fillna(0)
+        events = [dict(event, at=float(offset)) for event, offset in zip(events, offsets)]
+    return sorted(events, key=lambda event: event['at'])
+
+
+# ---- Producers
+def entry_fields(event: dict) -> dict:
+    return {field: event.get(field) for field in ('employee_id', 'name', 'unique_id', 'timestamp')}
+
+
+class SpoolProducer:
+    def __init__(self, app):
+        self.spool_dir = app.SPOOL_DIR
+        self.rejected = 0
+
+    def send(self, entries: List[dict]) -> None:
+        write_spool_batch(self.spool_dir, entries)
+
+
+class HttpProducer:
+    """POST /events with the server's backpressure honoured (503 -> wait Retry-After, resend)."""
+
+    def __init__(self, app):
+        self.url = f"http://127.0.0.1:{app.INGEST_PORT}/events"
+        self.rejected = 0
+
+    def send(self, entries: List[dict]) -> None:
+        body = json.dumps(entries).encode()
+        while True:
+            request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(request, timeout=10):
+                    return
+            except urllib.error.HTTPError as e:
+                if e.code != 503:
+                    raise
+                self.rejected += 1
+                clock.sleep(float(e.headers.get('Retry-After') or 1))
+
+
+# ---- Watcher
+class PersistWatcher:
+    """Polls the attendance store and records when each employee's first row appeared."""
+
+    def __init__(self, app, poll_interval: float = 0.005):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.first_seen = {}
+        self.rows = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='rush-watcher', daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.poll_interval)
+
+    def poll(self):
+        month_year = self.app.get_month_year()
+        df = self.app.get_month_store(month_year).load(month_year)
+        now = clock.time()
+        self.rows = Counter(df['Employee ID'].astype(str))
+        for emp_id in self.rows:
+            self.first_seen.setdefault(emp_id, now)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.poll()
+
+
+# ---- Simulation
+def simulate(app, events: List[dict], transport: str = 'spool', speed: float = 60.0,
+             flush_interval: float = 0.05, drain_timeout: float = 60.0) -> dict:
+    """
+    Publish `events` on a clock running `speed` times faster than real time
+    (0 = as fast as possible), flushing whatever is due every `flush_interval`
+    real seconds as one batch, then wait up to `drain_timeout` for the store.
+    """
+    producer = HttpProducer(app) if transport == 'http' else SpoolProducer(app)
+    if transport == 'http':
+        if app.get_ingest_server() is None:
+            raise RuntimeError("Ingestion server is not running (port in use or disabled)")
+    else:
+        app.get_spool_consumer()
+    watcher = PersistWatcher(app)
+
+    expected = {str(event['employee_id']) for event in events if event.get('employee_id')}
+    written_at = {}
+    batches = 0
+    started = clock.time()
+    position = 0
+    while position < len(events):
+        elapsed = clock.time() - started
+        due = len(events) if not speed else next(
+            (i for i in range(position, len(events)) if events[i]['at'] / speed > elapsed), len(events))
+        if due > position:
+            batch = events[position:due]
+            producer.send([entry_fields(event) for event in batch])
+            sent = clock.time()
+            for event in batch:
+                written_at.setdefault(str(event['employee_id']), sent)
+            batches += 1
+            position = due
+        if position < len(events):
+            clock.sleep(flush_interval)
+    produced = clock.time()
+
+    deadline = produced + drain_timeout
+    while not expected <= set(watcher.first_seen) and clock.time() < deadline:
+        clock.sleep(0.01)
+    watcher.stop()
+    finished = max(watcher.first_seen.values(), default=produced)
+
+    latencies = np.array([(watcher.first_seen[emp_id] - written_at[emp_id]) * 1000
+                          for emp_id in expected if emp_id in watcher.first_seen])
+    lost = sorted(expected - set(watcher.first_seen))
+    duplicated = sorted(emp_id for emp_id, count in watcher.rows.items() if count > 1)
+    unexpected = sorted(set(watcher.rows) - expected)
+    duration = max(finished - started, 1e-9)
+
+    def percentile(q):
+        return round(float(np.percentile(latencies, q)), 1) if len(latencies) else None
+
+    return {
+        'transport': transport,
+        'speed': speed,
+        'events': len(events),
+        'people': len(expected),
+        'batches': batches,
+        'rejected_requests': producer.rejected,
+        'persisted': len(watcher.first_seen),
+        'lost': len(lost),
+        'lost_ids': lost[:20],
+        'duplicated': len(duplicated),
+        'duplicated_ids': duplicated[:20],
+        'unexpected': len(unexpected),
+        'latency_ms': {
+            'p50': percentile(50), 'p95': percentile(95), 'p99': percentile(99),
+            'max': round(float(latencies.max()), 1) if len(latencies) else None,
+            'mean': round(float(latencies.mean()), 1) if len(latencies) else None,
+        },
+        'throughput': {
+            'events_per_s': round(len(events) / duration, 1),
+            'records_per_s': round(len(watcher.first_seen) / duration, 1),
+        },
+        'duration_s': round(duration, 3),
+        'produce_s': round(produced - started, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--people', type=int, default=500)
+    parser.add_argument('--roster', type=int, default=2000, help="employees in the synthetic roster")
+    parser.add_argument('--start', default='08:50')
+    parser.add_argument('--end', default='09:20')
+    parser.add_argument('--cameras', type=int, default=3)
+    parser.add_argument('--skew', type=float, default=30.0, help="max camera clock skew (seconds)")
+    parser.add_argument('--repeats', type=int, default=4, help="max detections per person")
+    parser.add_argument('--speed', type=float, default=60.0, help="clock acceleration (0 = as fast as possible)")
+    parser.add_argument('--transport', choices=['spool', 'http'], default='spool')
+    parser.add_argument('--port', type=int, default=8799, help="ingestion server port for --transport http")
+    parser.add_argument('--replay', help="recorded events (JSON list or lines) to play instead of a generated rush")
+    parser.add_argument('--record', help="save the generated events for later --replay")
+    parser.add_argument('--output', help="write the results as JSON")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='attendance-rush-')
+    try:
+        app = import_app(workdir, ingest_port=args.port if args.transport == 'http' else 0)
+        roster = synthetic_roster(args.roster, seed=args.seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.get_employee_directory().replace(roster)
+
+        if args.replay:
+            events = load_recording(args.replay)
+        else:
+            events = rush_scenario(roster, args.people, time.fromisoformat(args.start), time.fromisoformat(args.end),
+                                   args.cameras, args.skew, args.repeats, seed=args.seed)
+        if args.record:
+            with open(args.record, 'w', encoding='utf-8') as f:
+                json.dump(events, f, indent=1)
+
+        window = events[-1]['at'] if events else 0
+        print(f"🏃 {len(events):,} detections over {window / 60:.1f} simulated min at {args.speed:g}x "
+              f"via {args.transport}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = simulate(app, events, args.transport, args.speed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result.update(git_commit=git_commit(), created_at=datetime.now().isoformat(timespec='seconds'))
+    latency = result['latency_ms']
+    print(f"✅ {result['persisted']}/{result['people']} persisted, {result['lost']} lost, "
+          f"{result['duplicated']} duplicated, {result['rejected_requests']} rejected request(s)")
+    print(f"   latency p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms, max {latency['max']} ms")
+    print(f"   throughput {result['throughput']['events_per_s']} events/s, "
+          f"{result['throughput']['records_per_s']} records/s over {result['duration_s']}s")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"✅ Results written to {args.output}")
@@ -0,0 +1,220 @@
+"""
+Attendance hot-path benchmarks on a synthetic roster and month, headless.
+
+The app is imported without a Streamlit server, pointed at a scratch data
+directory (ATTENDANCE_EXCEL_DIR / ATTENDANCE_SHARED_DIR), seeded with the
+synthetic month, and each hot path is timed. Results are written as JSON so
+runs from different commits can be compared.
+
+Run from the project root:
+    python -m benchmarks.run_benchmarks --employees 10000 --days 31 --output before.json
+    python -m benchmarks.run_benchmarks --output after.json --compare before.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time as clock
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import month_dates, synthetic_month, synthetic_roster
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL = os.path.join(PROJECT_DIR, 'best_rf_model.pkl')
+
+
+def measure(run, repeat: int, ops: int = 1, setup=None) -> dict:
+    """Time `run()` `repeat` times (after an untimed `setup()` each); app output is swallowed."""
+    seconds = []
+    for attempt in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if setup is not None:
+                setup(attempt)
+            started = clock.perf_counter()
+            run(attempt)
+            seconds.append(clock.perf_counter() - started)
+    median = statistics.median(seconds)
+    return {
+        'repeat': repeat,
+        'ops': ops,
+        'min_s': round(min(seconds), 6),
+        'median_s': round(median, 6),
+        'mean_s': round(statistics.fmean(seconds), 6),
+        'per_op_ms': round(median / ops * 1000, 4),
+    }
+
+
+def import_app(workdir: str, ingest_port: int = 0):
+    """Import app.py headless against a scratch data directory."""
+    os.environ['ATTENDANCE_EXCEL_DIR'] = os.path.join(workdir, 'excels')
+    os.environ['ATTENDANCE_SHARED_DIR'] = os.path.join(workdir, 'shared')
+    os.environ['ATTENDANCE_INGEST_PORT'] = str(ingest_port)
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    return app
+
+
+def wait_for_reports(app, timeout: float = 600.0) -> None:
+    """Let background report rebuilds finish so they do not overlap the next timing."""
+    worker = app.get_report_worker()
+    deadline = clock.monotonic() + timeout
+    while worker.status()['stale'] and clock.monotonic() < deadline:
+        clock.sleep(0.1)
+
+
+def run(employees: int, days: int, repeat: int, marks: int, lookups: int,
+        model_path: str, workdir: str) -> dict:
+    app = import_app(workdir)
+    roster = synthetic_roster(employees)
+    month = synthetic_month(roster, month_dates(days, skip=date.today()))
+    unmarked = roster['Employee ID'].tolist()
+
+    started = clock.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.get_employee_directory().replace(roster)
+        app.append_attendance_records(month.to_dict('records'))
+    seed_seconds = clock.perf_counter() - started
+    print(f"✅ Seeded {len(month):,} rows for {employees:,} employees in {seed_seconds:.1f}s")
+
+    results = {}
+
+    def case(name, *args, **kwargs):
+        results[name] = measure(*args, **kwargs)
+        print(f"   {name:<42} median {results[name]['median_s']:.4f}s  ({results[name]['per_op_ms']:.3f} ms/op)")
+
+    # ---- Write path: mark distinct, not-yet-marked employees for today
+    marks = min(marks, len(unmarked) // max(repeat, 1))
+
+    def mark_batch(attempt):
+        for emp_id in unmarked[attempt * marks:(attempt + 1) * marks]:
+            app.mark_attendance(emp_id, 'Benchmark Employee')
+
+    case('mark_attendance', mark_batch, repeat, ops=marks)
+    wait_for_reports(app)
+
+    # ---- Duplicate check: half marked today, half not
+    marked_ids = unmarked[:repeat * marks]
+    probe = [marked_ids[i % len(marked_ids)] if i % 2 and marked_ids else unmarked[-1 - i % len(unmarked)]
+             for i in range(lookups)]
+    case('is_duplicate_attendance_streamlit',
+         lambda _: [app.is_duplicate_attendance_streamlit(emp_id) for emp_id in probe], repeat, ops=lookups)
+
+    # ---- Reports: cold builds (the report file is removed first) and manifest hits
+    monthly_report = os.path.join(app.EXCEL_DIR, f'Monthly_Employee_Report_{app.get_month_year()}.xlsx')
+
+    def remove_monthly_report(_):
+        if os.path.exists(monthly_report):
+            os.remove(monthly_report)
+
+    case('create_monthly_employee_report', lambda _: app.create_monthly_employee_report(), repeat,
+         setup=remove_monthly_report)
+    case('create_monthly_employee_report_unchanged', lambda _: app.create_monthly_employee_report(), repeat)
+
+    plain_report = os.path.join(workdir, 'plain_report.xlsx')
+    styled_report = os.path.join(workdir, 'styled_report.xlsx')
+    with contextlib.redirect_stdout(io.StringIO()):
+        month[['Employee ID', 'Name', 'Status']].to_excel(plain_report, index=False)
+    case('style_excel', lambda _: app.style_excel(styled_report), repeat,
+         setup=lambda _: shutil.copyfile(plain_report, styled_report))
+
+    # ---- Pure frame transforms over the whole month
+    from modules.data_cleaning import clean_realtime_attendance
+    from modules.leave_calculator import calculate_leaves_from_lates
+    from modules.predict_attendance import predict_attendance
+
+    raw_month = month[['Employee ID', 'Date', 'Entry_Time']]
+    case('clean_realtime_attendance', lambda _: clean_realtime_attendance(raw_month, roster), repeat, ops=len(month))
+    try:
+        from modules.model_registry import load_model_file
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = load_model_file(model_path)
+    except Exception as e:
+        results['predict_attendance'] = {'skipped': f"model unavailable: {e}"}
+        print(f"⚠️ predict_attendance skipped: {e}")
+    else:
+        case('predict_attendance', lambda _: predict_attendance(month, model), repeat, ops=len(month))
+    case('calculate_leaves_from_lates', lambda _: calculate_leaves_from_lates(month), repeat, ops=len(month))
+
+    return {
+        'suite': 'attendance',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': {'pandas': pd.__version__, 'numpy': np.__version__},
+        'params': {
+            'employees': employees, 'days': len(month['Date'].unique()), 'rows': len(month),
+            'repeat': repeat, 'marks': marks, 'lookups': lookups,
+            'backend': app.ATTENDANCE_BACKEND, 'seed_s': round(seed_seconds, 3),
+        },
+        'results': results,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """Print median ratios against a baseline run; returns the cases slower than `threshold`x."""
+    regressions = []
+    print(f"\nCompared with {baseline.get('git_commit') or 'baseline'} ({baseline.get('created_at')}):")
+    for name, result in report['results'].items():
+        before = baseline.get('results', {}).get(name, {})
+        if 'median_s' not in result or not before.get('median_s'):
+            continue
+        ratio = result['median_s'] / before['median_s']
+        flag = '❌' if ratio > threshold else '✅'
+        print(f"   {flag} {name:<42} {before['median_s']:.4f}s -> {result['median_s']:.4f}s ({ratio:.2f}x)")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=10_000)
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--marks', type=int, default=200, help="mark_attendance calls per repeat")
+    parser.add_argument('--lookups', type=int, default=1000, help="duplicate checks per repeat")
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help="earlier results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2, help="slowdown ratio counted as a regression")
+    parser.add_argument('--workdir', help="scratch data directory (default: a temporary directory)")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='attendance-bench-')
+    try:
+        report = run(args.employees, args.days, args.repeat, args.marks, args.lookups, args.model, workdir)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
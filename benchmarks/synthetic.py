@@ -0,0 +1,59 @@
+"""
+Synthetic rosters and attendance months in the app's schema
+(Employee ID / Name / Date / Entry_Time / Status), for benchmarks and load tests.
+"""
+import calendar
+from datetime import date, time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.ingestion import time_based_statuses
+
+FIRST_NAMES = ['Ramsha', 'Tehreem', 'Rayyan', 'Maryam', 'Samreen', 'Taskeen', 'Muhammad', 'Hammad',
+               'Ayesha', 'Bilal', 'Fatima', 'Hassan', 'Iqra', 'Usman', 'Zainab', 'Omar']
+LAST_NAMES = ['Tariq', 'Siddiqui', 'Ahmad', 'Sheikh', 'Fatima', 'Abbas', 'Shaf', 'Hassan',
+              'Khan', 'Malik', 'Qureshi', 'Raza', 'Butt', 'Chaudhry', 'Mirza', 'Javed']
+
+
+def synthetic_roster(employees: int, seed: int = 7) -> pd.DataFrame:
+    """Employee master with IDs EMP000001.. and random (repeating) first/last names."""
+    rng = np.random.default_rng(seed)
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), employees)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), employees)]
+    return pd.DataFrame({
+        'Employee ID': [f"EMP{i:06d}" for i in range(1, employees + 1)],
+        'Name': first + ' ' + last,
+    })
+
+
+def month_dates(days: int, month_day: Optional[date] = None, skip: Optional[date] = None) -> list:
+    """Up to `days` dates of the month containing `month_day` (default today), without `skip`."""
+    month_day = month_day or date.today()
+    last_day = calendar.monthrange(month_day.year, month_day.month)[1]
+    dates = [month_day.replace(day=day) for day in range(1, last_day + 1)]
+    return [d for d in dates if d != skip][:days]
+
+
+def entry_times(count: int, rng: np.random.Generator, absent_ratio: float = 0.05,
+                mean_minute: int = 9 * 60, spread_minutes: float = 12.0) -> np.ndarray:
+    """Arrival times around `mean_minute` (normal, minute resolution); None for absentees."""
+    minutes = np.clip(np.rint(rng.normal(mean_minute, spread_minutes, count)), 6 * 60, 13 * 60).astype(int)
+    times = np.array([time(m // 60, m % 60) for m in minutes], dtype=object)
+    times[rng.random(count) < absent_ratio] = None
+    return times
+
+
+def synthetic_month(roster: pd.DataFrame, dates: list, seed: int = 7, absent_ratio: float = 0.05) -> pd.DataFrame:
+    """One row per employee per date; Status follows the app's time-based rule."""
+    rng = np.random.default_rng(seed)
+    rows = len(roster) * len(dates)
+    times = entry_times(rows, rng, absent_ratio)
+    return pd.DataFrame({
+        'Employee ID': np.tile(roster['Employee ID'].to_numpy(dtype=object), len(dates)),
+        'Name': np.tile(roster['Name'].to_numpy(dtype=object), len(dates)),
+        'Date': np.repeat(np.array([d.strftime('%d/%m/%Y') for d in dates], dtype=object), len(roster)),
+        'Entry_Time': times,
+        'Status': time_based_statuses(times).astype(object),
+    })
@@ -0,0 +1,320 @@
+import argparse
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.atomic_files import atomic_write
+from modules.schema import (
+    TYPED_COLUMNS, concat_typed, empty_typed, encode_dates, parse_dates, status_dtype
+)
+
+# Parquet when pyarrow is installed, otherwise one uncompressed .npz per month
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def month_key(month_year: str) -> str:
+    """'January_2025' (the app's month naming) -> '2025-01' (the partition key)."""
+    return datetime.strptime(month_year, '%B_%Y').strftime('%Y-%m')
+
+
+def month_start(key: str) -> np.datetime64:
+    return np.datetime64(key, 'D')
+
+
+def keys_between(keys: Iterable[str], start=None, end=None) -> List[str]:
+    """The partition keys whose month overlaps the inclusive [start, end] range."""
+    first = _bound_key(start)
+    last = _bound_key(end)
+    return sorted(key for key in keys if (first is None or key >= first) and (last is None or key <= last))
+
+
+def _bound_key(value) -> Optional[str]:
+    if value is None:
+        return None
+    day = parse_dates([value]).to_numpy()[0]
+    if np.isnat(day):
+        raise ValueError(f"Unrecognized date: {value!r}")
+    return str(day.astype('datetime64[M]'))
+
+
+def _as_day(value) -> Optional[np.datetime64]:
+    return None if value is None else parse_dates([value]).to_numpy()[0].astype('datetime64[D]')
+
+
+class MonthArchive:
+    """
+    Closed months compacted into one columnar file per month.
+
+    Layout: `<archive_dir>/month=YYYY-MM/attendance.parquet` (or `.npz` without
+    pyarrow) plus a manifest of what each partition holds. Employee ID, Name
+    and Status are dictionary-encoded, the date is stored as the day of the
+    month (int8) and the entry time as minutes since midnight (int16), so a
+    year of history is a few MB on disk.
+
+    query() only opens the partitions whose month overlaps the requested range
+    and only reads the requested (and filtered-on) columns; an employee or
+    status filter is resolved against each partition's dictionary first, so
+    months where it never occurs are skipped without touching the row data.
+    The current month stays in the attendance store; callers combine the two.
+    """
+
+    def __init__(self, archive_dir: str, format: Optional[str] = None):
+        self.archive_dir = archive_dir
+        self.format = format or ('parquet' if pq is not None else 'npz')
+        if self.format == 'parquet' and pq is None:
+            raise ImportError("pyarrow is required for the parquet archive format")
+        os.makedirs(archive_dir, exist_ok=True)
+        self.manifest_path = os.path.join(archive_dir, MANIFEST_FILE)
+        self._lock = threading.Lock()
+        self._manifest = self._read_manifest()
+
+    # --------------------------------------------------------------- manifest
+    def _read_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self) -> None:
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self._manifest, f, indent=2, sort_keys=True)
+        atomic_write(self.manifest_path, write)
+
+    def months(self) -> List[str]:
+        """Archived months in the app's naming ('January_2025', ...), oldest first."""
+        with self._lock:
+            return [self._manifest[key]['month_year'] for key in sorted(self._manifest)]
+
+    def has_month(self, month_year: str) -> bool:
+        with self._lock:
+            return month_key(month_year) in self._manifest
+
+    def partitions(self) -> pd.DataFrame:
+        """One row per archived month, for display."""
+        with self._lock:
+            entries = [dict(entry, key=key) for key, entry in sorted(self._manifest.items())]
+        rows = []
+        for entry in entries:
+            path = os.path.join(self.archive_dir, entry['file'])
+            rows.append({
+                'Month': entry['key'],
+                'Rows': entry['rows'],
+                'Format': entry['format'],
+                'Size (KB)': round(os.path.getsize(path) / 1024, 1) if os.path.exists(path) else None,
+                'Compacted': entry['compacted_at'],
+            })
+        return pd.DataFrame(rows, columns=['Month', 'Rows', 'Format', 'Size (KB)', 'Compacted'])
+
+    # ---------------------------------------------------------------- compact
+    def compact(self, month_year: str, typed: pd.DataFrame) -> dict:
+        """
+        Write a month's typed rows (modules.schema) as its partition, replacing
+        any earlier one. The file is written under a temporary name and renamed,
+        so a query never sees half a partition.
+        """
+        key = month_key(month_year)
+        dates = typed['Date'].astype('datetime64[s]').to_numpy().astype('datetime64[D]')
+        outside = ~np.isnat(dates) & (dates.astype('datetime64[M]') != np.datetime64(key, 'M'))
+        if outside.any():
+            raise ValueError(f"{int(outside.sum())} row(s) dated outside {month_year}")
+
+        partition_dir = os.path.join(self.archive_dir, f'month={key}')
+        os.makedirs(partition_dir, exist_ok=True)
+        filename = f'attendance.{self.format}'
+        path = os.path.join(partition_dir, filename)
+
+        def write(tmp_path):
+            if self.format == 'parquet':
+                pq.write_table(self._to_table(typed), tmp_path)
+            else:
+                with open(tmp_path, 'wb') as f:
+                    np.savez(f, **self._to_arrays(typed, dates, key))
+        atomic_write(path, write)
+
+        entry = {
+            'month_year': month_year,
+            'file': os.path.join(f'month={key}', filename),
+            'format': self.format,
+            'rows': int(len(typed)),
+            'compacted_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            stale = self._manifest.get(key)
+            self._manifest[key] = entry
+            self._write_manifest()
+        if stale and stale['file'] != entry['file']:
+            try:
+                os.remove(os.path.join(self.archive_dir, stale['file']))
+            except OSError:
+                pass
+        return entry
+
+    @staticmethod
+    def _dictionary(values: pd.Series, code_dtype) -> tuple:
+        codes, uniques = pd.factorize(values.astype(object), use_na_sentinel=True)
+        return codes.astype(code_dtype), np.asarray(uniques, dtype=str)
+
+    def _to_arrays(self, typed: pd.DataFrame, dates: np.ndarray, key: str) -> dict:
+        days = np.where(np.isnat(dates), 0, (dates - month_start(key)).astype(np.int64) + 1)
+        employee_codes, employee_values = self._dictionary(typed['Employee ID'], np.int32)
+        name_codes, name_values = self._dictionary(typed['Name'], np.int32)
+        status_codes, status_values = self._dictionary(typed['Status'], np.int16)
+        return {
+            'employee_codes': employee_codes, 'employee_values': employee_values,
+            'name_codes': name_codes, 'name_values': name_values,
+            'day': days.astype(np.int8),  # 0 = no date
+            'entry_minute': typed['Entry_Minute'].to_numpy(dtype=np.int16),
+            'status_codes': status_codes, 'status_values': status_values,
+        }
+
+    @staticmethod
+    def _to_table(typed: pd.DataFrame):
+        def dictionary(column):
+            return pa.array(typed[column].astype(object), type=pa.string(), from_pandas=True).dictionary_encode()
+
+        return pa.table({
+            'Employee ID': dictionary('Employee ID'),
+            'Name': dictionary('Name'),
+            'Date': pa.array(typed['Date'].astype('datetime64[s]').to_numpy().astype('datetime64[D]'), type=pa.date32()),
+            'Entry_Minute': pa.array(typed['Entry_Minute'].to_numpy(dtype=np.int16)),
+            'Status': dictionary('Status'),
+        })
+
+    # ------------------------------------------------------------------ query
+    def query(self, start=None, end=None, emp_id=None, status=None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Archived rows in the inclusive date range, optionally for one employee
+        and/or one status, as a typed frame holding `columns` (default: all).
+
+        Args:
+            start, end: 'dd/mm/YYYY' strings, ISO strings or dates; either may be omitted
+            emp_id: restrict to one Employee ID
+            status: restrict to one Status value (e.g. 'Late')
+        """
+        columns = list(columns or TYPED_COLUMNS)
+        unknown = set(columns) - set(TYPED_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+        first, last = _as_day(start), _as_day(end)
+        with self._lock:
+            entries = [(key, dict(self._manifest[key])) for key in keys_between(self._manifest, start, end)]
+
+        frames = []
+        for key, entry in entries:
+            path = os.path.join(self.archive_dir, entry['file'])
+            if entry['format'] == 'parquet':
+                frame = self._query_parquet(path, first, last, emp_id, status, columns)
+            else:
+                frame = self._query_npz(path, key, first, last, emp_id, status, columns)
+            if frame is not None and len(frame):
+                frames.append(frame)
+        if not frames:
+            return empty_typed()[columns]
+        return concat_typed(frames)[columns]
+
+    @staticmethod
+    def _query_npz(path, key, first, last, emp_id, status, columns) -> Optional[pd.DataFrame]:
+        with np.load(path, allow_pickle=False) as data:
+            # Members are read on access, so only the arrays used below leave the disk
+            mask = None
+
+            def restrict(condition):
+                nonlocal mask
+                mask = condition if mask is None else mask & condition
+
+            wanted = {}
+            for column, value in (('employee', emp_id), ('status', status)):
+                if value is not None:
+                    codes = np.flatnonzero(data[f'{column}_values'] == str(value))
+                    if not len(codes):
+                        return None
+                    wanted[column] = codes[0]
+            for column, code in wanted.items():
+                restrict(data[f'{column}_codes'] == code)
+            if first is not None or last is not None:
+                month_first = month_start(key)
+                day = data['day']
+                restrict(day > 0)
+                if first is not None:
+                    restrict(day >= (first - month_first).astype(np.int64) + 1)
+                if last is not None:
+                    restrict(day <= (last - month_first).astype(np.int64) + 1)
+
+            def take(name):
+                values = data[name]
+                return values if mask is None else values[mask]
+
+            frame = {}
+            for column in columns:
+                if column == 'Date':
+                    day = take('day').astype(np.int64)
+                    dates = np.where(day > 0, month_start(key) + (day - 1), np.datetime64('NaT'))
+                    frame[column] = encode_dates(dates.astype('datetime64[s]'))
+                elif column == 'Entry_Minute':
+                    frame[column] = take('entry_minute')
+                else:
+                    prefix = {'Employee ID': 'employee', 'Name': 'name', 'Status': 'status'}[column]
+                    values = data[f'{prefix}_values']
+                    categorical = pd.Categorical.from_codes(take(f'{prefix}_codes'), categories=values.astype(object))
+                    if column == 'Status':
+                        categorical = categorical.set_categories(status_dtype(values).categories)
+                    frame[column] = categorical
+        return pd.DataFrame(frame)
+
+    @staticmethod
+    def _query_parquet(path, first, last, emp_id, status, columns) -> Optional[pd.DataFrame]:
+        filters = []
+        if emp_id is not None:
+            filters.append(('Employee ID', '=', str(emp_id)))
+        if status is not None:
+            filters.append(('Status', '=', str(status)))
+        if first is not None:
+            filters.append(('Date', '>=', first.astype(object)))
+        if last is not None:
+            filters.append(('Date', '<=', last.astype(object)))
+        table = pq.read_table(path, columns=columns, filters=filters or None)
+        df = table.to_pandas(date_as_object=False)
+        frame = {}
+        for column in columns:
+            values = df[column]
+            if column == 'Date':
+                frame[column] = encode_dates(values.to_numpy().astype('datetime64[s]'))
+            elif column == 'Entry_Minute':
+                frame[column] = values.to_numpy(dtype=np.int16)
+            else:
+                # Dictionary columns come back as categoricals; keep their codes
+                categorical = pd.Categorical(values)
+                if column == 'Status':
+                    categorical = categorical.set_categories(status_dtype(categorical.categories).categories)
+                frame[column] = categorical
+        return pd.DataFrame(frame)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the monthly attendance archive")
+    parser.add_argument('archive_dir')
+    parser.add_argument('--employee', help="Employee ID")
+    parser.add_argument('--start', help="first date (dd/mm/YYYY or YYYY-MM-DD)")
+    parser.add_argument('--end', help="last date (dd/mm/YYYY or YYYY-MM-DD)")
+    parser.add_argument('--status', help="e.g. Late")
+    args = parser.parse_args()
+
+    archive = MonthArchive(args.archive_dir)
+    result = archive.query(args.start, args.end, args.employee, args.status)
+    print(f"✅ {len(result):,} row(s) from {len(archive.months())} archived month(s)")
+    if len(result):
+        print(result.to_string(index=False, max_rows=50))
@@ -0,0 +1,130 @@
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Callable, List
+
+GENERATIONS_DIR = '.generations'
+# Snapshots kept per report/raw workbook
+WORKBOOK_GENERATIONS = 3
+# How often os.replace is retried when the target is held open (Windows sharing violations)
+REPLACE_ATTEMPTS = 5
+
+_lock = threading.Lock()
+
+
+def fsync_path(path: str) -> None:
+    with open(path, 'rb+') as f:
+        os.fsync(f.fileno())
+
+
+def fsync_dir(directory: str) -> None:
+    """Make a rename durable; directories cannot be opened on Windows, where this is a no-op."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, write: Callable[[str], None], generations: int = 0) -> str:
+    """
+    Produce `path` with `write(tmp_path)` so that readers only ever open a
+    complete file: the content is written to a temporary file with the same
+    extension (pandas/openpyxl pick the format from it), fsynced, and renamed
+    over `path`, then the directory is fsynced.
+
+    With `generations` > 0 every write becomes a numbered, immutable snapshot
+    in `.generations/` next to the file (`Report.g000012.xlsx`) and `path` is
+    re-pointed at it with a hard link and one rename. A reader that opened an
+    earlier generation keeps a complete file; the newest `generations`
+    snapshots are kept and older ones pruned. Returns the path now holding the
+    content (the generation file, or `path`).
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    stem, ext = os.path.splitext(name)
+    tag = f'{os.getpid()}.{threading.get_ident()}'
+
+    if not generations:
+        tmp_path = os.path.join(directory, f'.{stem}.{tag}.tmp{ext}')
+        _write_synced(write, tmp_path)
+        _replace(tmp_path, path)
+        fsync_dir(directory)
+        return path
+
+    generation_dir = os.path.join(directory, GENERATIONS_DIR)
+    os.makedirs(generation_dir, exist_ok=True)
+    tmp_path = os.path.join(generation_dir, f'.{stem}.{tag}.tmp{ext}')
+    _write_synced(write, tmp_path)
+    with _lock:
+        number = max((number for number, _ in _generations(generation_dir, stem, ext)), default=0) + 1
+        generation_path = os.path.join(generation_dir, f'{stem}.g{number:06d}{ext}')
+        os.replace(tmp_path, generation_path)
+        fsync_dir(generation_dir)
+
+        link_path = os.path.join(directory, f'.{stem}.{tag}.link{ext}')
+        try:
+            os.link(generation_path, link_path)
+        except OSError:
+            shutil.copyfile(generation_path, link_path)  # no hard links on this filesystem
+            fsync_path(link_path)
+        _replace(link_path, path)
+        fsync_dir(directory)
+
+        for _, old_path in _generations(generation_dir, stem, ext)[:-generations]:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass  # still open somewhere (Windows); pruned on a later write
+    return generation_path
+
+
+def list_generations(path: str) -> List[str]:
+    """Snapshot files kept for `path`, oldest first."""
+    directory, name = os.path.split(os.path.abspath(path))
+    stem, ext = os.path.splitext(name)
+    return [generation for _, generation in _generations(os.path.join(directory, GENERATIONS_DIR), stem, ext)]
+
+
+def _generations(generation_dir: str, stem: str, ext: str) -> list:
+    pattern = re.compile(rf'{re.escape(stem)}\.g(\d+){re.escape(ext)}$')
+    try:
+        names = os.listdir(generation_dir)
+    except FileNotFoundError:
+        return []
+    found = []
+    for filename in names:
+        match = pattern.match(filename)
+        if match:
+            found.append((int(match.group(1)), os.path.join(generation_dir, filename)))
+    return sorted(found)
+
+
+def _write_synced(write: Callable[[str], None], tmp_path: str) -> None:
+    try:
+        write(tmp_path)
+        fsync_path(tmp_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _replace(src: str, dst: str) -> None:
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == REPLACE_ATTEMPTS - 1:
+                os.remove(src)
+                raise
+            time.sleep(0.1 * (attempt + 1))
@@ -0,0 +1,427 @@
+import glob
+import json
+import os
+import threading
+import time as time_module
+import uuid
+from collections import Counter
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable
+
+import pandas as pd
+
+from modules.atomic_files import WORKBOOK_GENERATIONS, atomic_write
+from modules.parse_cache import read_cached
+from modules.status_summary import filter_date_range, status_totals
+
+# Column layout of the monthly raw attendance workbook
+RAW_COLUMNS = ['Employee ID', 'Name', 'Date', 'Entry_Time', 'Status']
+
+
+def serialize_entry_time(value):
+    """Store entry times as 'HH:MM:SS' strings so every log line is plain JSON."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (time, datetime)):
+        return value.strftime('%H:%M:%S')
+    return str(value)
+
+
+def parse_entry_time(value):
+    """Turn a logged 'HH:MM:SS' string back into a datetime.time (like read_excel does)."""
+    if not isinstance(value, str):
+        return value
+    for fmt in ('%H:%M:%S', '%H:%M'):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+    return value
+
+
+def _covers(tombstone: dict, date_str, emp_id) -> bool:
+    """Whether a tombstone's scope (a date, or one employee on it) includes the row."""
+    return tombstone.get('Date') == date_str and tombstone.get('Employee ID') in (None, emp_id)
+
+
+class AttendanceLog:
+    """
+    Durable append-only attendance log with one line-delimited JSON segment per month.
+
+    Marking attendance appends a single line to the month's segment, so a mark costs
+    O(1) regardless of how many rows the month already holds. Lines are flushed to the
+    OS on every append; fsync is batched (every `fsync_every` records or after
+    `fsync_interval` seconds, whichever comes first) so the morning rush is not bound
+    by disk syncs. The monthly raw Excel workbook is materialized from the log on demand.
+
+    Deletes are appended too, as tombstone lines that hide the matching earlier
+    rows on replay; compact() rewrites a segment without them once they are
+    old enough that undo_delete() is no longer offered. A month is replayed
+    once; after that its live record counts and active tombstones are kept in
+    memory, so tombstones() and undo_delete() do not re-read the segment.
+    """
+
+    def __init__(self, log_dir: str, fsync_every: int = 32, fsync_interval: float = 1.0):
+        self.log_dir = log_dir
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        os.makedirs(log_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._handles = {}
+        self._pending = 0
+        self._last_fsync = time_module.monotonic()
+        self._fsync_timer = None
+        # Per month, built lazily in one pass over the segment: live record counts per
+        # (Date, Employee ID), and the active tombstones by id (oldest first), each with
+        # '_hidden', the Counter of records it hid itself
+        self._marked: Dict[str, Counter] = {}
+        self._tombstones: Dict[str, dict] = {}
+
+    def segment_path(self, month_year: str) -> str:
+        return os.path.join(self.log_dir, f'Attendance_Log_{month_year}.jsonl')
+
+    def has_segment(self, month_year: str) -> bool:
+        return os.path.exists(self.segment_path(month_year))
+
+    def months(self) -> list:
+        """Every month with a segment ('October_2026', ...)."""
+        paths = glob.glob(os.path.join(self.log_dir, 'Attendance_Log_*.jsonl'))
+        return sorted(os.path.basename(path)[len('Attendance_Log_'):-len('.jsonl')] for path in paths)
+
+    def source_paths(self, month_year: str):
+        """Files whose stat() changes whenever the month's data changes."""
+        return [self.segment_path(month_year)]
+
+    # ------------------------------------------------------------------ writes
+    def append(self, record: dict, month_year: str) -> None:
+        """Append one attendance record to the month's segment."""
+        self.append_many([record], month_year)
+
+    def append_many(self, records: Iterable[dict], month_year: str) -> int:
+        """Append several records with a single write call; returns the number written."""
+        rows = [self._normalize(record) for record in records]
+        if not rows:
+            return 0
+        payload = ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+
+        with self._lock:
+            handle = self._handle(month_year)
+            handle.write(payload)
+            handle.flush()
+
+            marked = self._marked.get(month_year)
+            if marked is not None:
+                marked.update((row['Date'], row['Employee ID']) for row in rows)  # counts
+
+            self._pending += len(rows)
+            if (self._pending >= self.fsync_every
+                    or time_module.monotonic() - self._last_fsync >= self.fsync_interval):
+                self._fsync_locked()
+            else:
+                self._schedule_fsync_locked()
+        return len(rows)
+
+    def flush(self) -> None:
+        """Force all pending appends to stable storage."""
+        with self._lock:
+            self._fsync_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fsync_locked()
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+    def delete_date(self, date_str: str, month_year: str, emp_id=None) -> int:
+        """
+        Hide every record for one date (or one employee-day) by appending a
+        tombstone line; rows appended after it are not affected. The segment is
+        only rewritten later, by compact(). Returns the number of records hidden.
+        """
+        with self._lock:
+            marked, active = self._state_locked(month_year)
+            hidden = Counter({pair: count for pair, count in marked.items()
+                              if pair[0] == date_str and (emp_id is None or pair[1] == emp_id)})
+            if not hidden:
+                return 0
+            tombstone = {
+                '_tombstone': uuid.uuid4().hex[:12],
+                'Date': date_str,
+                'Employee ID': emp_id,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._append_entry_locked(month_year, tombstone)
+            for pair in hidden:
+                del marked[pair]
+            active[tombstone['_tombstone']] = dict(tombstone, _hidden=hidden)
+            return sum(hidden.values())
+
+    def tombstones(self, month_year: str = None) -> list:
+        """Deletes that can still be undone (not compacted yet), newest first."""
+        found = []
+        with self._lock:
+            for month in ([month_year] if month_year else self.months()):
+                _, active = self._state_locked(month)
+                found += [{'id': tombstone_id, 'month': month, 'date': entry.get('Date'),
+                           'employee_id': entry.get('Employee ID'), 'created_at': entry.get('created_at')}
+                          for tombstone_id, entry in active.items()]
+        return sorted(found, key=lambda entry: entry['created_at'] or '', reverse=True)
+
+    def undo_delete(self, tombstone_id) -> int:
+        """Revoke a tombstone that was not compacted yet; returns the number of records restored."""
+        with self._lock:
+            for month_year in self.months():
+                marked, active = self._state_locked(month_year)
+                if tombstone_id not in active:
+                    continue
+                self._append_entry_locked(month_year, {'_undo': tombstone_id})
+                ids = list(active)
+                newer = [active[newer_id] for newer_id in ids[ids.index(tombstone_id) + 1:]]
+                tombstone = active.pop(tombstone_id)
+                restored = 0
+                for pair, count in tombstone['_hidden'].items():
+                    # Records also covered by a later tombstone stay hidden, now by the nearest one
+                    owner = next((entry for entry in newer if _covers(entry, *pair)), None)
+                    if owner is not None:
+                        owner['_hidden'][pair] += count
+                    else:
+                        marked[pair] += count
+                        restored += count
+                return restored
+        return 0
+
+    def undo_conflicts(self, tombstone_id) -> list:
+        """
+        Employee IDs that undo_delete() would give a second record for the day:
+        rows it would restore for an employee who was marked again since.
+        """
+        with self._lock:
+            for month_year in self.months():
+                marked, active = self._state_locked(month_year)
+                if tombstone_id not in active:
+                    continue
+                ids = list(active)
+                newer = [active[newer_id] for newer_id in ids[ids.index(tombstone_id) + 1:]]
+                return sorted({pair[1] for pair in active[tombstone_id]['_hidden']
+                               if marked[pair] > 0 and not any(_covers(entry, *pair) for entry in newer)}, key=str)
+        return []
+
+    def compact(self, min_age: float = 0.0) -> int:
+        """
+        Rewrite segments without the rows hidden by tombstones at least `min_age`
+        seconds old (those can no longer be undone), dropping those tombstones and
+        any undone ones. Younger tombstones stay in place. Returns the rows removed.
+        """
+        cutoff = (datetime.now() - timedelta(seconds=min_age)).isoformat(timespec='seconds')
+        removed = 0
+        with self._lock:
+            for month_year in self.months():
+                entries = list(self._iter_lines(month_year))
+                undone = {entry['_undo'] for entry in entries if '_undo' in entry}
+                due = {entry['_tombstone'] for entry in entries
+                       if '_tombstone' in entry and entry['_tombstone'] not in undone
+                       and (entry.get('created_at') or '') <= cutoff}
+                if not due and not undone:
+                    continue
+                kept = []
+                later = {}  # date -> employee IDs (None = everyone) of due tombstones written after this point
+                for entry in reversed(entries):
+                    if '_undo' in entry:
+                        continue
+                    if '_tombstone' in entry:
+                        if entry['_tombstone'] in due:
+                            later.setdefault(entry.get('Date'), set()).add(entry.get('Employee ID'))
+                        elif entry['_tombstone'] not in undone:
+                            kept.append(entry)
+                        continue
+                    scope = later.get(entry.get('Date'))
+                    if scope and (None in scope or entry.get('Employee ID') in scope):
+                        removed += 1
+                        continue
+                    kept.append(entry)
+                kept.reverse()
+                self._rewrite_locked(month_year, kept)
+                for tombstone_id in due:
+                    self._tombstones.get(month_year, {}).pop(tombstone_id, None)
+        return removed
+
+    # ------------------------------------------------------------------- reads
+    def has_entry(self, emp_id, date_str: str, month_year: str) -> bool:
+        """O(1) check whether an employee already has a record for the given date."""
+        with self._lock:
+            return self._state_locked(month_year)[0][(date_str, emp_id)] > 0
+
+    def load(self, month_year: str) -> pd.DataFrame:
+        """Replay the month's segment into a DataFrame with the raw workbook columns."""
+        rows = list(self._iter_rows(month_year))
+        if not rows:
+            return pd.DataFrame(columns=RAW_COLUMNS)
+        df = pd.DataFrame(rows).reindex(columns=RAW_COLUMNS)
+        df['Entry_Time'] = df['Entry_Time'].map(parse_entry_time)
+        return df
+
+    def query(self, start=None, end=None, emp_id=None, status=None) -> pd.DataFrame:
+        """
+        Records in an inclusive date range, optionally filtered by employee and status.
+        The log has no index, so this replays every segment.
+        """
+        frames = []
+        for path in sorted(glob.glob(os.path.join(self.log_dir, 'Attendance_Log_*.jsonl'))):
+            month_year = os.path.basename(path)[len('Attendance_Log_'):-len('.jsonl')]
+            frames.append(self.load(month_year))
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=RAW_COLUMNS)
+        df = pd.concat(frames, ignore_index=True)
+
+        df = filter_date_range(df, start, end)
+        if emp_id is not None:
+            df = df[df['Employee ID'] == emp_id]
+        if status is not None:
+            df = df[df['Status'] == status]
+        return df.reset_index(drop=True)
+
+    def day_summary(self, date_str: str) -> Dict[str, int]:
+        """Status counts for one date: {'Present': n, 'Late': n, ..., 'Total': n}."""
+        month_year = datetime.strptime(date_str, '%d/%m/%Y').strftime('%B_%Y')
+        df = self.load(month_year)
+        return status_totals(df[df['Date'] == date_str])
+
+    # ---------------------------------------------------------- excel bridging
+    def import_excel(self, raw_file: str, month_year: str) -> int:
+        """Seed an empty segment from an existing Attendance_Raw workbook."""
+        with self._lock:
+            if self.has_segment(month_year) or not os.path.exists(raw_file):
+                return 0
+            df = read_cached(raw_file, pd.read_excel, key='raw')
+            df = df.reindex(columns=RAW_COLUMNS)
+            self._marked.pop(month_year, None)
+            self._tombstones.pop(month_year, None)
+            count = self.append_many(df.to_dict('records'), month_year)
+            self._fsync_locked()
+            return count
+
+    def export_excel(self, month_year: str, raw_file: str) -> str:
+        """Materialize the month's raw Excel workbook from the log."""
+        df = self.load(month_year)
+        atomic_write(raw_file, lambda path: df.to_excel(path, index=False), generations=WORKBOOK_GENERATIONS)
+        return raw_file
+
+    # ----------------------------------------------------------------- helpers
+    def _normalize(self, record: dict) -> dict:
+        row = {}
+        for column in RAW_COLUMNS:
+            value = record.get(column)
+            if column == 'Entry_Time':
+                value = serialize_entry_time(value)
+            elif value is not None and not isinstance(value, str) and pd.isna(value):
+                value = None
+            row[column] = value
+        return row
+
+    def _state_locked(self, month_year: str) -> tuple:
+        """(live record counts, active tombstones) of a month, replayed on first use."""
+        marked = self._marked.get(month_year)
+        if marked is None:
+            rows, active = self._replay(month_year)
+            marked = Counter((row.get('Date'), row.get('Employee ID')) for row in rows)
+            self._marked[month_year] = marked
+            self._tombstones[month_year] = {entry['_tombstone']: entry for entry in active}
+        return marked, self._tombstones[month_year]
+
+    def _append_entry_locked(self, month_year: str, entry: dict) -> None:
+        """Write a control line (tombstone or undo) and sync it right away."""
+        handle = self._handle(month_year)
+        handle.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        handle.flush()
+        self._pending += 1
+        self._fsync_locked()
+
+    def _rewrite_locked(self, month_year: str, entries: list) -> None:
+        self._fsync_locked()
+        handle = self._handles.pop(month_year, None)
+        if handle is not None:
+            handle.close()
+
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+        atomic_write(self.segment_path(month_year), write)
+
+    def _replay(self, month_year: str) -> tuple:
+        """
+        (live rows, active tombstones oldest first) of a segment. A tombstone
+        hides the matching rows written before it, unless an undo line revoked
+        it. Each hidden row is counted in the '_hidden' Counter of the nearest
+        tombstone after it, the one that hid it.
+        """
+        entries = list(self._iter_lines(month_year))
+        undone = {entry['_undo'] for entry in entries if '_undo' in entry}
+        rows, active = [], []
+        later = {}  # date -> tombstones written after this point, nearest last
+        for entry in reversed(entries):
+            if '_undo' in entry:
+                continue
+            if '_tombstone' in entry:
+                if entry['_tombstone'] not in undone:
+                    entry['_hidden'] = Counter()
+                    active.append(entry)
+                    later.setdefault(entry.get('Date'), []).append(entry)
+                continue
+            pair = (entry.get('Date'), entry.get('Employee ID'))
+            owner = next((tombstone for tombstone in reversed(later.get(pair[0], ())) if _covers(tombstone, *pair)),
+                         None)
+            if owner is not None:
+                owner['_hidden'][pair] += 1
+                continue
+            rows.append(entry)
+        rows.reverse()
+        active.reverse()
+        return rows, active
+
+    def _iter_rows(self, month_year: str):
+        """Live attendance rows of a segment, in insertion order."""
+        return iter(self._replay(month_year)[0])
+
+    def _iter_lines(self, month_year: str):
+        path = self.segment_path(month_year)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append; skip it
+                    continue
+
+    def _handle(self, month_year: str):
+        handle = self._handles.get(month_year)
+        if handle is None or handle.closed:
+            handle = open(self.segment_path(month_year), 'a', encoding='utf-8')
+            self._handles[month_year] = handle
+        return handle
+
+    def _fsync_locked(self) -> None:
+        if self._fsync_timer is not None:
+            self._fsync_timer.cancel()
+            self._fsync_timer = None
+        if self._pending:
+            for handle in self._handles.values():
+                if not handle.closed:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+        self._pending = 0
+        self._last_fsync = time_module.monotonic()
+
+    def _schedule_fsync_locked(self) -> None:
+        if self._fsync_timer is not None:
+            return
+        self._fsync_timer = threading.Timer(self.fsync_interval, self.flush)
+        self._fsync_timer.daemon = True
+        self._fsync_timer.start()
@@ -0,0 +1,396 @@
+import glob
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from modules.atomic_files import WORKBOOK_GENERATIONS, atomic_write
+from modules.attendance_log import RAW_COLUMNS, parse_entry_time, serialize_entry_time
+from modules.parse_cache import read_cached
+from modules.status_summary import STATUSES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attendance (
+    id          INTEGER PRIMARY KEY,
+    employee_id TEXT NOT NULL,
+    name        TEXT,
+    date        TEXT NOT NULL,
+    month       TEXT NOT NULL,
+    entry_time  TEXT,
+    status      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_date_employee ON attendance (date, employee_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_employee_date ON attendance (employee_id, date);
+CREATE INDEX IF NOT EXISTS idx_attendance_status_date ON attendance (status, date);
+CREATE INDEX IF NOT EXISTS idx_attendance_month ON attendance (month);
+
+CREATE TABLE IF NOT EXISTS months (
+    month       TEXT PRIMARY KEY,
+    source      TEXT,
+    created_at  TEXT
+);
+
+-- A delete is a tombstone hiding the matching rows written before it (id <= max_row_id);
+-- compaction removes the rows later, and until then the tombstone can be undone
+CREATE TABLE IF NOT EXISTS tombstones (
+    id           INTEGER PRIMARY KEY,
+    month        TEXT NOT NULL,
+    date         TEXT NOT NULL,
+    employee_id  TEXT,
+    max_row_id   INTEGER NOT NULL,
+    created_at   TEXT NOT NULL,
+    undone_at    TEXT,
+    compacted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tombstones_date ON tombstones (date);
+
+CREATE VIEW IF NOT EXISTS live_attendance AS
+SELECT * FROM attendance AS a
+WHERE NOT EXISTS (
+    SELECT 1 FROM tombstones AS t
+    WHERE t.date = a.date AND t.month = a.month AND a.id <= t.max_row_id
+      AND t.undone_at IS NULL AND t.compacted_at IS NULL
+      AND (t.employee_id IS NULL OR t.employee_id = a.employee_id)
+);
+"""
+
+
+def to_iso_date(value) -> Optional[str]:
+    """
+    Normalize a date to ISO 'YYYY-MM-DD' so SQLite can range-scan it.
+    Accepts the app's 'dd/mm/YYYY' strings, date/datetime objects and ISO strings.
+    Unparseable strings are returned unchanged.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text
+
+
+def from_iso_date(value: Optional[str]) -> Optional[str]:
+    """Convert an ISO date back to the 'dd/mm/YYYY' format used in the workbooks."""
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%d/%m/%Y')
+    except ValueError:
+        return value
+
+
+class SQLiteAttendanceStore:
+    """
+    Attendance storage backed by an embedded SQLite database in WAL mode.
+
+    Exposes the same interface as `AttendanceLog`, plus indexed lookups:
+    duplicate checks hit the (date, employee_id) index, today's metrics are a
+    GROUP BY over one date, and date-range queries are range scans. Dates are
+    stored as ISO strings and converted back to 'dd/mm/YYYY' on the way out so
+    the Excel exports keep their current format. Deletes insert a tombstone and
+    every read goes through the live_attendance view that applies them; the
+    hidden rows are removed by compact().
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def has_segment(self, month_year: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM months WHERE month = ?', (month_year,)
+            ).fetchone()
+        return row is not None
+
+    def months(self) -> list:
+        """Every registered month ('October_2026', ...)."""
+        with self._lock:
+            rows = self._conn.execute('SELECT month FROM months ORDER BY month').fetchall()
+        return [row[0] for row in rows]
+
+    def source_paths(self, month_year: str = None):
+        """Files whose stat() changes on every commit (WAL mode appends to the -wal file)."""
+        return [self.db_path + '-wal', self.db_path]
+
+    # ------------------------------------------------------------------ writes
+    def append(self, record: dict, month_year: str) -> None:
+        self.append_many([record], month_year)
+
+    def append_many(self, records: Iterable[dict], month_year: str, source: str = 'app') -> int:
+        """Insert several records in one transaction; returns the number written."""
+        rows = [self._to_row(record, month_year) for record in records]
+        with self._lock, self._conn:
+            self._register_month(month_year, source)
+            if rows:
+                self._conn.executemany(
+                    'INSERT INTO attendance (employee_id, name, date, month, entry_time, status) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+        return len(rows)
+
+    def delete_date(self, date_str: str, month_year: str, emp_id=None) -> int:
+        """
+        Hide every record for one date (or one employee-day) behind a tombstone.
+        Records written afterwards are not affected, so a concurrent mark survives.
+        Returns the number of records hidden.
+        """
+        iso_date = to_iso_date(date_str)
+        where, params = self._tombstone_scope(iso_date, month_year, emp_id)
+        with self._lock, self._conn:
+            count = self._conn.execute(f'SELECT COUNT(*) FROM live_attendance WHERE {where}', params).fetchone()[0]
+            if not count:
+                return 0
+            max_row_id = self._conn.execute('SELECT MAX(id) FROM attendance').fetchone()[0]
+            self._conn.execute(
+                'INSERT INTO tombstones (month, date, employee_id, max_row_id, created_at) VALUES (?, ?, ?, ?, ?)',
+                (month_year, iso_date, None if emp_id is None else str(emp_id), max_row_id,
+                 datetime.now().isoformat(timespec='seconds'))
+            )
+        return count
+
+    def tombstones(self, month_year: Optional[str] = None) -> List[dict]:
+        """Deletes that can still be undone (not compacted yet), newest first."""
+        where, params = 'undone_at IS NULL AND compacted_at IS NULL', ()
+        if month_year is not None:
+            where, params = where + ' AND month = ?', (month_year,)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT id, month, date, employee_id, created_at FROM tombstones WHERE {where} ORDER BY id DESC',
+                params
+            ).fetchall()
+        return [{'id': tid, 'month': month, 'date': from_iso_date(iso_date), 'employee_id': emp_id,
+                 'created_at': created_at} for tid, month, iso_date, emp_id, created_at in rows]
+
+    def undo_delete(self, tombstone_id) -> int:
+        """Revoke a tombstone that was not compacted yet; returns the number of records restored."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT month, date FROM tombstones WHERE id = ? AND undone_at IS NULL AND compacted_at IS NULL',
+                (tombstone_id,)
+            ).fetchone()
+            if row is None:
+                return 0
+            month_year, iso_date = row
+            where, params = self._tombstone_scope(iso_date, month_year)
+            before = self._conn.execute(f'SELECT COUNT(*) FROM live_attendance WHERE {where}', params).fetchone()[0]
+            self._conn.execute('UPDATE tombstones SET undone_at = ? WHERE id = ?',
+                               (datetime.now().isoformat(timespec='seconds'), tombstone_id))
+            after = self._conn.execute(f'SELECT COUNT(*) FROM live_attendance WHERE {where}', params).fetchone()[0]
+        return after - before
+
+    def undo_conflicts(self, tombstone_id) -> List[str]:
+        """
+        Employee IDs that undo_delete() would give a second record for the day:
+        rows it would restore for an employee who was marked again since.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT month, date, employee_id, max_row_id FROM tombstones '
+                'WHERE id = ? AND undone_at IS NULL AND compacted_at IS NULL',
+                (tombstone_id,)
+            ).fetchone()
+            if row is None:
+                return []
+            month_year, iso_date, emp_id, max_row_id = row
+            where, params = self._tombstone_scope(iso_date, month_year, emp_id)
+            rows = self._conn.execute(
+                f'SELECT DISTINCT employee_id FROM attendance AS a WHERE {where} AND id <= ? '
+                # hidden by no other tombstone, so the undo would restore it
+                'AND NOT EXISTS (SELECT 1 FROM tombstones AS t WHERE t.id != ? AND t.date = a.date '
+                '  AND t.month = a.month AND a.id <= t.max_row_id AND t.undone_at IS NULL '
+                '  AND t.compacted_at IS NULL AND (t.employee_id IS NULL OR t.employee_id = a.employee_id)) '
+                'AND EXISTS (SELECT 1 FROM live_attendance AS l WHERE l.date = a.date AND l.month = a.month '
+                '  AND l.employee_id = a.employee_id) '
+                'ORDER BY employee_id',
+                params + (max_row_id, tombstone_id)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def compact(self, min_age: float = 0.0) -> int:
+        """
+        Physically drop the rows hidden by tombstones at least `min_age` seconds
+        old (those can no longer be undone). Returns the number of rows removed.
+        """
+        cutoff = (datetime.now() - timedelta(seconds=min_age)).isoformat(timespec='seconds')
+        removed = 0
+        with self._lock, self._conn:
+            due = self._conn.execute(
+                'SELECT id, month, date, employee_id, max_row_id FROM tombstones '
+                'WHERE undone_at IS NULL AND compacted_at IS NULL AND created_at <= ?',
+                (cutoff,)
+            ).fetchall()
+            for tombstone_id, month_year, iso_date, emp_id, max_row_id in due:
+                where, params = self._tombstone_scope(iso_date, month_year, emp_id)
+                removed += self._conn.execute(
+                    f'DELETE FROM attendance WHERE {where} AND id <= ?', params + (max_row_id,)
+                ).rowcount
+                self._conn.execute('UPDATE tombstones SET compacted_at = ? WHERE id = ?',
+                                   (datetime.now().isoformat(timespec='seconds'), tombstone_id))
+        return removed
+
+    def flush(self) -> None:
+        with self._lock:
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------- reads
+    def has_entry(self, emp_id, date_str: str, month_year: Optional[str] = None) -> bool:
+        """Indexed check whether an employee already has a record for the given date."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM live_attendance WHERE date = ? AND employee_id = ? LIMIT 1',
+                (to_iso_date(date_str), str(emp_id))
+            ).fetchone()
+        return row is not None
+
+    def load(self, month_year: str) -> pd.DataFrame:
+        """All records of a month in insertion order, with the raw workbook columns."""
+        return self._select('WHERE month = ?', (month_year,))
+
+    def query(self, start=None, end=None, emp_id=None, status=None) -> pd.DataFrame:
+        """
+        Records in an inclusive date range, optionally filtered by employee and status.
+
+        Args:
+            start, end: 'dd/mm/YYYY' strings or date objects; either may be omitted
+            emp_id: restrict to one Employee ID
+            status: restrict to one Status value (e.g. 'Late')
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('date >= ?')
+            params.append(to_iso_date(start))
+        if end is not None:
+            clauses.append('date <= ?')
+            params.append(to_iso_date(end))
+        if emp_id is not None:
+            clauses.append('employee_id = ?')
+            params.append(str(emp_id))
+        if status is not None:
+            clauses.append('status = ?')
+            params.append(status)
+        where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+        return self._select(where, tuple(params))
+
+    def day_summary(self, date_str: str) -> Dict[str, int]:
+        """Status counts for one date: {'Present': n, 'Late': n, ..., 'Total': n}."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT status, COUNT(*) FROM live_attendance WHERE date = ? GROUP BY status',
+                (to_iso_date(date_str),)
+            ).fetchall()
+        summary = {status: 0 for status in STATUSES}
+        for status, count in rows:
+            summary[status] = summary.get(status, 0) + count
+        summary['Total'] = sum(count for _, count in rows)
+        return summary
+
+    # ---------------------------------------------------------- excel bridging
+    def import_excel(self, raw_file: str, month_year: str) -> int:
+        """Import an Attendance_Raw workbook for a month that has no data yet."""
+        with self._lock:
+            if self.has_segment(month_year) or not os.path.exists(raw_file):
+                return 0
+            df = read_cached(raw_file, pd.read_excel, key='raw').reindex(columns=RAW_COLUMNS)
+            return self.append_many(df.to_dict('records'), month_year, source=raw_file)
+
+    def export_excel(self, month_year: str, raw_file: str) -> str:
+        """Materialize the month's raw Excel workbook from the database."""
+        df = self.load(month_year)
+        atomic_write(raw_file, lambda path: df.to_excel(path, index=False), generations=WORKBOOK_GENERATIONS)
+        return raw_file
+
+    # ----------------------------------------------------------------- helpers
+    def _register_month(self, month_year: str, source: str) -> None:
+        self._conn.execute(
+            'INSERT OR IGNORE INTO months (month, source, created_at) VALUES (?, ?, ?)',
+            (month_year, source, datetime.now().isoformat(timespec='seconds'))
+        )
+
+    def _to_row(self, record: dict, month_year: str) -> tuple:
+        def clean(value):
+            if value is None or (not isinstance(value, str) and pd.isna(value)):
+                return None
+            return str(value)
+
+        return (
+            clean(record.get('Employee ID')),
+            clean(record.get('Name')),
+            to_iso_date(record.get('Date')),
+            month_year,
+            serialize_entry_time(record.get('Entry_Time')),
+            clean(record.get('Status')),
+        )
+
+    @staticmethod
+    def _tombstone_scope(iso_date: str, month_year: str, emp_id=None) -> tuple:
+        where, params = 'date = ? AND month = ?', (iso_date, month_year)
+        if emp_id is not None:
+            where, params = where + ' AND employee_id = ?', params + (str(emp_id),)
+        return where, params
+
+    def _select(self, where: str, params: tuple) -> pd.DataFrame:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT employee_id, name, date, entry_time, status FROM live_attendance '
+                f'{where} ORDER BY id',
+                params
+            ).fetchall()
+        if not rows:
+            return pd.DataFrame(columns=RAW_COLUMNS)
+        df = pd.DataFrame(rows, columns=RAW_COLUMNS)
+        df['Date'] = df['Date'].map(from_iso_date)
+        df['Entry_Time'] = df['Entry_Time'].map(parse_entry_time)
+        return df
+
+
+def import_raw_workbooks(store, excel_dir: str) -> Dict[str, int]:
+    """
+    One-shot importer for existing excels/Attendance_Raw_<Month>_<Year>.xlsx files.
+    Months already present in the store are skipped.
+
+    Returns:
+        {month_year: rows_imported} for every workbook found
+    """
+    imported = {}
+    for raw_file in sorted(glob.glob(os.path.join(excel_dir, 'Attendance_Raw_*.xlsx'))):
+        match = re.match(r'Attendance_Raw_(.+)\.xlsx$', os.path.basename(raw_file))
+        if not match:
+            continue
+        month_year = match.group(1)
+        imported[month_year] = store.import_excel(raw_file, month_year)
+    return imported
+
+
+# Example usage:
+# python -m modules.attendance_store excels excels/attendance.db
+if __name__ == "__main__":
+    excel_dir = sys.argv[1] if len(sys.argv) > 1 else 'excels'
+    db_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(excel_dir, 'attendance.db')
+    store = SQLiteAttendanceStore(db_path)
+    for month_year, count in import_raw_workbooks(store, excel_dir).items():
+        print(f"✅ {month_year}: imported {count} row(s)")
+    store.close()
@@ -0,0 +1,215 @@
+import csv
+import io
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from modules.atomic_files import atomic_write
+from modules.attendance_store import to_iso_date
+from modules.frame_cache import file_signature
+
+STORE_SOURCE = 'store'
+
+
+class CheckinIndex:
+    """
+    Persistent "who has already checked in on date D" index.
+
+    Each retained day maps Employee ID -> bitmask of the sources that saw a
+    check-in (the attendance store, the face-recognition attendance_log.csv, ...),
+    so duplicate checks are a dict lookup and clearing one source's entries for
+    a day leaves the other sources intact. The write path updates the index
+    directly; external CSV sources are tailed from the last byte offset, so a
+    sync only parses rows appended since the previous one. The index is
+    snapshotted to JSON (throttled to `save_interval`) so a restart does not
+    rescan unchanged sources.
+    """
+
+    def __init__(self, index_path: str, retain_days: int = 7, save_interval: float = 5.0):
+        self.index_path = index_path
+        self.retain_days = retain_days
+        self.save_interval = save_interval
+
+        self._lock = threading.RLock()
+        self._days: Dict[str, Dict[str, int]] = {}
+        self._sources: Dict[str, dict] = {}
+        self._save_timer = None
+        self.load()
+
+    # ------------------------------------------------------------------ lookups
+    def contains(self, emp_id, date_value) -> bool:
+        """O(1): whether any source recorded a check-in for the employee on the date."""
+        with self._lock:
+            day = self._days.get(to_iso_date(date_value))
+            return bool(day and day.get(str(emp_id)))
+
+    def checked_in(self, date_value) -> set:
+        """Employee IDs checked in on the date, from any source."""
+        with self._lock:
+            day = self._days.get(to_iso_date(date_value), {})
+            return {emp_id for emp_id, mask in day.items() if mask}
+
+    # ------------------------------------------------------------------- writes
+    def add(self, emp_id, date_value, source: str = STORE_SOURCE) -> None:
+        self.add_many([(emp_id, date_value)], source)
+
+    def add_many(self, pairs: Iterable[Tuple], source: str = STORE_SOURCE) -> None:
+        with self._lock:
+            bit = self._bit(source)
+            cutoff = self._cutoff()
+            for emp_id, date_value in pairs:
+                day_key = to_iso_date(date_value)
+                if emp_id is None or day_key is None or day_key < cutoff:
+                    continue
+                day = self._days.setdefault(day_key, {})
+                day[str(emp_id)] = day.get(str(emp_id), 0) | bit
+            self._schedule_save_locked()
+
+    def remove_date(self, date_value, source: str = STORE_SOURCE) -> None:
+        """Forget one source's check-ins for a date (e.g. after Clear Entries)."""
+        with self._lock:
+            day = self._days.get(to_iso_date(date_value))
+            if day:
+                bit = self._bit(source)
+                for emp_id in list(day):
+                    day[emp_id] &= ~bit
+                    if not day[emp_id]:
+                        del day[emp_id]
+            self._schedule_save_locked()
+
+    def rebuild_source(self, source: str, pairs: Iterable[Tuple], signature=None) -> None:
+        """Replace everything a source contributed with `pairs` in a single pass."""
+        with self._lock:
+            bit = self._bit(source)
+            for day in self._days.values():
+                for emp_id in list(day):
+                    day[emp_id] &= ~bit
+                    if not day[emp_id]:
+                        del day[emp_id]
+            self.add_many(pairs, source)
+            self._sources[source]['signature'] = signature
+
+    # ------------------------------------------------------------------ sources
+    def sync_store(self, store, month_year: Optional[str] = None) -> bool:
+        """
+        Rebuild the store's entries in one indexed range scan, unless the store
+        files are unchanged since the snapshot was taken. Returns True if rescanned.
+        """
+        signature = list(file_signature(store.source_paths(month_year)))
+        with self._lock:
+            state = self._sources.get(STORE_SOURCE)
+            if state and state.get('signature') == _as_json(signature):
+                return False
+        start = datetime.strptime(self._cutoff(), '%Y-%m-%d')
+        df = store.query(start=start)
+        self.rebuild_source(STORE_SOURCE, zip(df['Employee ID'], df['Date']), _as_json(signature))
+        return True
+
+    def mark_store_synced(self, store, month_year: Optional[str] = None) -> None:
+        """Record the store signature after the write path already applied its changes."""
+        with self._lock:
+            self._bit(STORE_SOURCE)
+            signature = list(file_signature(store.source_paths(month_year)))
+            self._sources[STORE_SOURCE]['signature'] = _as_json(signature)
+
+    def sync_csv(self, csv_path: str) -> int:
+        """
+        Pick up rows appended to an attendance CSV since the last sync.
+        The file is re-read from the start only if it was truncated or replaced.
+        Returns the number of rows parsed.
+        """
+        source = f'csv:{os.path.abspath(csv_path)}'
+        try:
+            st = os.stat(csv_path)
+        except FileNotFoundError:
+            return 0
+
+        with self._lock:
+            self._bit(source)
+            state = self._sources[source]
+            offset = state.get('offset', 0)
+            if st.st_size == offset and state.get('mtime_ns') == st.st_mtime_ns:
+                return 0
+            if st.st_size < offset or st.st_ino != state.get('inode', st.st_ino):
+                self.rebuild_source(source, [])
+                offset = 0
+                state.pop('header', None)
+
+            with open(csv_path, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read(st.st_size - offset)
+            # Only consume complete lines; a half-written row is picked up next time
+            end = chunk.rfind(b'\n') + 1
+            text = chunk[:end].decode('utf-8', errors='replace')
+
+            rows = list(csv.reader(io.StringIO(text)))
+            if 'header' not in state and rows:
+                state['header'] = rows.pop(0)
+            header = state.get('header', [])
+            pairs = []
+            if 'Date' in header and 'Employee ID' in header:
+                date_idx, emp_idx = header.index('Date'), header.index('Employee ID')
+                width = max(date_idx, emp_idx)
+                pairs = [(row[emp_idx], row[date_idx]) for row in rows if len(row) > width]
+            self.add_many(pairs, source)
+
+            state.update(offset=offset + end, mtime_ns=st.st_mtime_ns, inode=st.st_ino)
+            return len(rows)
+
+    # -------------------------------------------------------------- persistence
+    def load(self) -> bool:
+        if not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return False
+        with self._lock:
+            cutoff = self._cutoff()
+            self._sources = snapshot.get('sources', {})
+            self._days = {day: dict(ids) for day, ids in snapshot.get('days', {}).items()
+                          if day >= cutoff}
+        return True
+
+    def save(self) -> None:
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            cutoff = self._cutoff()
+            self._days = {day: ids for day, ids in self._days.items() if day >= cutoff}
+            snapshot = {'sources': self._sources, 'days': self._days}
+
+            def write(path):
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f)
+            atomic_write(self.index_path, write)
+
+    # ----------------------------------------------------------------- helpers
+    def _bit(self, source: str) -> int:
+        state = self._sources.get(source)
+        if state is None:
+            used = {s['bit'] for s in self._sources.values()}
+            bit = 1
+            while bit in used:
+                bit <<= 1
+            state = self._sources[source] = {'bit': bit}
+        return state['bit']
+
+    def _cutoff(self) -> str:
+        return (datetime.now() - timedelta(days=self.retain_days)).date().isoformat()
+
+    def _schedule_save_locked(self) -> None:
+        if self._save_timer is not None:
+            return
+        self._save_timer = threading.Timer(self.save_interval, self.save)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+
+def _as_json(value):
+    """Round-trip through JSON so signatures compare equal after a reload."""
+    return json.loads(json.dumps(value))
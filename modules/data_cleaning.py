@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime, time
 import os
 import sys
@@ -59,6 +60,167 @@ def get_late_minutes(entry_time, cutoff=cutoff_time):
     delta = (entry_dt - cutoff_dt).total_seconds() / 60
     return max(0, int(delta))
 
+
+# ✅ Columnar path: whole Entry_Time columns at once
+# Entry times are held as int64 microseconds since midnight, -1 meaning "no time"
+NO_TIME = -1
+_MICROS_PER_SECOND = 1_000_000
+_MICROS_PER_MINUTE = 60 * _MICROS_PER_SECOND
+
+# Canonical layouts of the formats convert_to_time tries with strptime
+# (H = hour digit, M/S = minute/second digit, P = AM/PM letter). A 1-digit hour
+# is accepted by left-padding with '0'. Every string that fits a layout is one
+# strptime accepts for that format, with the same value; anything else is left
+# to convert_to_time.
+_TIME_LAYOUTS = {
+    '%H:%M:%S': 'HH:MM:SS',
+    '%H:%M': 'HH:MM',
+    '%I:%M %p': 'HH:MM PP',
+    '%I:%M:%S %p': 'HH:MM:SS PP',
+}
+
+
+def time_to_micros(value):
+    """Microseconds since midnight for a datetime.time, NO_TIME for None"""
+    if value is None:
+        return NO_TIME
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * _MICROS_PER_SECOND + value.microsecond
+
+
+def _parse_fixed_layout(strings, fmt):
+    """Vectorized parse of a string array in one layout -> (micros, matched mask)"""
+    layout = _TIME_LAYOUTS[fmt]
+    width = len(layout)
+    # One spare character so longer strings keep a length that cannot match
+    text = np.asarray(strings, dtype=f'U{width + 1}')
+    lengths = np.char.str_len(text)
+    short = lengths == width - 1
+    if short.any():
+        text[short] = np.char.add('0', text[short])
+    codes = text.view(np.uint32).reshape(len(text), width + 1)[:, :width].astype(np.int64)
+
+    matched = (lengths == width) | short
+    for position, kind in enumerate(layout):
+        code = codes[:, position]
+        if kind in 'HMS':
+            matched &= (code >= ord('0')) & (code <= ord('9'))
+        elif kind == 'P':
+            letters = 'AaPp' if layout[position - 1] != 'P' else 'Mm'
+            matched &= np.isin(code, [ord(c) for c in letters])
+        else:
+            matched &= code == ord(kind)
+
+    digits = codes - ord('0')
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 3] * 10 + digits[:, 4]
+    seconds = digits[:, 6] * 10 + digits[:, 7] if layout.startswith('HH:MM:SS') else 0
+    matched &= (minutes <= 59) & (np.asarray(seconds) <= 59)
+    if fmt.endswith('%p'):
+        matched &= (hours >= 1) & (hours <= 12)
+        is_pm = np.isin(codes[:, width - 2], [ord('P'), ord('p')])
+        hours = hours % 12 + np.where(is_pm, 12, 0)
+    else:
+        matched &= hours <= 23
+
+    micros = np.where(matched, ((hours * 60 + minutes) * 60 + seconds) * _MICROS_PER_SECOND, NO_TIME)
+    return micros.astype(np.int64), matched
+
+
+def detect_time_format(strings, sample_size=1000):
+    """Pick the strptime format whose layout fits most of a sample of the strings"""
+    sample = np.asarray(strings[:sample_size], dtype=object)
+    counts = {fmt: int(_parse_fixed_layout(sample, fmt)[1].sum()) for fmt in _TIME_LAYOUTS}
+    best = max(counts, key=counts.get)
+    return best if counts[best] > 0 else None
+
+
+def entry_time_micros(values):
+    """
+    Columnar convert_to_time: an Entry_Time column -> int64 microseconds since midnight
+    (NO_TIME where convert_to_time would return None).
+
+    Datetime and numeric columns are converted with array arithmetic. For string/object
+    columns the dominant time format is detected once and parsed vectorized; only values
+    that do not match it (other formats, time objects, junk) go through convert_to_time.
+    """
+    s = pd.Series(values).reset_index(drop=True)
+    out = np.full(len(s), NO_TIME, dtype=np.int64)
+    if s.empty:
+        return out
+
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        valid = s.notna().to_numpy()
+        dt = s[valid].dt
+        out[valid] = (((dt.hour.to_numpy(np.int64) * 60 + dt.minute.to_numpy(np.int64)) * 60
+                       + dt.second.to_numpy(np.int64)) * _MICROS_PER_SECOND
+                      + dt.microsecond.to_numpy(np.int64))
+        return out
+
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        # Seconds since midnight, truncated to whole minutes like convert_to_time
+        numbers = s.to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            seconds = np.trunc(numbers)
+            valid = np.isfinite(seconds) & (seconds >= 0) & (seconds < 24 * 3600)
+        out[valid] = (seconds[valid].astype(np.int64) // 60) * _MICROS_PER_MINUTE
+        return out
+
+    objects = s.astype(object).to_numpy()
+    is_str = np.fromiter((type(v) is str for v in objects), dtype=bool, count=len(objects))
+    pending = ~is_str
+
+    if is_str.any():
+        str_positions = np.flatnonzero(is_str)
+        strings = objects[is_str]
+        fmt = detect_time_format(strings)
+        if fmt is None:
+            pending[str_positions] = True
+        else:
+            micros, matched = _parse_fixed_layout(strings, fmt)
+            out[str_positions[matched]] = micros[matched]
+            pending[str_positions[~matched]] = True
+
+    # Per-element fallback for the stragglers only
+    for position in np.flatnonzero(pending):
+        out[position] = time_to_micros(convert_to_time(objects[position]))
+    return out
+
+
+def minutes_of_day(micros):
+    """int16 minutes since midnight (-1 for no time)"""
+    micros = np.asarray(micros)
+    return np.where(micros < 0, -1, micros // _MICROS_PER_MINUTE).astype(np.int16)
+
+
+def late_minutes_from_micros(micros, cutoff=cutoff_time):
+    """Columnar get_late_minutes: whole minutes after cutoff, 0 for early or missing times"""
+    micros = np.asarray(micros, dtype=np.int64)
+    delta = micros - time_to_micros(cutoff)
+    late = np.where(delta > 0, delta // _MICROS_PER_MINUTE, 0)
+    return np.where(micros < 0, 0, late).astype(np.int64)
+
+
+def micros_to_time(micros):
+    """Object array of datetime.time (None for no time), as convert_to_time returns"""
+    micros = np.asarray(micros, dtype=np.int64)
+    out = np.full(len(micros), None, dtype=object)
+    for position in np.flatnonzero(micros >= 0):
+        seconds, microsecond = divmod(int(micros[position]), _MICROS_PER_SECOND)
+        minutes, second = divmod(seconds, 60)
+        out[position] = time(minutes // 60, minutes % 60, second, microsecond)
+    return out
+
+
+def format_hhmm(micros):
+    """Object array of 'HH:MM' strings (None for no time)"""
+    minutes = minutes_of_day(micros).astype(np.int64)
+    valid = minutes >= 0
+    text = (pd.Series(minutes // 60).astype(str).str.zfill(2) + ':'
+            + pd.Series(minutes % 60).astype(str).str.zfill(2)).to_numpy(dtype=object)
+    text[~valid] = None
+    return text
+
+
 def clean_realtime_attendance(df_input, employee_df):
     df = df_input.copy()
 
@@ -68,23 +230,19 @@ def clean_realtime_attendance(df_input, employee_df):
     # Drop if no match
     df = df.dropna(subset=['Employee ID', 'Name'])
 
-    # Convert time
-    df['Entry_Time'] = df['Entry_Time'].apply(convert_to_time)
-    df['Late_Min'] = df['Entry_Time'].apply(get_late_minutes)
+    # Convert time (whole column at once)
+    micros = entry_time_micros(df['Entry_Time'])
+    df['Late_Min'] = late_minutes_from_micros(micros)
 
     # Format time
-    df['Entry_Time'] = df['Entry_Time'].apply(lambda t: t.strftime('%H:%M') if pd.notna(t) and t else None)
-
-    # Predict status
-    def predict_status(row):
-        if not row['Entry_Time']:
-            return 'Absent'
-        elif row['Late_Min'] > 0:
-            return 'Late'
-        else:
-            return 'Present'
+    df['Entry_Time'] = format_hhmm(micros)
 
-    df['Status'] = df.apply(predict_status, axis=1)
+    # Predict status: no entry time -> Absent, after cutoff -> Late, else Present
+    df['Status'] = np.select(
+        [micros < 0, df['Late_Min'].to_numpy() > 0],
+        ['Absent', 'Late'],
+        default='Present'
+    )
 
     return df[['Employee ID', 'Name', 'Entry_Time', 'Status']]
 
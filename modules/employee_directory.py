@@ -0,0 +1,159 @@
+import os
+import threading
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.atomic_files import atomic_write
+from modules.frame_cache import file_signature
+from modules.parse_cache import read_cached
+
+ROSTER_COLUMNS = ['Employee ID', 'Name']
+
+
+def employee_key(emp_id) -> str:
+    """Directory key for an Employee ID: IDs are compared as stripped strings."""
+    return str(emp_id).strip()
+
+
+class PrefixIndex:
+    """
+    Search-as-you-type index over a roster: sorted term arrays for Employee ID,
+    full name and each later word of the name. A query is two binary searches
+    per tier, so the cost depends on `limit`, not on the roster size. Matches
+    are ranked ID prefix first, then name prefix, then word prefix.
+    """
+
+    def __init__(self, ids: Iterable[str], names: Iterable[str]):
+        ids = [str(emp_id).strip().lower() for emp_id in ids]
+        names = [str(name).strip().lower() for name in names]
+        words = [(word, row) for row, name in enumerate(names) for word in name.split()[1:]]
+        self._tiers = [
+            self._tier(ids, range(len(ids))),
+            self._tier(names, range(len(names))),
+            self._tier([word for word, _ in words], [row for _, row in words]),
+        ]
+
+    @staticmethod
+    def _tier(terms, rows):
+        terms = np.array(list(terms), dtype=str)
+        rows = np.array(list(rows), dtype=np.int64)
+        order = np.argsort(terms, kind='stable')
+        return terms[order], rows[order]
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """Row positions of the best `limit` matches for a prefix of an ID, name or name word."""
+        query = str(query).strip().lower()
+        if not query:
+            return list(range(min(limit, len(self._tiers[0][1]))))
+        found = {}
+        for terms, rows in self._tiers:
+            # A query longer than every term cannot match; searching with a wider string
+            # than the array holds would also make numpy cast the whole array
+            width = terms.dtype.itemsize // 4
+            if not len(terms) or len(query) > width:
+                continue
+            lo = np.searchsorted(terms, query, 'left')
+            hi = (np.searchsorted(terms, query, 'right') if len(query) == width
+                  else np.searchsorted(terms, query + '\U0010ffff', 'left'))
+            for row in rows[lo:min(hi, lo + limit)].tolist():
+                found.setdefault(row, None)
+                if len(found) == limit:
+                    return list(found)
+        return list(found)
+
+
+class EmployeeDirectory:
+    """
+    Process-wide employee master, indexed by Employee ID.
+
+    The roster CSV is parsed once and kept as an immutable snapshot (frame,
+    id -> record dict, id -> name Series, prefix search index). Every read
+    costs one stat() of the CSV; the file is only re-read when its mtime/size
+    change, or when `replace` installs an uploaded roster. Readers never take
+    a lock - a reload builds a new snapshot and swaps it in - so the frame and
+    records handed out are shared and must be treated as read-only.
+    """
+
+    def __init__(self, csv_path: str, default_roster: Optional[pd.DataFrame] = None):
+        self.csv_path = csv_path
+        self.default_roster = default_roster
+        self.version = 0
+        self._lock = threading.Lock()
+        self._signature = None
+        self._snapshot = None
+        self._refresh()
+
+    # ----------------------------------------------------------------- lookups
+    def frame(self) -> pd.DataFrame:
+        """The whole roster (shared, read-only)."""
+        return self._current()[0]
+
+    def get(self, emp_id) -> Optional[dict]:
+        """O(1): the roster row for an Employee ID, or None if unknown."""
+        return self._current()[1].get(employee_key(emp_id))
+
+    def name(self, emp_id, default: str = '') -> str:
+        record = self.get(emp_id)
+        return record['Name'] if record else default
+
+    def names(self, emp_ids: Iterable, default: str = '') -> pd.Series:
+        """Vectorized: names for a column of Employee IDs in one hash join (`default` if unknown)."""
+        emp_ids = emp_ids if isinstance(emp_ids, pd.Series) else pd.Series(list(emp_ids), dtype=object)
+        names = emp_ids.astype(str).str.strip().map(self._current()[2])
+        return names.where(names.notna(), default).astype(object)
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """Top `limit` roster records whose ID, name or a name word starts with `query`."""
+        _, _, _, rows, index = self._current()
+        return [rows[row] for row in index.search(query, limit)]
+
+    def __contains__(self, emp_id) -> bool:
+        return employee_key(emp_id) in self._current()[1]
+
+    def __len__(self) -> int:
+        return len(self._current()[1])
+
+    # ------------------------------------------------------------------ writes
+    def replace(self, roster: pd.DataFrame) -> None:
+        """Install an uploaded roster: written to the CSV (temp file + rename) and indexed at once."""
+        missing = set(ROSTER_COLUMNS) - set(roster.columns)
+        if missing:
+            raise ValueError(f"Roster is missing column(s): {', '.join(sorted(missing))}")
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.csv_path)), exist_ok=True)
+            atomic_write(self.csv_path, lambda path: roster.to_csv(path, index=False))
+            self._install_locked(roster.reset_index(drop=True), file_signature([self.csv_path]))
+
+    # ---------------------------------------------------------------- helpers
+    def _current(self) -> tuple:
+        if file_signature([self.csv_path]) != self._signature:
+            self._refresh()
+        return self._snapshot
+
+    def _refresh(self) -> None:
+        with self._lock:
+            signature = file_signature([self.csv_path])
+            if signature == self._signature and self._snapshot is not None:
+                return  # another thread reloaded while we waited
+            roster = None
+            if signature[0][1] is not None:
+                try:
+                    roster = read_cached(self.csv_path, pd.read_csv, key='roster')
+                except Exception as e:
+                    print(f"⚠️ Could not read employee data {self.csv_path}: {e}")
+            if roster is None or not set(ROSTER_COLUMNS) <= set(roster.columns):
+                roster = self.default_roster if self.default_roster is not None else pd.DataFrame(columns=ROSTER_COLUMNS)
+            self._install_locked(roster, signature)
+
+    def _install_locked(self, roster: pd.DataFrame, signature) -> None:
+        keys = roster['Employee ID'].map(employee_key)
+        first = ~keys.duplicated()
+        rows = roster.to_dict('records')
+        by_id = {key: rows[position] for position, key in zip(np.flatnonzero(first.to_numpy()), keys[first])}
+        names = pd.Series(roster['Name'][first].to_numpy(), index=keys[first].to_numpy(), dtype=object)
+        index = PrefixIndex(roster['Employee ID'], roster['Name'])
+        self._snapshot = (roster, by_id, names, rows, index)
+        self._signature = signature
+        self.version += 1
@@ -0,0 +1,123 @@
+from typing import Iterable, List
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from modules.atomic_files import WORKBOOK_GENERATIONS, atomic_write
+from modules.status_summary import status_totals
+
+# Black, red, white report theme
+_THIN = Side(style='thin', color='000000')
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_CENTER = Alignment(horizontal="center", vertical="center")
+
+TITLE_STYLE = 'report_title'
+STAT_STYLE = 'report_stat'
+HEADER_STYLE = 'report_header'
+DARK_ROW_STYLE = 'report_row_dark'
+LIGHT_ROW_STYLE = 'report_row_light'
+
+
+def _theme_styles() -> List[NamedStyle]:
+    return [
+        NamedStyle(name=TITLE_STYLE,
+                   font=Font(size=16, bold=True, color="FF0000", name="Calibri"),
+                   fill=PatternFill("solid", fgColor="000000"),
+                   alignment=_CENTER),
+        NamedStyle(name=STAT_STYLE,
+                   font=Font(size=12, bold=True, color="FFFFFF", name="Calibri"),
+                   fill=PatternFill("solid", fgColor="1C1C1C"),
+                   alignment=Alignment(horizontal="left", vertical="center")),
+        NamedStyle(name=HEADER_STYLE,
+                   font=Font(bold=True, color="FFFFFF", name="Calibri"),
+                   fill=PatternFill("solid", fgColor="C80000"),
+                   alignment=_CENTER, border=_BORDER),
+        NamedStyle(name=DARK_ROW_STYLE,
+                   font=Font(name="Calibri", color="FFFFFF"),
+                   fill=PatternFill("solid", fgColor="1C1C1C"),
+                   alignment=_CENTER, border=_BORDER),
+        NamedStyle(name=LIGHT_ROW_STYLE,
+                   font=Font(name="Calibri", color="000000"),
+                   fill=PatternFill("solid", fgColor="EDEDED"),
+                   alignment=_CENTER, border=_BORDER),
+    ]
+
+
+def status_stats_lines(df: pd.DataFrame) -> List[str]:
+    """The 'Total Entries/Present/Late/Absent/Leave' lines shown above the attendance sheet."""
+    totals = status_totals(df)
+    return [
+        f"Total Entries: {totals['Total']}",
+        f"Total Present: {totals['Present']}",
+        f"Total Late: {totals['Late']}",
+        f"Total Absent: {totals['Absent']}",
+        f"Total Leave: {totals['Leave']}",
+    ]
+
+
+def _display_lengths(values: pd.Series) -> int:
+    """Longest str(value or "") in a column, computed column-wise."""
+    if values.empty:
+        return 0
+    truthy = values.notna() & values.astype(bool)
+    if not truthy.any():
+        return 0
+    return int(values[truthy].astype(str).str.len().max())
+
+
+def column_widths(df: pd.DataFrame, first_column_texts: Iterable[str] = ()) -> List[float]:
+    """Auto-fit widths (longest text + 3) including the title/stat lines that live in column A."""
+    widths = []
+    for position, column in enumerate(df.columns):
+        longest = max(len(str(column)), _display_lengths(df[column]))
+        if position == 0:
+            longest = max([longest] + [len(text) for text in first_column_texts])
+        widths.append(longest + 3)
+    return widths
+
+
+def write_styled_report(df: pd.DataFrame, file_path: str, title: str,
+                        stats_lines: Iterable[str] = (), sheet_name: str = "Employee Report") -> str:
+    """
+    Write a fully styled report in one streaming pass (openpyxl write-only mode).
+
+    Layout: merged title row, one merged row per statistics line, the red header
+    row, then body rows alternating dark/light. Styles are registered once as
+    named styles and shared by every cell, and column widths are precomputed
+    from the frame, so memory stays flat and time grows linearly with rows.
+    """
+    stats_lines = list(stats_lines)
+    n_columns = max(len(df.columns), 1)
+
+    wb = Workbook(write_only=True)
+    for style in _theme_styles():
+        wb.add_named_style(style)
+    ws = wb.create_sheet(sheet_name)
+
+    for position, width in enumerate(column_widths(df, [title] + stats_lines), 1):
+        ws.column_dimensions[get_column_letter(position)].width = width
+
+    def styled(value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    last_column = get_column_letter(n_columns)
+    ws.append([styled(title, TITLE_STYLE)])
+    ws.merged_cells.add(f"A1:{last_column}1")
+    for row_number, line in enumerate(stats_lines, 2):
+        ws.append([styled(line, STAT_STYLE)])
+        ws.merged_cells.add(f"A{row_number}:{last_column}{row_number}")
+
+    ws.append([styled(str(column), HEADER_STYLE) for column in df.columns])
+
+    body = df.astype(object).where(df.notna(), None)
+    for i, values in enumerate(body.itertuples(index=False, name=None)):
+        style = DARK_ROW_STYLE if i % 2 == 0 else LIGHT_ROW_STYLE
+        ws.append([styled(value, style) for value in values])
+
+    atomic_write(file_path, wb.save, generations=WORKBOOK_GENERATIONS)
+    return file_path
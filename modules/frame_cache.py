@@ -0,0 +1,59 @@
+import os
+import threading
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+
+def file_signature(paths: Iterable[str]) -> Tuple:
+    """(path, mtime_ns, size) for every path; missing files contribute (path, None, None)."""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class FrameCache:
+    """
+    In-process cache of parsed attendance frames keyed by the stat() signature of
+    the files they were read from.
+
+    A lookup costs one stat() per backing file; the loader only runs when the
+    signature changed (another process wrote the file) or the entry was
+    invalidated explicitly by the write path. Cached frames are shared between
+    callers, so treat them as read-only and `.copy()` before mutating.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        # Data version: bumps whenever a cached value is rebuilt or dropped
+        self.version = 0
+
+    def get(self, key: Hashable, paths: Iterable[str], loader: Callable):
+        signature = file_signature(paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+
+        value = loader()
+        with self._lock:
+            self.misses += 1
+            self.version += 1
+            self._entries[key] = (signature, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when no key is given."""
+        with self._lock:
+            self.version += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
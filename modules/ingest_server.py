@@ -0,0 +1,229 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+import numpy as np
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class IngestServer:
+    """
+    Local HTTP endpoint for detection events from the face recognition app.
+
+        POST /events   one entry or a list of entries ({'employee_id', 'name', 'unique_id', 'timestamp'})
+                       -> 202 when queued, 503 + Retry-After when the queue is full
+        GET  /stats    queue depth, capacity, counters and commit latency
+        GET  /health   200 while the commit worker is alive
+        GET  /metrics  Prometheus text from `metrics_text`, when given
+
+    Events go onto a bounded in-memory queue; one worker thread takes whatever
+    is queued (waiting up to `linger` seconds for more, up to `max_batch`
+    entries) and hands it to `commit` as one batch, so a burst becomes a few
+    store transactions. A batch whose commit raises is retried with backoff
+    (`retry_delay` doubling up to `max_retry_delay` seconds), up to
+    `max_attempts` commits in all; meanwhile the queue fills up. A batch that
+    still fails is dead-lettered: handed to `dead_letter(entries)` if given
+    (e.g. written to the spool's failed/ directory), otherwise logged, and
+    counted in stats. A full queue rejects the whole request rather than
+    blocking the producer, which should retry after the advertised delay.
+    `observe(stage, seconds)`, if given, receives the request parse time
+    ('json_read').
+    """
+
+    def __init__(self, commit: Callable[[List[dict]], object], host: str = '127.0.0.1', port: int = 8765,
+                 max_queue: int = 10000, max_batch: int = 500, linger: float = 0.02,
+                 latency_window: int = 1000, observe: Optional[Callable[[str, float], None]] = None,
+                 metrics_text: Optional[Callable[[], str]] = None, retry_delay: float = 0.5,
+                 max_retry_delay: float = 10.0, max_attempts: int = 3,
+                 dead_letter: Optional[Callable[[List[dict]], object]] = None):
+        self.commit = commit
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+        self.dead_letter = dead_letter
+        self.observe = observe
+        self.metrics_text = metrics_text
+        self.max_batch = max_batch
+        self.linger = linger
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._accepted = 0
+        self._rejected = 0
+        self._commits = 0
+        self._committed_entries = 0
+        self._errors = 0
+        self._dead_lettered = 0
+        self._last_error = None
+        self._commit_latency = deque(maxlen=latency_window)  # seconds per commit call
+        self._queue_latency = deque(maxlen=latency_window)   # seconds from enqueue to commit
+
+        self._http = ThreadingHTTPServer((host, port), self._handler_class())
+        self._http.daemon_threads = True
+        self.address = self._http.server_address
+        self._worker = threading.Thread(target=self._commit_loop, name='ingest-commit', daemon=True)
+        self._server_thread = threading.Thread(target=self._http.serve_forever, name='ingest-http', daemon=True)
+        self._worker.start()
+        self._server_thread.start()
+        print(f"✅ Ingestion server listening on http://{self.address[0]}:{self.address[1]}")
+
+    # ------------------------------------------------------------------ queue
+    def offer(self, entries: List[dict]) -> bool:
+        """Queue a request's entries all-or-nothing; False means the queue is full."""
+        enqueued_at = time.monotonic()
+        with self._lock:
+            if self._queue.maxsize - self._queue.qsize() < len(entries):
+                self._rejected += len(entries)
+                return False
+            for entry in entries:
+                self._queue.put_nowait((enqueued_at, entry))
+            self._accepted += len(entries)
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            commit_ms = np.array(self._commit_latency) * 1000
+            queue_ms = np.array(self._queue_latency) * 1000
+            return {
+                'queue_depth': self._queue.qsize(),
+                'queue_capacity': self._queue.maxsize,
+                'accepted': self._accepted,
+                'rejected': self._rejected,
+                'commits': self._commits,
+                'committed_entries': self._committed_entries,
+                'errors': self._errors,
+                'dead_lettered': self._dead_lettered,
+                'last_error': self._last_error,
+                'commit_ms_mean': round(float(commit_ms.mean()), 2) if len(commit_ms) else None,
+                'commit_ms_p95': round(float(np.percentile(commit_ms, 95)), 2) if len(commit_ms) else None,
+                'end_to_end_ms_p95': round(float(np.percentile(queue_ms, 95)), 2) if len(queue_ms) else None,
+                'worker_alive': self._worker.is_alive(),
+            }
+
+    def close(self) -> None:
+        self._http.shutdown()
+        self._http.server_close()
+
+    def _commit_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=max(remaining, 0)) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # A failed batch is retried with backoff (the events were already acknowledged,
+            # meanwhile the queue fills up and producers get 503s), then dead-lettered
+            delay = self.retry_delay
+            attempt = 1
+            while not self._commit_batch(batch, attempt):
+                if attempt >= self.max_attempts:
+                    self._dead_letter([entry for _, entry in batch])
+                    break
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                attempt += 1
+
+    def _commit_batch(self, batch: list, attempt: int = 1) -> bool:
+        started = time.monotonic()
+        error = None
+        try:
+            self.commit([entry for _, entry in batch])
+        except Exception as e:
+            error = str(e)
+            print(f"❌ Ingestion commit failed for {len(batch)} event(s) "
+                  f"(attempt {attempt}/{self.max_attempts}): {e}")
+        finished = time.monotonic()
+
+        with self._lock:
+            self._commits += 1
+            self._commit_latency.append(finished - started)
+            if error is None:
+                self._committed_entries += len(batch)
+                self._queue_latency.extend(finished - enqueued_at for enqueued_at, _ in batch)
+            else:
+                self._errors += 1
+                self._last_error = error
+        return error is None
+
+    def _dead_letter(self, entries: List[dict]) -> None:
+        saved = None
+        if self.dead_letter is not None:
+            try:
+                saved = self.dead_letter(entries)
+            except Exception as e:
+                print(f"❌ Could not dead-letter {len(entries)} event(s): {e}")
+        if saved is not None:
+            print(f"❌ Gave up on {len(entries)} event(s) after {self.max_attempts} attempts, kept in {saved}")
+        else:
+            # Nowhere to keep them: the log is the only record left
+            print(f"❌ Gave up on {len(entries)} event(s) after {self.max_attempts} attempts: "
+                  f"{json.dumps(entries, default=str)}")
+        with self._lock:
+            self._dead_lettered += len(entries)
+
+    # ------------------------------------------------------------------- http
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path.rstrip('/') != '/events':
+                    return self._reply(404, {'error': 'not found'})
+                length = int(self.headers.get('Content-Length') or 0)
+                if length <= 0 or length > MAX_BODY_BYTES:
+                    return self._reply(413 if length > MAX_BODY_BYTES else 400, {'error': 'bad body size'})
+                started = time.perf_counter()
+                try:
+                    data = json.loads(self.rfile.read(length))
+                except ValueError:
+                    return self._reply(400, {'error': 'invalid JSON'})
+                if server.observe is not None:
+                    server.observe('json_read', time.perf_counter() - started)
+                entries = data if isinstance(data, list) else [data]
+                if not server.offer(entries):
+                    return self._reply(503, {'error': 'queue full', 'queue_depth': server._queue.qsize()},
+                                       {'Retry-After': '1'})
+                self._reply(202, {'queued': len(entries), 'queue_depth': server._queue.qsize()})
+
+            def do_GET(self):
+                path = self.path.rstrip('/')
+                if path == '/stats':
+                    return self._reply(200, server.stats())
+                if path == '/metrics' and server.metrics_text is not None:
+                    return self._reply_text(200, server.metrics_text())
+                if path == '/health':
+                    alive = server._worker.is_alive()
+                    return self._reply(200 if alive else 503, {'ok': alive})
+                self._reply(404, {'error': 'not found'})
+
+            def _reply(self, code, body, headers=None):
+                payload = json.dumps(body, default=str).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _reply_text(self, code, text):
+                payload = text.encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # one line per event would flood the console
+
+        return Handler
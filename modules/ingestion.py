@@ -0,0 +1,146 @@
+import threading
+from datetime import time
+from typing import Callable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.data_cleaning import entry_time_micros, minutes_of_day
+
+# Time-based rule used for live marks: on time (with grace) until 09:15, then Late
+GRACE_END = time(9, 15)
+
+ENTRY_FIELDS = ['employee_id', 'name', 'unique_id', 'timestamp']
+
+# Held by every ingestion path (spool, HTTP server, manual marks) from the duplicate
+# check until the commit, so two paths can never both add the same employee for a day.
+# Module-level so it is shared across Streamlit reruns and sessions.
+INGEST_LOCK = threading.RLock()
+
+
+def time_based_statuses(entry_times) -> np.ndarray:
+    """Vectorized time-based prediction: 'Present' up to GRACE_END, 'Late' after, 'Absent' without a time."""
+    minutes = minutes_of_day(entry_time_micros(entry_times)).astype(np.int64)
+    grace_minute = GRACE_END.hour * 60 + GRACE_END.minute
+    return np.where(minutes < 0, 'Absent', np.where(minutes <= grace_minute, 'Present', 'Late'))
+
+
+def new_processing_details(total_entries: int) -> dict:
+    return {
+        "total_entries": total_entries,
+        "processed_ids": set(),
+        "duplicate_entries": [],
+        "successful_entries": [],
+        "failed_entries": [],
+        "skipped_entries": []
+    }
+
+
+def entries_frame(entries: List[dict]) -> pd.DataFrame:
+    """One row per entry with ENTRY_FIELDS as object columns; missing/blank fields are ''."""
+    rows = [{field: entry.get(field) for field in ENTRY_FIELDS} if isinstance(entry, dict) else {}
+            for entry in entries]
+    frame = pd.DataFrame(rows, columns=ENTRY_FIELDS, dtype=object)
+    return frame.where(frame.notna(), '')
+
+
+def ingest_batch(
+    entries: List[dict],
+    date_str: str,
+    entry_time: time,
+    checked_in: Set[str],
+    commit: Callable[[List[dict]], None],
+    lookup_names: Optional[Callable[[pd.Series], pd.Series]] = None,
+    predict_statuses: Callable = time_based_statuses,
+) -> Tuple[dict, List[str]]:
+    """
+    Process a whole recognized-ID batch at once.
+
+    The batch is validated and deduplicated as a frame (missing IDs, repeated
+    unique_id, employees already checked in today or earlier in the batch),
+    missing names are resolved with one batch directory lookup, statuses are predicted in
+    one vectorized call, and all new rows are handed to `commit` together so
+    they land in a single write.
+
+    Args:
+        entries: recognized_id.json entries ({'employee_id', 'name', 'unique_id', 'timestamp'})
+        date_str: attendance date ('dd/mm/YYYY')
+        entry_time: entry time recorded for every new row
+        checked_in: Employee IDs (as str) already marked for `date_str`
+        commit: writes the new attendance records; its exception is re-raised
+            (nothing was saved, so the caller must keep the entries for a retry)
+        lookup_names: Employee IDs -> names ('' if unknown), only called if some entry has no name
+        predict_statuses: entry times -> statuses
+
+    Returns:
+        (processing_details, messages) - processing_details has the same shape the
+        per-entry loop produced; messages are the short per-entry notes.
+    """
+    details = new_processing_details(len(entries))
+    messages = []
+    if not entries:
+        return details, messages
+
+    frame = entries_frame(entries)
+    emp_ids = frame['employee_id']
+    valid = emp_ids.map(bool) & frame['unique_id'].map(bool)
+    repeated_uid = valid & frame['unique_id'].where(valid).duplicated()
+    candidates = valid & ~repeated_uid
+    key = emp_ids.astype(str)
+    already = candidates & (key.isin(checked_in) | key.where(candidates).duplicated())
+    new = candidates & ~already
+
+    names = frame['name'].astype(object)
+    missing_name = new & (names == '')
+    if missing_name.any() and lookup_names is not None:
+        try:
+            resolved = lookup_names(emp_ids[missing_name])
+        except Exception as e:
+            print(f"Error getting employee names from directory: {e}")
+            resolved = ''
+        names = names.copy()
+        names[missing_name] = resolved
+    display_names = names.where(names != '', 'Employee ' + key)
+
+    records = []
+    new_positions = np.flatnonzero(new.to_numpy())
+    if len(new_positions):
+        statuses = predict_statuses([entry_time] * len(new_positions))
+        for position, status in zip(new_positions, statuses):
+            records.append({
+                'Employee ID': emp_ids.iat[position],
+                'Name': display_names.iat[position],
+                'Date': date_str,
+                'Entry_Time': entry_time,
+                'Status': str(status)
+            })
+
+    if records:
+        try:
+            commit(records)
+        except Exception as e:
+            # Nothing of the batch was saved; the caller keeps the entries and retries
+            print(f"❌ Error saving attendance batch: {e}")
+            raise
+
+    # Per-entry results, in batch order
+    for i in range(len(frame)):
+        emp_id, unique_id = emp_ids.iat[i], frame['unique_id'].iat[i]
+        if not valid.iat[i]:
+            details["skipped_entries"].append(f"Entry {i+1}: Missing employee_id or unique_id")
+        elif repeated_uid.iat[i]:
+            details["duplicate_entries"].append(f"{emp_id} (unique_id: {unique_id})")
+        else:
+            details["processed_ids"].add(unique_id)
+            if already.iat[i]:
+                details["skipped_entries"].append(f"{emp_id}: Already marked attendance today")
+                messages.append(f"⚠️ {emp_id}: Already marked today")
+            else:
+                details["successful_entries"].append({
+                    "employee_id": emp_id,
+                    "name": display_names.iat[i],
+                    "timestamp": frame['timestamp'].iat[i],
+                    "unique_id": unique_id
+                })
+                messages.append(f"✅ {names.iat[i] or emp_id} ({emp_id})")
+    return details, messages
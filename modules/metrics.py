@@ -0,0 +1,185 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Optional, Sequence
+
+import pandas as pd
+
+from modules.atomic_files import atomic_write
+
+# Latency bucket upper bounds in seconds (Prometheus histogram `le` labels)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum', 'count', 'errors', 'max')
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.errors = 0
+        self.max = 0.0
+
+
+class Metrics:
+    """
+    Per-stage counters and latency histograms, cheap enough to leave on.
+
+    Recording a stage is two perf_counter() calls, a bisect over the fixed
+    buckets and a few integer updates under one lock (about a microsecond), so
+    there is no sampling and nothing grows with traffic. The same numbers are
+    rendered as a table for the dashboard and as Prometheus text for scraping
+    (GET /metrics on the ingestion server) or a node_exporter textfile.
+    """
+
+    def __init__(self, namespace: str = 'attendance', buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._textfile_thread = None
+
+    # --------------------------------------------------------------- recording
+    def observe(self, stage: str, seconds: float, error: bool = False) -> None:
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = _Histogram(len(self.buckets))
+            histogram.counts[slot] += 1
+            histogram.sum += seconds
+            histogram.count += 1
+            if seconds > histogram.max:
+                histogram.max = seconds
+            if error:
+                histogram.errors += 1
+
+    @contextmanager
+    def time(self, stage: str):
+        """Time a block; an exception counts as a stage error and is re-raised."""
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started, error)
+
+    def wrap(self, stage: str, fn: Callable) -> Callable:
+        """`fn` with every call timed as `stage`."""
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            with self.time(stage):
+                return fn(*args, **kwargs)
+        return timed
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    # ----------------------------------------------------------------- reading
+    def snapshot(self) -> pd.DataFrame:
+        """One row per stage; percentiles are estimated from the histogram buckets."""
+        rows = []
+        with self._lock:
+            for stage, histogram in sorted(self._stages.items()):
+                rows.append({
+                    'Stage': stage,
+                    'Calls': histogram.count,
+                    'Errors': histogram.errors,
+                    'Mean (ms)': round(histogram.sum / histogram.count * 1000, 3) if histogram.count else None,
+                    'p50 (ms)': self._quantile_ms(histogram, 0.50),
+                    'p95 (ms)': self._quantile_ms(histogram, 0.95),
+                    'p99 (ms)': self._quantile_ms(histogram, 0.99),
+                    'Max (ms)': round(histogram.max * 1000, 3),
+                    'Total (s)': round(histogram.sum, 3),
+                })
+        return pd.DataFrame(rows, columns=['Stage', 'Calls', 'Errors', 'Mean (ms)', 'p50 (ms)', 'p95 (ms)',
+                                           'p99 (ms)', 'Max (ms)', 'Total (s)'])
+
+    def counters(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counters)
+
+    def prometheus_text(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_stage_seconds Latency of each attendance pipeline stage.",
+            f"# TYPE {ns}_stage_seconds histogram",
+        ]
+        errors = [
+            f"# HELP {ns}_stage_errors_total Calls of each stage that raised.",
+            f"# TYPE {ns}_stage_errors_total counter",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._stages.items()):
+                label = _label(stage)
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{ns}_stage_seconds_bucket{{stage="{label}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{ns}_stage_seconds_bucket{{stage="{label}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{ns}_stage_seconds_sum{{stage="{label}"}} {histogram.sum:.9g}')
+                lines.append(f'{ns}_stage_seconds_count{{stage="{label}"}} {histogram.count}')
+                errors.append(f'{ns}_stage_errors_total{{stage="{label}"}} {histogram.errors}')
+            counters = []
+            for name, value in sorted(self._counters.items()):
+                metric = f"{ns}_{_metric_name(name)}_total"
+                counters += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        return '\n'.join(lines + errors + counters) + '\n'
+
+    # ---------------------------------------------------------------- textfile
+    def write_textfile(self, path: str) -> None:
+        """Write prometheus_text() atomically (for node_exporter's textfile collector)."""
+        text = self.prometheus_text()
+
+        def write(tmp_path):
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        atomic_write(path, write)
+
+    def start_textfile_writer(self, path: str, interval: float = 15.0) -> None:
+        """Rewrite the textfile every `interval` seconds from a daemon thread."""
+        if self._textfile_thread is not None:
+            return
+
+        def loop():
+            while True:
+                try:
+                    self.write_textfile(path)
+                except OSError as e:
+                    print(f"⚠️ Could not write metrics file {path}: {e}")
+                time.sleep(interval)
+
+        self._textfile_thread = threading.Thread(target=loop, name='metrics-textfile', daemon=True)
+        self._textfile_thread.start()
+
+    def _quantile_ms(self, histogram: _Histogram, q: float) -> Optional[float]:
+        """Linear interpolation inside the bucket holding the q-th observation."""
+        if not histogram.count:
+            return None
+        rank = q * histogram.count
+        cumulative, lower = 0, 0.0
+        for bound, count in zip(self.buckets + (histogram.max,), histogram.counts):
+            if count and cumulative + count >= rank:
+                upper = min(bound, histogram.max)
+                return round((lower + (upper - lower) * (rank - cumulative) / count) * 1000, 3)
+            cumulative += count
+            lower = bound
+        return round(histogram.max * 1000, 3)
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _metric_name(name: str) -> str:
+    return ''.join(c if c.isalnum() or c == '_' else '_' for c in name)
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+def load_model_file(model_path: str):
+    """joblib.load with numpy arrays memory-mapped read-only where the pickle allows it."""
+    return joblib.load(model_path, mmap_mode='r')
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded models, keyed by file path.
+
+    Each model version (file mtime/size) is loaded once and shared by every
+    caller; `get` costs one stat(). When the file changes, the first caller to
+    notice loads the new version and swaps it in; models already handed out
+    stay usable. Load time and per-call latency are recorded for the dashboard.
+    """
+
+    def __init__(self, loader: Callable[[str], object] = load_model_file, latency_window: int = 1000):
+        self.loader = loader
+        self.latency_window = latency_window
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._models: Dict[str, tuple] = {}  # path -> (version, model)
+        self._stats: Dict[str, dict] = {}
+
+    def get(self, model_path: str):
+        """The loaded model for the file's current version."""
+        version = _file_version(model_path)
+        loaded = self._models.get(model_path)
+        if loaded and loaded[0] == version:
+            return loaded[1]
+
+        # One loader per path; other paths and cached reads are not blocked
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_path, threading.Lock())
+        with load_lock:
+            loaded = self._models.get(model_path)
+            if loaded and loaded[0] == version:
+                return loaded[1]
+            started = time.perf_counter()
+            model = self.loader(model_path)
+            load_seconds = time.perf_counter() - started
+            with self._lock:
+                self._models[model_path] = (version, model)
+                stats = self._stats_locked(model_path)
+                stats.update(version=version, loaded_at=datetime.now(), load_seconds=load_seconds,
+                             loads=stats['loads'] + 1)
+            print(f"✅ Model loaded: {os.path.basename(model_path)} in {load_seconds:.2f}s")
+            return model
+
+    @contextmanager
+    def timed(self, model_path: str):
+        """Record the latency of one model-backed call."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_call(model_path, time.perf_counter() - started)
+
+    def record_call(self, model_path: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats_locked(model_path)
+            stats['calls'] += 1
+            stats['latencies'].append(seconds)
+
+    def stats(self) -> pd.DataFrame:
+        """
+        One row per model: loaded version, load time and call latency (recent
+        window). Version/Loaded At stay empty while calls are served without the
+        model itself (e.g. from a compiled lookup table).
+        """
+        rows = []
+        with self._lock:
+            for model_path, stats in sorted(self._stats.items()):
+                latencies = np.array(stats['latencies']) * 1000
+                version = stats.get('version')
+                rows.append({
+                    'Model': os.path.basename(model_path),
+                    'Version': (datetime.fromtimestamp(version[0] / 1e9).strftime('%Y-%m-%d %H:%M:%S')
+                                if version else None),
+                    'Loaded At': stats['loaded_at'].strftime('%H:%M:%S') if stats.get('loaded_at') else None,
+                    'Load (s)': round(stats['load_seconds'], 3) if stats.get('load_seconds') is not None else None,
+                    'Loads': stats['loads'],
+                    'Calls': stats['calls'],
+                    'Mean (ms)': round(float(latencies.mean()), 3) if len(latencies) else None,
+                    'p95 (ms)': round(float(np.percentile(latencies, 95)), 3) if len(latencies) else None,
+                })
+        return pd.DataFrame(rows, columns=['Model', 'Version', 'Loaded At', 'Load (s)', 'Loads', 'Calls',
+                                           'Mean (ms)', 'p95 (ms)'])
+
+    def _stats_locked(self, model_path: str) -> dict:
+        stats = self._stats.get(model_path)
+        if stats is None:
+            stats = self._stats[model_path] = {
+                'loads': 0, 'calls': 0, 'latencies': deque(maxlen=self.latency_window)
+            }
+        return stats
+
+
+def _file_version(model_path: str) -> tuple:
+    st = os.stat(model_path)
+    return (st.st_mtime_ns, st.st_size)
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import pickle
+from typing import Callable, Optional
+
+import pandas as pd
+
+from modules.atomic_files import atomic_write
+
+# Bump when the frames a reader produces change shape, so every sidecar is rebuilt once
+SIDECAR_VERSION = 1
+HASH_CHUNK = 1 << 20
+
+
+def sidecar_path(source_path: str, key: str) -> str:
+    """Hidden file next to the source: excels/Attendance_Raw_May_2025.xlsx -> excels/.Attendance_Raw_May_2025.xlsx.raw.pkl"""
+    directory, name = os.path.split(source_path)
+    return os.path.join(directory, f'.{name}.{key}.pkl')
+
+
+def content_hash(path: str) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def read_cached(source_path: str, reader: Callable[[str], pd.DataFrame], key: str = 'frame',
+                verify_hash: bool = False) -> pd.DataFrame:
+    """
+    `reader(source_path)`, served from a pickled sidecar while the source is unchanged.
+
+    A sidecar is used as-is when the source's mtime and size match what was
+    recorded (or, with `verify_hash`, only when its content hash does too). When
+    mtime or size differ the source is hashed: identical content (a copy, a
+    touch, a save without edits) just refreshes the recorded stat, anything else
+    is parsed again and the sidecar rewritten. Hashing is a fraction of an
+    openpyxl parse, so only real edits pay for one. `key` names the reader, so
+    different readers of one file keep separate sidecars.
+
+    Sidecars are written under a temporary name and renamed; one that cannot be
+    read or written is ignored and the source parsed directly.
+    """
+    st = os.stat(source_path)
+    cache_path = sidecar_path(source_path, key)
+    header = _read_header(cache_path)
+    digest = None
+    if header is not None and header['version'] == _version() and header['key'] == key:
+        stat_matches = header['mtime_ns'] == st.st_mtime_ns and header['size'] == st.st_size
+        if stat_matches and not verify_hash:
+            frame = _read_frame(cache_path)
+            if frame is not None:
+                return frame
+        else:
+            digest = content_hash(source_path)
+            if digest == header['hash']:
+                frame = _read_frame(cache_path)
+                if frame is not None:
+                    if not stat_matches:
+                        _write_sidecar(cache_path, _header(key, st, digest), frame)
+                    return frame
+
+    digest = digest or content_hash(source_path)
+    frame = reader(source_path)
+    after = os.stat(source_path)
+    if (after.st_mtime_ns, after.st_size) == (st.st_mtime_ns, st.st_size):  # not rewritten mid-parse
+        _write_sidecar(cache_path, _header(key, st, digest), frame)
+    return frame
+
+
+def invalidate(source_path: str, key: str = 'frame') -> None:
+    try:
+        os.remove(sidecar_path(source_path, key))
+    except FileNotFoundError:
+        pass
+
+
+# ---- Sidecar file: a pickled header followed by the pickled frame
+def _version() -> str:
+    return f'{SIDECAR_VERSION}/pandas-{pd.__version__}'
+
+
+def _header(key: str, st: os.stat_result, digest: str) -> dict:
+    return {'version': _version(), 'key': key, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'hash': digest}
+
+
+def _read_header(cache_path: str) -> Optional[dict]:
+    try:
+        with open(cache_path, 'rb') as f:
+            header = pickle.load(f)
+        return header if isinstance(header, dict) else None
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError):
+        return None
+
+
+def _read_frame(cache_path: str) -> Optional[pd.DataFrame]:
+    try:
+        with open(cache_path, 'rb') as f:
+            pickle.load(f)  # header
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError) as e:
+        print(f"⚠️ Ignoring unreadable sidecar {cache_path}: {e}")
+        return None
+
+
+def _write_sidecar(cache_path: str, header: dict, frame: pd.DataFrame) -> None:
+    def write(path):
+        with open(path, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        atomic_write(cache_path, write)
+    except OSError as e:
+        print(f"⚠️ Could not write sidecar {cache_path}: {e}")
@@ -13,16 +13,17 @@ def predict_attendance(df: pd.DataFrame, model) -> (pd.DataFrame, pd.DataFrame):
       - leave_summary: DataFrame with ['Employee ID','Name','Total_Lates','Total_Leaves']
     """
     # Lazy imports of your modules
-    from modules.data_cleaning import convert_to_time, get_late_minutes
+    from modules.data_cleaning import entry_time_micros, late_minutes_from_micros, micros_to_time
     from modules.feature_engineering import engineering_features
     from modules.leave_calculator import calculate_leaves_from_lates
 
-    # 1. Clean entry times
+    # 1. Clean entry times (whole column at once)
     df = df.copy()
-    df['Entry_Time'] = df['Entry_Time'].apply(convert_to_time)
+    micros = entry_time_micros(df['Entry_Time'])
+    df['Entry_Time'] = micros_to_time(micros)
 
     # 2. Compute late minutes
-    df['Late_Min'] = df['Entry_Time'].apply(get_late_minutes)
+    df['Late_Min'] = late_minutes_from_micros(micros)
 
     # 3. Feature engineering to get X_test
     X_test, df = engineering_features(df)
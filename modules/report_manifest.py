@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from modules.atomic_files import atomic_write
+
+# Bump when the report layout changes so existing reports are rebuilt once
+RENDERER_VERSION = 2
+
+_lock = threading.Lock()
+
+
+def frame_digest(df: pd.DataFrame, *extra) -> str:
+    """
+    Stable content digest of a DataFrame (values, column names and order),
+    plus any extra inputs that change the rendered output (e.g. the title).
+    """
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps([list(map(str, df.columns)), RENDERER_VERSION, list(map(str, extra))]).encode())
+    if len(df):
+        row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+        hasher.update(row_hashes.tobytes())
+    return hasher.hexdigest()
+
+
+def load_report_manifest(manifest_path: str) -> dict:
+    """{filename: {'digest', 'rows', 'built_at', 'mtime_ns', 'size'}} for every built report."""
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def report_is_fresh(manifest_path: str, file_path: str, digest: str) -> bool:
+    """True if `file_path` was built from inputs with this digest and not touched since."""
+    entry = load_report_manifest(manifest_path).get(os.path.basename(file_path))
+    if not entry or entry.get('digest') != digest:
+        return False
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return False
+    return entry.get('mtime_ns') == st.st_mtime_ns and entry.get('size') == st.st_size
+
+
+def record_report(manifest_path: str, file_path: str, digest: str, rows: int) -> None:
+    """Record the digest of the inputs a report was just built from."""
+    st = os.stat(file_path)
+    with _lock:
+        manifest = load_report_manifest(manifest_path)
+        manifest[os.path.basename(file_path)] = {
+            'digest': digest,
+            'rows': int(rows),
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+        }
+        atomic_write(manifest_path, lambda tmp_path: _dump_json(manifest, tmp_path))
+
+
+def _dump_json(data, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def manifest_status(manifest_path: str, report_dir: str) -> pd.DataFrame:
+    """
+    One row per report in the manifest, for operators:
+    ['Report', 'Rows', 'Built At', 'Digest', 'On Disk'] where 'On Disk' says
+    whether the file still matches what was built.
+    """
+    rows = []
+    for filename, entry in sorted(load_report_manifest(manifest_path).items()):
+        file_path = os.path.join(report_dir, filename)
+        try:
+            st = os.stat(file_path)
+            on_disk = ('Unchanged' if (st.st_mtime_ns, st.st_size) == (entry.get('mtime_ns'), entry.get('size'))
+                       else 'Modified')
+        except FileNotFoundError:
+            on_disk = 'Missing'
+        rows.append({
+            'Report': filename,
+            'Rows': entry.get('rows'),
+            'Built At': entry.get('built_at'),
+            'Digest': (entry.get('digest') or '')[:12],
+            'On Disk': on_disk,
+        })
+    return pd.DataFrame(rows, columns=['Report', 'Rows', 'Built At', 'Digest', 'On Disk'])
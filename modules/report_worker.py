@@ -0,0 +1,96 @@
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Hashable, Optional
+
+
+class DebouncedWorker:
+    """
+    Background thread that runs `task(key)` once requests for a key go quiet.
+
+    Every `request(key)` only records a timestamp; the worker runs the task when
+    no new request for that key arrived for `quiet_period` seconds, or when the
+    oldest pending request is `max_delay` seconds old (so a steady stream of
+    requests cannot postpone the rebuild forever). A burst of 200 requests
+    therefore costs one run, and callers never block on the task.
+    """
+
+    def __init__(self, task: Callable[[Hashable], None], quiet_period: float = 2.0,
+                 max_delay: float = 30.0, name: str = 'debounced-worker'):
+        self.task = task
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+
+        self._cond = threading.Condition()
+        self._pending = {}  # key -> (first request, last request), monotonic seconds
+        self._running = None
+        self._last_completed: Optional[datetime] = None
+        self._last_duration: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._requests = 0
+        self._runs = 0
+
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def request(self, key: Hashable = None) -> None:
+        """Ask for the task to run for `key`; coalesces with pending requests."""
+        now = time.monotonic()
+        with self._cond:
+            first, _ = self._pending.get(key, (now, now))
+            self._pending[key] = (first, now)
+            self._requests += 1
+            self._cond.notify()
+
+    def status(self) -> dict:
+        """Snapshot for the dashboard: last completed run and whether output is stale."""
+        with self._cond:
+            return {
+                'last_completed': self._last_completed,
+                'last_duration': self._last_duration,
+                'last_error': self._last_error,
+                'pending': len(self._pending),
+                'running': self._running is not None,
+                'stale': bool(self._pending) or self._running is not None,
+                'requests': self._requests,
+                'runs': self._runs,
+            }
+
+    def _next_due(self):
+        """(key, 0) for a key that is due now, else (None, seconds until the next one)."""
+        now = time.monotonic()
+        wait = None
+        for key, (first, last) in self._pending.items():
+            due = min(last + self.quiet_period, first + self.max_delay)
+            if due <= now:
+                return key, 0
+            wait = due - now if wait is None else min(wait, due - now)
+        return None, wait
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                key, wait = self._next_due()
+                if wait:
+                    self._cond.wait(wait)
+                    continue
+                del self._pending[key]
+                self._running = key
+
+            started = time.monotonic()
+            error = None
+            try:
+                self.task(key)
+            except Exception as e:
+                error = str(e)
+                print(f"❌ Background task failed for {key}: {e}")
+
+            with self._cond:
+                self._running = None
+                self._runs += 1
+                self._last_duration = time.monotonic() - started
+                self._last_error = error
+                if error is None:
+                    self._last_completed = datetime.now()
@@ -0,0 +1,170 @@
+import os
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from modules.atomic_files import WORKBOOK_GENERATIONS, atomic_write
+from modules.data_cleaning import entry_time_micros, minutes_of_day
+from modules.parse_cache import read_cached
+from modules.status_summary import STATUSES
+
+# Canonical in-memory attendance schema:
+#   Employee ID   category (dictionary-encoded str)
+#   Name          category
+#   Date          ordered category of datetime64[s] dates (a year is 365 categories,
+#                 so rows hold int16 codes; NaT when unparseable)
+#   Entry_Minute  int16 minutes since midnight, -1 for no entry time
+#   Status        category over STATUSES (plus any other status seen)
+TYPED_COLUMNS = ['Employee ID', 'Name', 'Date', 'Entry_Minute', 'Status']
+DATE_FORMAT = '%d/%m/%Y'
+NO_MINUTE = -1
+
+
+def parse_dates(values) -> pd.Series:
+    """'dd/mm/YYYY' strings (the workbook format), ISO strings, dates or Timestamps -> datetime64[s]."""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dates = values
+    else:
+        dates = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+        for fmt, dayfirst in (('ISO8601', False), ('mixed', True)):
+            stragglers = dates.isna() & values.notna()
+            if not stragglers.any():
+                break
+            dates[stragglers] = pd.to_datetime(values[stragglers].astype(str), format=fmt,
+                                               dayfirst=dayfirst, errors='coerce')
+    return dates.dt.normalize().astype('datetime64[s]')
+
+
+def encode_dates(dates) -> pd.Categorical:
+    """datetime64 values -> ordered Categorical over the sorted distinct dates."""
+    dates = pd.Series(dates).astype('datetime64[s]')
+    return pd.Categorical(dates, categories=np.sort(dates.dropna().unique()), ordered=True)
+
+
+def status_dtype(statuses=None) -> pd.CategoricalDtype:
+    """STATUSES first (stable codes across frames), then any other status in `statuses`."""
+    extra = [] if statuses is None else sorted(set(pd.Series(statuses).dropna().astype(str)) - set(STATUSES))
+    return pd.CategoricalDtype(STATUSES + extra)
+
+
+def to_typed(raw: pd.DataFrame) -> pd.DataFrame:
+    """Raw attendance rows (Employee ID/Name/Date/Entry_Time/Status) -> the typed schema."""
+    if raw.empty:
+        return empty_typed()
+    status = raw['Status'].astype(object) if 'Status' in raw else pd.Series(None, index=raw.index, dtype=object)
+    status = status.where(status.notna(), None).map(lambda value: value if value is None else str(value))
+    minutes = (minutes_of_day(entry_time_micros(raw['Entry_Time'])) if 'Entry_Time' in raw
+               else np.full(len(raw), NO_MINUTE, dtype=np.int16))
+    return pd.DataFrame({
+        'Employee ID': raw['Employee ID'].astype(str).str.strip().astype('category'),
+        'Name': (raw['Name'] if 'Name' in raw else pd.Series(None, index=raw.index, dtype=object)).astype('category'),
+        'Date': encode_dates(parse_dates(raw['Date'])),
+        'Entry_Minute': minutes,
+        'Status': pd.Categorical(status, dtype=status_dtype(status)),
+    }, index=raw.index)
+
+
+def from_typed(typed: pd.DataFrame) -> pd.DataFrame:
+    """Typed schema -> raw rows as the workbooks hold them ('dd/mm/YYYY' dates, datetime.time entry times)."""
+    minutes = typed['Entry_Minute'].to_numpy(dtype=np.int64)
+    entry_times = np.full(len(typed), None, dtype=object)
+    for minute in np.unique(minutes[minutes >= 0]):
+        entry_times[minutes == minute] = time(int(minute) // 60, int(minute) % 60)
+    dates = typed['Date'].astype('datetime64[s]').dt.strftime(DATE_FORMAT)
+    return pd.DataFrame({
+        'Employee ID': typed['Employee ID'].astype(object),
+        'Name': typed['Name'].astype(object),
+        'Date': dates.astype(object).where(dates.notna(), None),
+        'Entry_Time': entry_times,
+        'Status': typed['Status'].astype(object),
+    }, index=typed.index)
+
+
+def empty_typed() -> pd.DataFrame:
+    return pd.DataFrame({
+        'Employee ID': pd.Categorical([]),
+        'Name': pd.Categorical([]),
+        'Date': encode_dates([]),
+        'Entry_Minute': pd.Series([], dtype=np.int16),
+        'Status': pd.Categorical([], dtype=status_dtype()),
+    })
+
+
+def concat_typed(frames) -> pd.DataFrame:
+    """
+    Concatenate typed frames (all with the same columns, any subset of
+    TYPED_COLUMNS), unioning categories so nothing falls back to object dtype.
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return empty_typed()
+    data = {}
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if column == 'Date':
+            data[column] = encode_dates(np.concatenate([part.astype('datetime64[s]').to_numpy() for part in parts]))
+        elif column == 'Status':
+            dtype = status_dtype(np.concatenate([part.cat.categories.to_numpy(dtype=object) for part in parts]))
+            data[column] = pd.api.types.union_categoricals([part.astype(dtype) for part in parts])
+        elif isinstance(parts[0].dtype, pd.CategoricalDtype):
+            data[column] = pd.api.types.union_categoricals(parts, ignore_order=True)
+        else:
+            data[column] = np.concatenate([part.to_numpy() for part in parts])
+    return pd.DataFrame(data)
+
+
+# ---- Filters (vectorized on the typed columns)
+def date_mask(typed: pd.DataFrame, start=None, end=None) -> np.ndarray:
+    """
+    Boolean mask for the inclusive [start, end] range; either bound may be omitted.
+    The bounds are compared against the (few) date categories, then the result
+    is gathered through the int16 codes. A plain datetime64 Date works too.
+    """
+    dates = typed['Date']
+    encoded = isinstance(dates.dtype, pd.CategoricalDtype)
+    values = dates.cat.categories.to_numpy() if encoded else dates.to_numpy()
+    keep = ~np.isnat(values)
+    if start is not None:
+        keep &= values >= _as_datetime64(start)
+    if end is not None:
+        keep &= values <= _as_datetime64(end)
+    if not encoded:
+        return keep
+    return np.append(keep, False)[dates.cat.codes.to_numpy()]  # code -1 (NaT) -> the trailing False
+
+
+def filter_dates(typed: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    return typed[date_mask(typed, start, end)]
+
+
+def _as_datetime64(value) -> np.datetime64:
+    return parse_dates([value]).to_numpy()[0]
+
+
+# ---- Excel/CSV boundaries
+def read_attendance_file(path: str) -> pd.DataFrame:
+    """Read an attendance workbook or CSV straight into the typed schema (via its parse sidecar)."""
+    def parse(source_path):
+        if os.path.splitext(source_path)[1].lower() == '.csv':
+            raw = pd.read_csv(source_path, dtype={'Employee ID': str, 'Date': str, 'Entry_Time': str})
+        else:
+            raw = pd.read_excel(source_path, dtype={'Employee ID': str})
+        return to_typed(raw)
+
+    return read_cached(path, parse, key='typed')
+
+
+def write_attendance_file(typed: pd.DataFrame, path: str) -> None:
+    """Write typed rows back out in the raw workbook/CSV layout."""
+    raw = from_typed(typed)
+    if os.path.splitext(path)[1].lower() == '.csv':
+        raw['Entry_Time'] = [value.strftime('%H:%M') if value is not None else None for value in raw['Entry_Time']]
+        atomic_write(path, lambda tmp_path: raw.to_csv(tmp_path, index=False))
+    else:
+        atomic_write(path, lambda tmp_path: raw.to_excel(tmp_path, index=False), generations=WORKBOOK_GENERATIONS)
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
@@ -0,0 +1,313 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Spool layout: producers write into tmp/ and rename into the spool directory;
+# the consumer claims a ready file by renaming it into claimed/ before reading,
+# so every file is processed exactly once and nothing written later is lost.
+TMP_DIR = 'tmp'
+CLAIMED_DIR = 'claimed'
+FAILED_DIR = 'failed'
+SPOOL_SUFFIX = '.json'
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+
+def write_spool_batch(spool_dir: str, entries: List[dict], sub_dir: str = '') -> str:
+    """
+    Producer side: publish one batch of recognized IDs.
+
+    The file is written and fsynced under tmp/, then renamed into the spool
+    directory, so the consumer only ever sees complete files. Names start with
+    a nanosecond timestamp, so batches are consumed in arrival order.
+    `sub_dir=FAILED_DIR` parks the batch with the failed ones instead, to be
+    requeued by `SpoolConsumer.retry_failed`.
+    """
+    tmp_dir = os.path.join(spool_dir, TMP_DIR)
+    os.makedirs(tmp_dir, exist_ok=True)
+    os.makedirs(os.path.join(spool_dir, sub_dir), exist_ok=True)
+    name = f"{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}{SPOOL_SUFFIX}"
+    tmp_path = os.path.join(tmp_dir, name)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f)
+        f.flush()
+        os.fsync(f.fileno())
+    final_path = os.path.join(spool_dir, sub_dir, name)
+    os.rename(tmp_path, final_path)
+    return final_path
+
+
+class _Inotify:
+    """Minimal inotify binding over ctypes; raises OSError where unavailable."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError("inotify is not available on this platform")
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def watch(self, path: str, mask: int = _IN_CLOSE_WRITE | _IN_MOVED_TO) -> None:
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout: float) -> bool:
+        """Block until an event arrives or `timeout` passes; drains pending events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SpoolConsumer:
+    """
+    Background consumer for a spool directory of recognized-ID batches.
+
+    The thread sleeps on inotify (falling back to polling every
+    `poll_interval` seconds where inotify is unavailable), claims each ready
+    file by renaming it into claimed/, hands its entries to `handler`, and
+    deletes it once handled. A file is only handled when the handler returns
+    and `accept(outcome)` (if given) is true; otherwise it stays in claimed/
+    and is retried after `retry_delay` seconds (doubling per attempt), and
+    after `max_attempts` it is moved to failed/, from where `retry_failed()`
+    puts it back. Files left in claimed/ by a crash are processed on start-up;
+    unreadable files are moved to failed/ at once. A legacy single-file drop
+    (recognized_id.json) is adopted into the spool by rename once it has been
+    quiet for `legacy_settle` seconds. `observe(stage, seconds)`, if given,
+    receives the time spent reading each file ('json_read').
+    """
+
+    def __init__(self, spool_dir: str, handler: Callable[[List[dict]], object],
+                 legacy_file: Optional[str] = None, poll_interval: float = 0.05,
+                 legacy_settle: float = 0.05, history: int = 100,
+                 observe: Optional[Callable[[str, float], None]] = None,
+                 accept: Optional[Callable[[object], bool]] = None, retry_delay: float = 1.0,
+                 max_attempts: int = 3):
+        self.spool_dir = spool_dir
+        self.observe = observe
+        self.handler = handler
+        self.accept = accept
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.legacy_file = legacy_file
+        self.poll_interval = poll_interval
+        self.legacy_settle = legacy_settle
+
+        for sub_dir in (TMP_DIR, CLAIMED_DIR, FAILED_DIR):
+            os.makedirs(os.path.join(spool_dir, sub_dir), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._results = deque(maxlen=history)
+        self._seq = 0
+        self._batches = 0
+        self._entries = 0
+        # Claimed files whose batch failed: name -> (attempts so far, time.monotonic() of the next try)
+        self._retries: Dict[str, tuple] = {}
+        self.mode = 'polling'
+        self._inotify = None
+        try:
+            self._inotify = _Inotify()
+            self._inotify.watch(spool_dir)
+            self.mode = 'inotify'
+        except OSError as e:
+            print(f"⚠️ inotify unavailable, polling spool every {poll_interval}s: {e}")
+            if self._inotify is not None:
+                self._inotify.close()
+            self._inotify = None
+
+        if self._inotify is not None and legacy_file:
+            try:
+                self._inotify.watch(os.path.dirname(os.path.abspath(legacy_file)))
+            except OSError:
+                pass  # picked up by the safety-net timeout instead
+
+        self._thread = threading.Thread(target=self._loop, name='spool-consumer', daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------- consuming
+    def drain(self) -> List[dict]:
+        """Claim and process everything ready now; returns the results produced."""
+        with self._lock:
+            first_seq = self._seq
+            self._adopt_legacy_locked()
+            claimed_dir = os.path.join(self.spool_dir, CLAIMED_DIR)
+            # Leftovers from a crash (and an adopted legacy file) go first; failed batches once due
+            now = time.monotonic()
+            claimed = [os.path.join(claimed_dir, name) for name in self._ready(CLAIMED_DIR)
+                       if self._retries.get(name, (0, now))[1] <= now]
+            for name in self._ready():
+                try:
+                    os.rename(os.path.join(self.spool_dir, name), os.path.join(claimed_dir, name))
+                except FileNotFoundError:
+                    continue  # claimed by another consumer
+                claimed.append(os.path.join(claimed_dir, name))
+            if claimed:
+                self._process_locked(claimed)
+            return [result for result in self._results if result['seq'] > first_seq]
+
+    def retry_failed(self) -> int:
+        """Put every file in failed/ back into the spool; returns how many were requeued."""
+        requeued = 0
+        with self._lock:
+            for name in self._ready(FAILED_DIR):
+                try:
+                    os.rename(os.path.join(self.spool_dir, FAILED_DIR, name), os.path.join(self.spool_dir, name))
+                except OSError:
+                    continue
+                requeued += 1
+        return requeued
+
+    def results_since(self, seq: int) -> List[dict]:
+        """Results with a sequence number above `seq` (still in the history window)."""
+        with self._lock:
+            return [result for result in self._results if result['seq'] > seq]
+
+    def status(self) -> dict:
+        with self._lock:
+            last = self._results[-1] if self._results else None
+            return {
+                'mode': self.mode,
+                'alive': self._thread.is_alive(),
+                'pending': len(self._ready()) + len(self._ready(CLAIMED_DIR)),
+                'failed': len(self._ready(FAILED_DIR)),
+                'retrying': len(self._retries),
+                'batches': self._batches,
+                'entries': self._entries,
+                'last_seq': self._seq,
+                'last_batch_at': last['processed_at'] if last else None,
+                'last_latency_ms': last['latency_ms'] if last else None,
+            }
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---------------------------------------------------------------- helpers
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                print(f"❌ Spool consumer error: {e}")
+            settling = bool(self.legacy_file) and os.path.exists(self.legacy_file)
+            with self._lock:
+                next_retry = min((due for _, due in self._retries.values()), default=None)
+            retry_in = max(next_retry - time.monotonic(), 0) if next_retry is not None else float('inf')
+            if self._inotify is not None:
+                # Events wake us at once; the timeout is a safety net, re-checks a settling legacy file
+                # or retries a failed batch
+                self._inotify.wait(min(self.legacy_settle if settling else 5.0, retry_in))
+            else:
+                self._stop.wait(min(self.legacy_settle if settling else self.poll_interval, retry_in))
+
+    def _ready(self, sub_dir: str = '') -> List[str]:
+        try:
+            names = os.listdir(os.path.join(self.spool_dir, sub_dir))
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if name.endswith(SPOOL_SUFFIX))
+
+    def _adopt_legacy_locked(self) -> None:
+        if not self.legacy_file:
+            return
+        try:
+            st = os.stat(self.legacy_file)
+        except FileNotFoundError:
+            return
+        if st.st_size == 0 or time.time() - st.st_mtime < self.legacy_settle:
+            return
+        name = f"{time.time_ns():020d}-legacy{SPOOL_SUFFIX}"
+        try:
+            os.rename(self.legacy_file, os.path.join(self.spool_dir, CLAIMED_DIR, name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Could not adopt {self.legacy_file}: {e}")
+
+    def _process_locked(self, claimed_paths: List[str]) -> None:
+        """Hand every entry of the claimed files to the handler as one batch."""
+        entries, handled, written_at = [], [], time.time()
+        for path in claimed_paths:
+            name = os.path.basename(path)
+            try:
+                written_at = min(written_at, os.stat(path).st_mtime)
+                started = time.perf_counter()
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if self.observe is not None:
+                    self.observe('json_read', time.perf_counter() - started)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                print(f"❌ Spool file {name} failed: {e}")
+                self._record_locked(name, 0, None, str(e), time.time())
+                try:
+                    os.replace(path, os.path.join(self.spool_dir, FAILED_DIR, name))
+                except OSError:
+                    pass
+                continue
+            entries.extend(data if isinstance(data, list) else [data])
+            handled.append(path)
+
+        if not handled:
+            return
+        label = os.path.basename(handled[0]) if len(handled) == 1 else f"{len(handled)} files"
+        try:
+            outcome, error = self.handler(entries), None
+            if self.accept is not None and not self.accept(outcome):
+                error = "not every entry was saved"
+        except Exception as e:
+            outcome, error = None, str(e)
+        if error is not None:
+            print(f"❌ Spool batch {label} failed: {error}")
+        for path in handled:
+            name = os.path.basename(path)
+            attempts = self._retries.pop(name, (0, 0))[0] + 1
+            try:
+                if error is None:
+                    os.remove(path)
+                elif attempts < self.max_attempts:
+                    # Stays in claimed/ and is retried once due
+                    self._retries[name] = (attempts, time.monotonic() + self.retry_delay * 2 ** (attempts - 1))
+                else:
+                    print(f"❌ Spool file {name} failed {attempts} times, moved to {FAILED_DIR}/")
+                    os.replace(path, os.path.join(self.spool_dir, FAILED_DIR, name))
+            except OSError:
+                pass
+        self._record_locked(label, len(entries), outcome, error, written_at)
+
+    def _record_locked(self, label: str, entries: int, outcome, error: Optional[str], written_at: float) -> None:
+        self._seq += 1
+        self._batches += 1
+        self._entries += entries
+        self._results.append({
+            'seq': self._seq,
+            'file': label,
+            'entries': entries,
+            'outcome': outcome,
+            'error': error,
+            'processed_at': datetime.now(),
+            'latency_ms': round((time.time() - written_at) * 1000, 1),
+        })
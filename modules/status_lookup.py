@@ -0,0 +1,186 @@
+import os
+import sys
+import threading
+from datetime import time
+from typing import Callable, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from modules.atomic_files import atomic_write
+from modules.data_cleaning import (
+    NO_TIME, convert_to_time, cutoff_time, entry_time_micros, late_minutes_from_micros,
+    minutes_of_day, time_to_micros
+)
+
+MINUTES_PER_DAY = 24 * 60
+# Row of the table used for "no entry time" (Late_Min 0, Hour -1, Minute -1)
+NULL_ROW = MINUTES_PER_DAY
+FEATURES = ['Late_Min', 'Hour', 'Minute']
+
+
+def lookup_features(cutoff=cutoff_time) -> pd.DataFrame:
+    """
+    Every distinct model input: one row per minute of the day, then the null row.
+    Late minutes are whole minutes, so seconds inside a minute never change the
+    features as long as the cutoff itself falls on a whole minute.
+    """
+    if cutoff.second or cutoff.microsecond:
+        raise ValueError(f"Cutoff must fall on a whole minute, got {cutoff}")
+    minutes = np.arange(MINUTES_PER_DAY, dtype=np.int64)
+    late = late_minutes_from_micros(minutes * 60_000_000, cutoff)
+    return pd.DataFrame({
+        'Late_Min': np.append(late, 0),
+        'Hour': np.append(minutes // 60, -1),
+        'Minute': np.append(minutes % 60, -1),
+    })
+
+
+def model_signature(model_path: str) -> np.ndarray:
+    st = os.stat(model_path)
+    return np.array([st.st_mtime_ns, st.st_size], dtype=np.int64)
+
+
+class StatusLookup:
+    """
+    The status model compiled into a 1,441-entry table.
+
+    The model only sees Late_Min, Hour and Minute, all derived from the entry
+    time, so evaluating it once per minute of the day (plus "no entry time")
+    captures every answer it can give. A prediction is then an array index.
+    """
+
+    def __init__(self, classes: np.ndarray, codes: np.ndarray, cutoff_minute: int,
+                 signature: Optional[np.ndarray] = None):
+        self.classes = np.asarray(classes).astype(str)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.cutoff_minute = int(cutoff_minute)
+        self.signature = signature
+        if len(self.codes) != MINUTES_PER_DAY + 1:
+            raise ValueError(f"Lookup table must have {MINUTES_PER_DAY + 1} entries, got {len(self.codes)}")
+
+    @classmethod
+    def compile(cls, model, cutoff=cutoff_time, signature=None) -> 'StatusLookup':
+        features = lookup_features(cutoff)
+        predictions = np.asarray(model.predict(features[FEATURES]))
+        classes = np.asarray(model.classes_)
+        if len(classes) > 255:
+            raise ValueError("Too many classes for a uint8 lookup table")
+        index = {label: code for code, label in enumerate(classes)}
+        codes = np.array([index[label] for label in predictions])
+        return cls(classes, codes, cutoff.hour * 60 + cutoff.minute, signature)
+
+    # ---------------------------------------------------------------- predict
+    def predict(self, entry_time) -> str:
+        """Status for one entry time (anything convert_to_time accepts)."""
+        micros = time_to_micros(convert_to_time(entry_time))
+        row = NULL_ROW if micros == NO_TIME else micros // 60_000_000
+        return str(self.classes[self.codes[row]])
+
+    def predict_many(self, values) -> np.ndarray:
+        """Statuses for a whole Entry_Time column."""
+        return self.predict_minutes(minutes_of_day(entry_time_micros(values)))
+
+    def predict_minutes(self, minutes) -> np.ndarray:
+        """Statuses for minutes-of-day (-1 = no entry time)."""
+        minutes = np.asarray(minutes, dtype=np.int64)
+        rows = np.where(minutes < 0, NULL_ROW, minutes)
+        return self.classes[self.codes[rows]]
+
+    # ------------------------------------------------------------- validation
+    def validate(self, model, entry_times=None) -> pd.DataFrame:
+        """
+        Compare the table with live `model.predict`. Checks every table row and,
+        if given, a column of real entry times run through predict_attendance.
+        Returns the mismatching rows (empty when the table is valid).
+        """
+        from modules.predict_attendance import predict_attendance
+
+        features = lookup_features(_minute_to_time(self.cutoff_minute))
+        expected = np.asarray(model.predict(features[FEATURES])).astype(str)
+        actual = self.classes[self.codes]
+        mismatches = features.assign(Expected=expected, Lookup=actual)[expected != actual]
+
+        if entry_times is not None:
+            entry_times = pd.Series(entry_times).reset_index(drop=True)
+            sample = pd.DataFrame({'Employee ID': 0, 'Name': '', 'Date': '', 'Entry_Time': entry_times})
+            expected = predict_attendance(sample, model)[0]['Status'].astype(str).to_numpy()
+            actual = self.predict_many(entry_times)
+            differ = expected != actual
+            mismatches = pd.concat([mismatches, pd.DataFrame({
+                'Entry_Time': entry_times[differ].astype(str), 'Expected': expected[differ], 'Lookup': actual[differ]
+            })], ignore_index=True)
+        return mismatches
+
+    # ------------------------------------------------------------ persistence
+    def save(self, table_path: str) -> None:
+        def write(path):
+            with open(path, 'wb') as f:  # a file object: np.savez would append '.npz' to a path
+                np.savez(f, classes=self.classes, codes=self.codes,
+                         cutoff_minute=np.int64(self.cutoff_minute),
+                         signature=self.signature if self.signature is not None else np.array([], dtype=np.int64))
+        atomic_write(table_path, write)
+
+    @classmethod
+    def load(cls, table_path: str) -> 'StatusLookup':
+        with np.load(table_path, allow_pickle=False) as data:
+            signature = data['signature'] if data['signature'].size else None
+            return cls(data['classes'], data['codes'], int(data['cutoff_minute']), signature)
+
+
+_lock = threading.Lock()
+_compiled = {}  # (model_path, table_path) -> StatusLookup
+
+
+def get_status_lookup(model_path: str, table_path: Optional[str] = None,
+                      load_model: Callable[[str], object] = joblib.load,
+                      cutoff=cutoff_time) -> StatusLookup:
+    """
+    Compiled table for the model file, cached per process and on disk.
+    Costs one stat() per call; the model is only loaded and re-evaluated when
+    the model file's mtime/size differ from the ones the table was built from.
+    """
+    table_path = table_path or os.path.splitext(model_path)[0] + '_lookup.npz'
+    signature = model_signature(model_path)
+    cutoff_minute = cutoff.hour * 60 + cutoff.minute
+
+    def is_current(lookup):
+        return (lookup is not None and lookup.cutoff_minute == cutoff_minute
+                and lookup.signature is not None and np.array_equal(lookup.signature, signature))
+
+    with _lock:
+        lookup = _compiled.get((model_path, table_path))
+        if is_current(lookup):
+            return lookup
+        try:
+            lookup = StatusLookup.load(table_path)
+        except (OSError, ValueError, KeyError):
+            lookup = None
+        if not is_current(lookup):
+            lookup = StatusLookup.compile(load_model(model_path), cutoff, signature)
+            try:
+                lookup.save(table_path)
+            except OSError as e:
+                print(f"⚠️ Could not save status lookup table: {e}")
+            print(f"✅ Status lookup table compiled from {os.path.basename(model_path)}")
+        _compiled[(model_path, table_path)] = lookup
+        return lookup
+
+
+def _minute_to_time(minute: int) -> time:
+    return time(minute // 60, minute % 60)
+
+
+if __name__ == "__main__":
+    # python -m modules.status_lookup best_rf_model.pkl [--validate]
+    model_path = sys.argv[1] if len(sys.argv) > 1 else 'best_rf_model.pkl'
+    lookup = get_status_lookup(model_path)
+    print(pd.Series(lookup.classes[lookup.codes]).value_counts().to_string())
+    if '--validate' in sys.argv:
+        mismatches = lookup.validate(joblib.load(model_path))
+        if mismatches.empty:
+            print("✅ Lookup table matches model.predict for every input")
+        else:
+            print(f"❌ {len(mismatches)} mismatch(es):")
+            print(mismatches.to_string())
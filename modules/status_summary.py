@@ -0,0 +1,108 @@
+import pandas as pd
+from typing import Dict, Optional
+
+# Status values that get their own counter in summaries
+STATUSES = ['Present', 'Late', 'Absent', 'Leave']
+
+SUMMARY_COLUMNS = [
+    'Employee ID', 'Name', 'Total Present', 'Total Late', 'Total Absent', 'Total Leave', 'Total Entries'
+]
+
+
+def filter_date_range(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Keep rows whose 'dd/mm/YYYY' Date falls in the inclusive [start, end] range.
+    `start`/`end` may be 'dd/mm/YYYY' strings, dates or Timestamps; either may be omitted.
+    Typed frames (modules.schema) are filtered without parsing any dates.
+    """
+    if start is None and end is None:
+        return df
+    if isinstance(df['Date'].dtype, pd.CategoricalDtype) or pd.api.types.is_datetime64_any_dtype(df['Date']):
+        from modules.schema import date_mask
+        return df[date_mask(df, start, end)]
+    dates = pd.to_datetime(df['Date'], format='%d/%m/%Y', errors='coerce')
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= dates >= _as_timestamp(start)
+    if end is not None:
+        mask &= dates <= _as_timestamp(end)
+    return df[mask]
+
+
+def status_counts_by_employee(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One groupby pass: Employee ID -> count per status (columns = STATUSES plus any
+    other status seen) and 'Total Entries'.
+    """
+    if df.empty:
+        counts = pd.DataFrame(columns=STATUSES, dtype=int)
+        counts.index.name = 'Employee ID'
+        counts['Total Entries'] = 0
+        return counts
+    # Every row counts as an entry, including rows without a Status
+    totals = df.groupby('Employee ID', dropna=False, observed=True).size()
+    counts = df.groupby(['Employee ID', 'Status'], dropna=False, observed=True).size().unstack(fill_value=0)
+    counts = counts.loc[:, counts.columns.notna()]
+    counts = counts.reindex(index=totals.index,
+                            columns=STATUSES + [s for s in counts.columns if s not in STATUSES], fill_value=0)
+    counts['Total Entries'] = totals
+    return counts.fillna(0).astype(int)
+
+
+def summarize_status_counts(
+    df: pd.DataFrame,
+    employee_df: Optional[pd.DataFrame] = None,
+    start=None,
+    end=None
+) -> pd.DataFrame:
+    """
+    Per-employee status totals for any date range, computed in one pass.
+
+    Args:
+        df: attendance rows with ['Employee ID', 'Date', 'Status']
+        employee_df: roster with ['Employee ID', 'Name']; every roster row appears in
+            the result (zeros if the employee has no entries). Without a roster, one
+            row per employee found in `df` is returned.
+        start, end: optional inclusive date range
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS
+    """
+    df = filter_date_range(df, start, end)
+    counts = status_counts_by_employee(df)
+    counts = counts[['Present', 'Late', 'Absent', 'Leave', 'Total Entries']]
+    counts.columns = ['Total Present', 'Total Late', 'Total Absent', 'Total Leave', 'Total Entries']
+
+    if employee_df is None:
+        roster = df[['Employee ID', 'Name']]
+        roster = roster[~_id_keys(roster['Employee ID']).duplicated()]
+    else:
+        roster = employee_df[['Employee ID', 'Name']]
+
+    # IDs are matched as stripped strings (modules.employee_directory.employee_key), so a
+    # roster with numeric IDs still joins attendance rows that stored them as text
+    counts = counts.groupby(_id_keys(counts.index)).sum()
+    summary = roster.merge(counts, left_on=_id_keys(roster['Employee ID']), right_index=True, how='left')
+    count_columns = SUMMARY_COLUMNS[2:]
+    summary[count_columns] = summary[count_columns].fillna(0).astype(int)
+    return summary[SUMMARY_COLUMNS].reset_index(drop=True)
+
+
+def status_totals(df: pd.DataFrame, start=None, end=None) -> Dict[str, int]:
+    """Overall status counts: {'Present': n, 'Late': n, 'Absent': n, 'Leave': n, 'Total': n}."""
+    df = filter_date_range(df, start, end)
+    counts = df['Status'].value_counts() if 'Status' in df.columns else pd.Series(dtype=int)
+    totals = {status: 0 for status in STATUSES}
+    totals.update({status: int(count) for status, count in counts.items()})
+    totals['Total'] = int(len(df))
+    return totals
+
+
+def _id_keys(ids) -> pd.Index:
+    return pd.Index(ids.astype(str).str.strip(), name='Employee ID')
+
+
+def _as_timestamp(value) -> pd.Timestamp:
+    if isinstance(value, str):
+        return pd.to_datetime(value, format='%d/%m/%Y')
+    return pd.Timestamp(value)
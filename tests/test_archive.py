@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.archive import MonthArchive, keys_between, month_key
+from modules.schema import filter_dates, from_typed, to_typed
+
+MONTHS = ['March_2025', 'April_2025', 'May_2025']
+
+
+def month_rows(month_year, seed):
+    """A month of raw attendance rows, with a NaT date and a missing entry time mixed in."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(pd.to_datetime(month_year, format='%B_%Y'), periods=28, freq='D')
+    count = 400
+    rows = pd.DataFrame({
+        'Employee ID': rng.choice([f'E{i}' for i in range(30)], count),
+        'Name': '',
+        'Date': rng.choice(days.strftime('%d/%m/%Y'), count),
+        'Entry_Time': [f'{h:02d}:{m:02d}' for h, m in zip(rng.integers(7, 13, count), rng.integers(0, 60, count))],
+        'Status': rng.choice(['Present', 'Late', 'Half Day', 'Absent'], count),
+    })
+    rows.loc[0, 'Date'] = 'unknown'
+    rows.loc[1, 'Entry_Time'] = None
+    rows['Name'] = 'Name ' + rows['Employee ID']
+    return to_typed(rows)
+
+
+@pytest.fixture(scope='module', params=['parquet', 'npz'])
+def archived(request, tmp_path_factory):
+    archive = MonthArchive(str(tmp_path_factory.mktemp(request.param)), format=request.param)
+    source = {}
+    for seed, month_year in enumerate(MONTHS):
+        source[month_year] = month_rows(month_year, seed)
+        archive.compact(month_year, source[month_year])
+    return archive, source
+
+
+def reference(source, start=None, end=None, emp_id=None, status=None):
+    frames = []
+    for month_year in MONTHS:
+        if month_key(month_year) not in keys_between([month_key(month_year)], start, end):
+            continue
+        typed = source[month_year]
+        # An unbounded query returns every archived row, unparseable dates included
+        raw = from_typed(typed if start is None and end is None else filter_dates(typed, start, end))
+        if emp_id is not None:
+            raw = raw[raw['Employee ID'] == emp_id]
+        if status is not None:
+            raw = raw[raw['Status'] == status]
+        frames.append(raw)
+    return pd.concat(frames, ignore_index=True)
+
+
+def normalized(raw):
+    raw = raw.astype(object).where(raw.notna(), None)
+    order = raw.astype(str).sort_values(list(raw.columns)).index
+    return raw.loc[order].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('start, end, emp_id, status', [
+    (None, None, None, None),
+    ('15/03/2025', '10/04/2025', None, None),
+    ('2025-04-01', '2025-04-30', None, 'Late'),
+    ('01/03/2025', None, 'E7', None),
+    (None, '02/05/2025', 'E3', 'Present'),
+    ('20/04/2025', '20/04/2025', None, None),
+    (None, None, 'nobody', None),
+])
+def test_range_query_matches_the_source(archived, start, end, emp_id, status):
+    archive, source = archived
+    result = from_typed(archive.query(start, end, emp_id=emp_id, status=status))
+    expected = reference(source, start, end, emp_id, status)
+    pd.testing.assert_frame_equal(normalized(result), normalized(expected))
+
+
+def test_query_columns_and_partitions(archived):
+    archive, source = archived
+    assert archive.months() == MONTHS
+    assert archive.partitions()['Rows'].tolist() == [len(source[m]) for m in MONTHS]
+
+    subset = archive.query('01/04/2025', '30/04/2025', columns=['Employee ID', 'Status'])
+    assert list(subset.columns) == ['Employee ID', 'Status']
+    assert len(subset) == len(filter_dates(source['April_2025'], '01/04/2025', '30/04/2025'))
+    with pytest.raises(ValueError):
+        archive.query(columns=['Salary'])
+
+
+def test_compact_rejects_rows_from_another_month(tmp_path):
+    archive = MonthArchive(str(tmp_path))
+    with pytest.raises(ValueError, match='outside'):
+        archive.compact('April_2025', month_rows('May_2025', 0))
+    assert archive.months() == []
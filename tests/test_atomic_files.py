@@ -0,0 +1,86 @@
+import os
+import threading
+
+import pytest
+
+from modules.atomic_files import GENERATIONS_DIR, atomic_write, list_generations
+
+
+def write_text(text):
+    def write(path):
+        with open(path, 'w') as f:
+            f.write(text)
+    return write
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def leftovers(directory):
+    """Temporary or link files a write left behind, anywhere under `directory`."""
+    return [name for _, _, names in os.walk(directory) for name in names if '.tmp' in name or '.link' in name]
+
+
+def test_plain_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / 'report.csv')
+    assert atomic_write(path, write_text('one')) == path
+    atomic_write(path, write_text('two'))
+
+    assert read(path) == 'two'
+    assert list_generations(path) == []
+    assert not leftovers(tmp_path)
+
+
+def test_generations_are_kept_and_pruned(tmp_path):
+    path = str(tmp_path / 'Report.xlsx')
+    written = [atomic_write(path, write_text(f'v{i}'), generations=3) for i in range(1, 6)]
+
+    kept = list_generations(path)
+    assert [os.path.basename(p) for p in kept] == ['Report.g000003.xlsx', 'Report.g000004.xlsx', 'Report.g000005.xlsx']
+    assert kept == written[-3:]
+    assert [read(p) for p in kept] == ['v3', 'v4', 'v5']
+    assert read(path) == 'v5'
+    assert not leftovers(tmp_path)
+
+
+def test_an_open_reader_keeps_its_generation(tmp_path):
+    path = str(tmp_path / 'Report.xlsx')
+    atomic_write(path, write_text('old'), generations=2)
+    with open(path) as reader:
+        atomic_write(path, write_text('new'), generations=2)
+        assert reader.read() == 'old'
+    assert read(path) == 'new'
+
+
+def test_failed_write_leaves_the_original(tmp_path):
+    path = str(tmp_path / 'Report.xlsx')
+    atomic_write(path, write_text('good'), generations=2)
+
+    def broken(tmp_path_):
+        with open(tmp_path_, 'w') as f:
+            f.write('half')
+        raise OSError('disk full')
+
+    for generations in (0, 2):
+        with pytest.raises(OSError, match='disk full'):
+            atomic_write(path, broken, generations=generations)
+    assert read(path) == 'good'
+    assert len(list_generations(path)) == 1
+    assert not leftovers(tmp_path)
+
+
+def test_concurrent_writers_number_generations_uniquely(tmp_path):
+    path = str(tmp_path / 'Report.xlsx')
+    threads = [threading.Thread(target=atomic_write, args=(path, write_text(f'w{i}')), kwargs={'generations': 20})
+               for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    kept = list_generations(path)
+    assert len(kept) == 8
+    assert read(path) in {read(p) for p in kept}
+    assert os.path.isdir(tmp_path / GENERATIONS_DIR) and not leftovers(tmp_path)
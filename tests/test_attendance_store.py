@@ -0,0 +1,193 @@
+from datetime import time
+
+import pandas as pd
+import pytest
+
+from modules.attendance_log import AttendanceLog
+from modules.attendance_store import SQLiteAttendanceStore
+
+MONTH = 'May_2025'
+
+
+def record(emp_id, date_str='05/05/2025', entry_time=time(9, 0), status='Present'):
+    return {'Employee ID': emp_id, 'Name': f'Name {emp_id}', 'Date': date_str,
+            'Entry_Time': entry_time, 'Status': status}
+
+
+def open_store(backend, tmp_path):
+    if backend == 'sqlite':
+        return SQLiteAttendanceStore(str(tmp_path / 'attendance.db'))
+    return AttendanceLog(str(tmp_path / 'logs'))
+
+
+@pytest.fixture(params=['sqlite', 'log'])
+def store(request, tmp_path):
+    store = open_store(request.param, tmp_path)
+    yield store
+    store.close()
+
+
+def test_append_and_load(store):
+    assert store.append_many([record('A'), record('B', status='Late')], MONTH) == 2
+    store.append(record('C', date_str='06/05/2025'), MONTH)
+
+    df = store.load(MONTH)
+    assert sorted(df['Employee ID']) == ['A', 'B', 'C']
+    assert df.loc[df['Employee ID'] == 'A', 'Entry_Time'].iloc[0] == time(9, 0)
+    assert store.has_segment(MONTH)
+    assert MONTH in store.months()
+    assert store.has_entry('B', '05/05/2025', MONTH)
+    assert not store.has_entry('B', '06/05/2025', MONTH)
+    assert store.day_summary('05/05/2025')['Late'] == 1
+
+
+def test_records_survive_reopen(store, tmp_path, request):
+    store.append_many([record('A'), record('B')], MONTH)
+    store.close()
+
+    reopened = open_store(request.node.callspec.params['store'], tmp_path)
+    assert sorted(reopened.load(MONTH)['Employee ID']) == ['A', 'B']
+    assert reopened.has_entry('A', '05/05/2025', MONTH)
+    reopened.close()
+
+
+def test_excel_round_trip(store, tmp_path):
+    raw_file = str(tmp_path / f'Attendance_Raw_{MONTH}.xlsx')
+    pd.DataFrame([record('A'), record('B', status='Late')]).to_excel(raw_file, index=False)
+
+    assert store.import_excel(raw_file, MONTH) == 2
+    assert store.import_excel(raw_file, MONTH) == 0  # only into an empty month
+    exported = store.export_excel(MONTH, str(tmp_path / 'export.xlsx'))
+    assert sorted(pd.read_excel(exported)['Employee ID']) == ['A', 'B']
+
+
+def test_query_filters(store):
+    store.append_many([record('A'), record('B', status='Late'), record('A', date_str='20/05/2025')], MONTH)
+    store.append(record('A', date_str='02/06/2025'), 'June_2025')
+
+    assert len(store.query()) == 4
+    assert sorted(store.query(start='05/05/2025', end='31/05/2025')['Date']) == ['05/05/2025', '05/05/2025',
+                                                                                '20/05/2025']
+    assert list(store.query(emp_id='A', start='01/06/2025')['Date']) == ['02/06/2025']
+    assert list(store.query(status='Late')['Employee ID']) == ['B']
+
+
+def test_delete_date_counts_records(store):
+    store.append_many([record('A'), record('A', entry_time=time(13, 0)), record('B'),
+                       record('C', date_str='06/05/2025')], MONTH)
+
+    assert store.delete_date('05/05/2025', MONTH) == 3
+    assert store.delete_date('05/05/2025', MONTH) == 0
+    assert list(store.load(MONTH)['Employee ID']) == ['C']
+    assert not store.has_entry('A', '05/05/2025', MONTH)
+
+
+def test_delete_one_employee(store):
+    store.append_many([record('A'), record('B')], MONTH)
+
+    assert store.delete_date('05/05/2025', MONTH, emp_id='A') == 1
+    assert list(store.load(MONTH)['Employee ID']) == ['B']
+
+
+def test_mark_after_clear_survives(store):
+    store.append(record('A'), MONTH)
+    store.delete_date('05/05/2025', MONTH)
+    store.append(record('A', entry_time=time(10, 0)), MONTH)
+
+    assert store.has_entry('A', '05/05/2025', MONTH)
+    assert len(store.load(MONTH)) == 1
+
+
+def test_tombstones_and_undo(store):
+    store.append_many([record('A'), record('B')], MONTH)
+    store.delete_date('05/05/2025', MONTH)
+
+    tombstones = store.tombstones(MONTH)
+    assert [(t['month'], t['date'], t['employee_id']) for t in tombstones] == [(MONTH, '05/05/2025', None)]
+    assert store.tombstones('June_2025') == []
+
+    assert store.undo_delete(tombstones[0]['id']) == 2
+    assert store.undo_delete(tombstones[0]['id']) == 0
+    assert store.tombstones(MONTH) == []
+    assert sorted(store.load(MONTH)['Employee ID']) == ['A', 'B']
+    assert store.has_entry('A', '05/05/2025', MONTH)
+
+
+def test_undo_keeps_rows_hidden_by_a_later_tombstone(store):
+    store.append_many([record('A'), record('B')], MONTH)
+    store.delete_date('05/05/2025', MONTH)
+    first = store.tombstones(MONTH)[0]['id']
+    store.append(record('A', entry_time=time(10, 0)), MONTH)
+    store.delete_date('05/05/2025', MONTH, emp_id='A')
+
+    # Undoing the day clear brings back B only: both A rows are covered by the later clear
+    assert store.undo_delete(first) == 1
+    assert list(store.load(MONTH)['Employee ID']) == ['B']
+    assert store.undo_delete(store.tombstones(MONTH)[0]['id']) == 2
+    assert len(store.load(MONTH)) == 3
+
+
+def test_compact_respects_undo_window(store):
+    store.append_many([record('A'), record('B'), record('C', date_str='06/05/2025')], MONTH)
+    store.delete_date('05/05/2025', MONTH)
+
+    assert store.compact(min_age=3600) == 0
+    assert len(store.tombstones(MONTH)) == 1
+
+    assert store.compact(min_age=0) == 2
+    assert store.tombstones(MONTH) == []
+    assert list(store.load(MONTH)['Employee ID']) == ['C']
+    assert store.compact(min_age=0) == 0
+
+
+def test_log_state_survives_reopen(tmp_path):
+    log = AttendanceLog(str(tmp_path / 'logs'))
+    log.append_many([record('A'), record('B')], MONTH)
+    log.delete_date('05/05/2025', MONTH, emp_id='A')
+    log.close()
+
+    reopened = AttendanceLog(str(tmp_path / 'logs'))
+    assert not reopened.has_entry('A', '05/05/2025', MONTH)
+    assert reopened.has_entry('B', '05/05/2025', MONTH)
+    assert reopened.undo_delete(reopened.tombstones(MONTH)[0]['id']) == 1
+    assert reopened.has_entry('A', '05/05/2025', MONTH)
+    reopened.close()
+
+
+def test_undo_is_refused_for_employees_who_checked_in_again(store):
+    store.append_many([record('A'), record('B'), record('C')], MONTH)
+    store.delete_date('05/05/2025', MONTH)
+    tombstone = store.tombstones(MONTH)[0]['id']
+    assert store.undo_conflicts(tombstone) == []
+
+    # A re-checks in after the clear: restoring the old row would give A two entries
+    store.append(record('A', entry_time=time(10, 0)), MONTH)
+    assert store.undo_conflicts(tombstone) == ['A']
+    assert store.undo_conflicts('no such tombstone') == []
+
+
+def test_undo_conflicts_ignore_rows_kept_hidden_by_another_tombstone(store):
+    store.append_many([record('A'), record('B')], MONTH)
+    store.delete_date('05/05/2025', MONTH, emp_id='A')
+    store.delete_date('05/05/2025', MONTH)
+    day_clear = next(t['id'] for t in store.tombstones(MONTH) if t['employee_id'] is None)
+    store.append(record('A', entry_time=time(10, 0)), MONTH)
+
+    # The old A row stays hidden by the employee clear, so only B comes back
+    assert store.undo_conflicts(day_clear) == []
+    assert store.undo_delete(day_clear) == 1
+    assert sorted(store.load(MONTH)['Employee ID']) == ['A', 'B']
+
+
+def test_log_state_survives_reopen(tmp_path):
+    log = AttendanceLog(str(tmp_path / 'logs'))
+    log.append_many([record('A'), record('B')], MONTH)
+    log.delete_date('05/05/2025', MONTH, emp_id='A')
+    log.close()
+
+    reopened = AttendanceLog(str(tmp_path / 'logs'))
+    assert not reopened.has_entry('A', '05/05/2025', MONTH)
+    assert reopened.has_entry('B', '05/05/2025', MONTH)
+    assert reopened.undo_delete(reopened.tombstones(MONTH)[0]['id']) == 1
+    assert reopened.has_entry('A', '05/05/2025', MONTH)
+    reopened.close()
@@ -0,0 +1,91 @@
+import threading
+from datetime import datetime, time
+
+from modules.attendance_log import AttendanceLog
+from modules.checkin_index import CheckinIndex
+
+
+def today():
+    return datetime.now().strftime('%d/%m/%Y')
+
+
+def test_add_and_lookup(tmp_path):
+    index = CheckinIndex(str(tmp_path / 'index.json'))
+    index.add_many([('A', today()), ('B', today()), ('OLD', '01/01/2000')])
+
+    assert index.contains('A', today())
+    assert not index.contains('C', today())
+    assert index.checked_in(today()) == {'A', 'B'}
+    assert index.checked_in('01/01/2000') == set()  # outside the retained days
+
+    index.save()
+    assert CheckinIndex(str(tmp_path / 'index.json')).checked_in(today()) == {'A', 'B'}
+
+
+def test_remove_date_keeps_other_sources(tmp_path):
+    csv_path = tmp_path / 'attendance_log.csv'
+    csv_path.write_text(f'Employee ID,Name,Date\nB,Bob,{today()}\n')
+    index = CheckinIndex(str(tmp_path / 'index.json'))
+    index.add('A', today())
+    index.add('B', today())
+    index.sync_csv(str(csv_path))
+
+    index.remove_date(today())
+    assert index.checked_in(today()) == {'B'}
+
+
+def test_sync_csv_tails_complete_lines(tmp_path):
+    csv_path = tmp_path / 'attendance_log.csv'
+    csv_path.write_text(f'Employee ID,Name,Date\nA,Ann,{today()}\n')
+    index = CheckinIndex(str(tmp_path / 'index.json'))
+    assert index.sync_csv(str(csv_path)) == 1
+
+    with open(csv_path, 'a') as f:
+        f.write(f'B,Bob,{today()}\nC,Cy')  # the last row is still being written
+    assert index.sync_csv(str(csv_path)) == 1
+    assert index.checked_in(today()) == {'A', 'B'}
+
+    with open(csv_path, 'a') as f:
+        f.write(f',{today()}\n')
+    assert index.sync_csv(str(csv_path)) == 1
+    assert index.sync_csv(str(csv_path)) == 0
+    assert index.checked_in(today()) == {'A', 'B', 'C'}
+
+
+def test_sync_store_skips_unchanged_store(tmp_path):
+    store = AttendanceLog(str(tmp_path / 'logs'))
+    month_year = datetime.now().strftime('%B_%Y')
+    store.append({'Employee ID': 'A', 'Name': 'Ann', 'Date': today(), 'Entry_Time': time(9, 0),
+                  'Status': 'Present'}, month_year)
+    index = CheckinIndex(str(tmp_path / 'index.json'))
+
+    assert index.sync_store(store, month_year)
+    assert not index.sync_store(store, month_year)
+    assert index.checked_in(today()) == {'A'}
+    store.close()
+
+
+def test_concurrent_writers_and_readers(tmp_path):
+    index = CheckinIndex(str(tmp_path / 'index.json'))
+    errors = []
+
+    def write(worker):
+        index.add_many((f'E{worker}-{i}', today()) for i in range(200))
+
+    def read(_):
+        try:
+            for _ in range(200):
+                index.checked_in(today())
+                index.contains('E0-0', today())
+        except Exception as e:  # e.g. "dictionary changed size during iteration"
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    threads += [threading.Thread(target=read, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(index.checked_in(today())) == 800
@@ -0,0 +1,59 @@
+import random
+from datetime import datetime, time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.data_cleaning import (
+    convert_to_time, entry_time_micros, format_hhmm, get_late_minutes, late_minutes_from_micros, micros_to_time
+)
+
+ODD_VALUES = [
+    "09:30", "9:30", "09:30:15", "9:30 AM", "09:30 am", "12:00 AM", "12:00 PM", "12:30 pm", "1:02:03 PM",
+    "11:59:59 pm", "13:00 PM", "00:30 AM", "24:00", "23:59:59", "09:60", "09:30:60", "09:5", "9:5:3",
+    "  09:30", "09:30 ", "0930", "9:30PM", "", "abc", None, float('nan'), pd.NaT,
+    time(8, 1, 2), time(23, 59, 59, 999), datetime(2024, 1, 1, 9, 3), 34200, 34259.9, -5, 86400,
+]
+
+
+def per_element(values):
+    """The row-wise path the columnar functions replace."""
+    times = [convert_to_time(value) for value in values]
+    return times, [get_late_minutes(t) for t in times]
+
+
+def assert_matches(values):
+    micros = entry_time_micros(pd.Series(values, dtype=object))
+    times, late = per_element(values)
+    assert list(micros_to_time(micros)) == times
+    assert late_minutes_from_micros(micros).tolist() == late
+
+
+@pytest.mark.parametrize('dominant', ["09:30", "9:30 AM", "09:30:00", "1:05:09 pm", None])
+def test_odd_values_match_convert_to_time(dominant):
+    # The dominant format decides the vectorized layout; everything else is a straggler
+    assert_matches(([dominant] * 200 if dominant else []) + ODD_VALUES)
+
+
+def test_random_strings_match_convert_to_time():
+    rng = random.Random(1)
+    alphabet = "0123456789: APMapm"
+    values = [''.join(rng.choice(alphabet) for _ in range(rng.randint(3, 11))) for _ in range(20000)]
+    assert_matches(["08:45"] * 100 + values)
+    assert_matches(["8:45 PM"] * 100 + values)
+
+
+def test_datetime_and_numeric_columns():
+    stamps = pd.Series(pd.to_datetime(['2025-05-01 09:31:07', None, '2025-05-01 23:59:00']))
+    assert list(micros_to_time(entry_time_micros(stamps))) == [time(9, 31, 7), None, time(23, 59)]
+
+    seconds = pd.Series([34200.0, 34259.9, np.nan, -5.0, 86400.0])
+    expected = [convert_to_time(value) for value in seconds]
+    assert list(micros_to_time(entry_time_micros(seconds))) == expected
+
+
+def test_late_minutes_and_formatting():
+    micros = entry_time_micros(pd.Series(["10:30", "10:31", "10:30:59", "11:45", None, "08:00"]))
+    assert late_minutes_from_micros(micros).tolist() == [0, 1, 0, 75, 0, 0]
+    assert list(format_hhmm(micros)) == ["10:30", "10:31", "10:30", "11:45", None, "08:00"]
@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+import pytest
+
+from modules.employee_directory import EmployeeDirectory
+
+ROSTER = pd.DataFrame({'Employee ID': [101, 102, 'E7'], 'Name': ['Ann Lee', 'Bob Stone', 'Annette Ray']})
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / 'employees_data.csv')
+    ROSTER.to_csv(path, index=False)
+    return path
+
+
+def test_lookups(csv_path):
+    directory = EmployeeDirectory(csv_path)
+
+    assert len(directory) == 3 and '101' in directory and 101 in directory
+    assert directory.name(' E7 ') == 'Annette Ray'
+    assert directory.names(pd.Series([102, 'X'])).tolist() == ['Bob Stone', '']
+    assert [r['Name'] for r in directory.search('ann')] == ['Ann Lee', 'Annette Ray']
+    assert [r['Name'] for r in directory.search('ray')] == ['Annette Ray']
+
+
+def test_replace_persists_for_every_reader(csv_path):
+    directory = EmployeeDirectory(csv_path)
+    other = EmployeeDirectory(csv_path)  # another session or process reading the same file
+    version = directory.version
+
+    directory.replace(pd.DataFrame({'Employee ID': [201], 'Name': ['Cid Park']}))
+
+    assert directory.version == version + 1
+    assert list(directory.frame()['Name']) == ['Cid Park']
+    assert pd.read_csv(csv_path)['Name'].tolist() == ['Cid Park']
+    os.utime(csv_path, ns=(0, 0))  # mtime resolution may hide a same-size rewrite within one tick
+    assert other.name(201) == 'Cid Park' and 101 not in other
+    assert not [name for name in os.listdir(os.path.dirname(csv_path)) if name.endswith('.tmp')]
+
+
+def test_replace_rejects_a_roster_without_the_required_columns(csv_path):
+    directory = EmployeeDirectory(csv_path)
+    with pytest.raises(ValueError, match='Name'):
+        directory.replace(pd.DataFrame({'Employee ID': [1]}))
+    assert len(directory) == 3
+    assert pd.read_csv(csv_path)['Employee ID'].astype(str).tolist() == ['101', '102', 'E7']
+
+
+def test_missing_file_falls_back_to_the_default_roster(tmp_path):
+    directory = EmployeeDirectory(str(tmp_path / 'missing.csv'), ROSTER)
+    assert len(directory) == 3
@@ -0,0 +1,85 @@
+import json
+import os
+import time
+
+import pytest
+
+from modules.ingest_server import IngestServer
+from modules.spool import FAILED_DIR, write_spool_batch
+
+ENTRIES = [{'employee_id': 'A'}, {'employee_id': 'B'}]
+
+
+def failing_commit(failures):
+    """A commit that raises for the first `failures` calls, recording every call."""
+    calls = []
+
+    def commit(entries):
+        calls.append(entries)
+        if len(calls) <= failures:
+            raise OSError("store unavailable")
+    return commit, calls
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def make_server():
+    servers = []
+
+    def make(commit, **kwargs):
+        server = IngestServer(commit, port=0, linger=0.0, retry_delay=0.01, **kwargs)
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def test_failed_batch_is_retried_until_committed(make_server):
+    commit, calls = failing_commit(2)
+    server = make_server(commit)
+    assert server.offer(ENTRIES)
+    wait_for(lambda: server.stats()['committed_entries'] == 2)
+
+    stats = server.stats()
+    assert calls == [ENTRIES] * 3
+    assert stats['errors'] == 2 and stats['dead_lettered'] == 0
+    assert 'store unavailable' in stats['last_error']
+
+
+def test_batch_is_dead_lettered_after_max_attempts(make_server, tmp_path):
+    commit, calls = failing_commit(3)
+    spool_dir = str(tmp_path / 'spool')
+    server = make_server(commit, max_attempts=3,
+                         dead_letter=lambda entries: write_spool_batch(spool_dir, entries, FAILED_DIR))
+    assert server.offer(ENTRIES)
+    wait_for(lambda: server.stats()['dead_lettered'] == 2)
+
+    failed = os.listdir(os.path.join(spool_dir, FAILED_DIR))
+    assert len(failed) == 1
+    with open(os.path.join(spool_dir, FAILED_DIR, failed[0]), encoding='utf-8') as f:
+        assert json.load(f) == ENTRIES
+
+    # The worker moves on: the next batch commits normally
+    assert server.offer([{'employee_id': 'C'}])
+    wait_for(lambda: server.stats()['committed_entries'] == 1)
+    stats = server.stats()
+    assert len(calls) == 4 and stats['errors'] == 3
+
+
+def test_dead_letter_failure_still_counts_the_batch(make_server):
+    def dead_letter(entries):
+        raise OSError("spool unavailable")
+
+    commit, calls = failing_commit(10)
+    server = make_server(commit, max_attempts=2, dead_letter=dead_letter)
+    assert server.offer(ENTRIES)
+    wait_for(lambda: server.stats()['dead_lettered'] == 2)
+    assert len(calls) == 2
@@ -0,0 +1,84 @@
+import threading
+from datetime import datetime, time
+
+import pandas as pd
+import pytest
+
+from modules.attendance_log import AttendanceLog
+from modules.checkin_index import CheckinIndex
+from modules.ingestion import INGEST_LOCK, ingest_batch
+
+DATE = '05/05/2025'
+
+
+def entry(emp_id, unique_id=None, name=''):
+    return {'employee_id': emp_id, 'name': name, 'unique_id': unique_id or f'u-{emp_id}', 'timestamp': ''}
+
+
+def test_new_entries_committed_in_one_write():
+    commits = []
+    details, _ = ingest_batch([entry('A', name='Ann'), entry('B')], DATE, time(9, 0), set(), commits.append,
+                              lookup_names=lambda ids: pd.Series(['Bob'] * len(ids), index=ids.index))
+
+    assert len(commits) == 1
+    assert [(r['Employee ID'], r['Name'], r['Status']) for r in commits[0]] == [('A', 'Ann', 'Present'),
+                                                                                 ('B', 'Bob', 'Present')]
+    assert [e['employee_id'] for e in details['successful_entries']] == ['A', 'B']
+
+
+def test_duplicates_and_invalid_entries_are_not_committed():
+    commits = []
+    entries = [entry('A'), entry('A', unique_id='u-A'), entry('B'), entry('B', unique_id='u-B2'),
+               entry('C'), {'employee_id': '', 'unique_id': 'x'}]
+    details, _ = ingest_batch(entries, DATE, time(9, 30), {'C'}, commits.append)
+
+    assert [r['Employee ID'] for r in commits[0]] == ['A', 'B']
+    assert commits[0][0]['Status'] == 'Late'
+    assert len(details['duplicate_entries']) == 1  # repeated unique_id
+    assert len(details['skipped_entries']) == 3  # B again, C already checked in, missing employee_id
+    assert details['failed_entries'] == []
+
+
+def test_nothing_new_skips_commit():
+    def commit(records):
+        raise AssertionError("commit called without new records")
+
+    details, _ = ingest_batch([entry('A')], DATE, time(9, 0), {'A'}, commit)
+    assert details['successful_entries'] == []
+
+
+def test_commit_failure_is_raised():
+    def commit(records):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        ingest_batch([entry('A'), entry('B')], DATE, time(9, 0), set(), commit)
+
+
+def test_concurrent_ingestion_marks_each_employee_once(tmp_path):
+    """Every path holds INGEST_LOCK from the duplicate check to the commit, as the app does."""
+    index = CheckinIndex(str(tmp_path / 'index.json'))
+    store = AttendanceLog(str(tmp_path / 'logs'))
+    month_year = datetime.now().strftime('%B_%Y')
+    today = datetime.now().strftime('%d/%m/%Y')
+
+    def commit(records):
+        store.append_many(records, month_year)
+        index.add_many((record['Employee ID'], record['Date']) for record in records)
+
+    def ingest(worker):
+        entries = [entry(f'E{i}', unique_id=f'{worker}-{i}') for i in range(50)]
+        for start in range(0, 50, 10):
+            with INGEST_LOCK:
+                ingest_batch(entries[start:start + 10], today, time(9, 0), index.checked_in(today), commit)
+
+    threads = [threading.Thread(target=ingest, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    df = store.load(month_year)
+    assert len(df) == 50
+    assert not df['Employee ID'].duplicated().any()
+    store.close()
@@ -0,0 +1,99 @@
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from modules import parse_cache
+from modules.parse_cache import invalidate, read_cached, sidecar_path
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'employees.csv'
+    path.write_text('Employee ID,Name\n1,Ann\n')
+    return str(path)
+
+
+class CountingReader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return pd.read_csv(path)
+
+
+def set_mtime(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_unchanged_source_is_served_from_the_sidecar(source):
+    reader = CountingReader()
+    first = read_cached(source, reader)
+    second = read_cached(source, reader)
+
+    assert reader.calls == 1
+    assert os.path.exists(sidecar_path(source, 'frame'))
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_touch_with_the_same_content_refreshes_the_stat(source):
+    reader = CountingReader()
+    read_cached(source, reader)
+    set_mtime(source, 10**18)
+
+    read_cached(source, reader)
+    assert reader.calls == 1
+    with open(sidecar_path(source, 'frame'), 'rb') as f:
+        assert pickle.load(f)['mtime_ns'] == 10**18
+
+
+def test_edit_invalidates_the_sidecar(source):
+    reader = CountingReader()
+    read_cached(source, reader)
+    with open(source, 'a') as f:
+        f.write('2,Bob\n')
+
+    assert read_cached(source, reader)['Name'].tolist() == ['Ann', 'Bob']
+    assert reader.calls == 2
+
+
+def test_same_size_edit_with_the_old_mtime_needs_verify_hash(source):
+    reader = CountingReader()
+    read_cached(source, reader)
+    mtime_ns = os.stat(source).st_mtime_ns
+    with open(source, 'w') as f:
+        f.write('Employee ID,Name\n1,Ada\n')
+    set_mtime(source, mtime_ns)
+
+    assert read_cached(source, reader)['Name'].tolist() == ['Ann']  # the stat alone cannot tell
+    assert read_cached(source, reader, verify_hash=True)['Name'].tolist() == ['Ada']
+    assert reader.calls == 2
+
+
+def test_invalidate_and_keys(source):
+    reader = CountingReader()
+    read_cached(source, reader)
+    read_cached(source, reader, key='other')
+    assert reader.calls == 2
+
+    invalidate(source)
+    invalidate(source)  # already gone
+    read_cached(source, reader)
+    read_cached(source, reader, key='other')
+    assert reader.calls == 3
+
+
+def test_unreadable_or_outdated_sidecar_is_rebuilt(source, monkeypatch):
+    reader = CountingReader()
+    read_cached(source, reader)
+    with open(sidecar_path(source, 'frame'), 'wb') as f:
+        f.write(b'not a pickle')
+    read_cached(source, reader)
+    assert reader.calls == 2
+
+    monkeypatch.setattr(parse_cache, 'SIDECAR_VERSION', parse_cache.SIDECAR_VERSION + 1)
+    read_cached(source, reader)
+    read_cached(source, reader)
+    assert reader.calls == 3
@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+
+from modules.report_manifest import frame_digest, manifest_status, record_report, report_is_fresh
+
+
+def frame(**overrides):
+    data = {'Employee ID': ['A', 'B'], 'Name': ['Ann', 'Bob'], 'Status': ['Present', 'Late']}
+    data.update(overrides)
+    return pd.DataFrame(data)
+
+
+def test_digest_follows_content():
+    assert frame_digest(frame(), 'title') == frame_digest(frame(), 'title')
+    assert frame_digest(frame(), 'title') != frame_digest(frame(Status=['Present', 'Present']), 'title')
+    assert frame_digest(frame(), 'title') != frame_digest(frame()[['Name', 'Employee ID', 'Status']], 'title')
+    assert frame_digest(frame(), 'title') != frame_digest(frame(), 'other title')
+
+
+def test_unchanged_report_is_skipped_until_inputs_or_file_change(tmp_path):
+    manifest = str(tmp_path / 'report_manifest.json')
+    report = tmp_path / 'Attendance_Report_May_2025.xlsx'
+    digest = frame_digest(frame())
+    assert not report_is_fresh(manifest, str(report), digest)
+
+    report.write_bytes(b'built')
+    record_report(manifest, str(report), digest, rows=2)
+    assert report_is_fresh(manifest, str(report), digest)
+    assert not report_is_fresh(manifest, str(report), frame_digest(frame(Name=['Ann', 'Bo'])))
+    assert manifest_status(manifest, str(tmp_path))['On Disk'].tolist() == ['Unchanged']
+
+    report.write_bytes(b'edited by hand')
+    assert not report_is_fresh(manifest, str(report), digest)
+    assert manifest_status(manifest, str(tmp_path))['On Disk'].tolist() == ['Modified']
+
+    os.remove(report)
+    assert not report_is_fresh(manifest, str(report), digest)
+    assert manifest_status(manifest, str(tmp_path))['On Disk'].tolist() == ['Missing']
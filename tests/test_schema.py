@@ -0,0 +1,56 @@
+from datetime import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.schema import (
+    concat_typed, filter_dates, from_typed, read_attendance_file, to_typed, write_attendance_file
+)
+
+RAW = pd.DataFrame({
+    'Employee ID': ['101', ' 102', '101', 'E7', '103'],
+    'Name': ['Ann', 'Bob', 'Ann', 'Cid', None],
+    'Date': ['30/04/2025', '01/05/2025', '02/05/2025', '2025-05-02', 'not a date'],
+    'Entry_Time': [time(9, 0), '10:45', '9:15 AM', None, '08:05:59'],
+    'Status': ['Present', 'Late', 'Half Day', None, 'Remote'],
+})
+
+
+def test_round_trip_keeps_the_workbook_values():
+    typed = to_typed(RAW)
+    raw = from_typed(typed)
+
+    assert raw['Employee ID'].tolist() == ['101', '102', '101', 'E7', '103']
+    assert raw['Date'].tolist() == ['30/04/2025', '01/05/2025', '02/05/2025', '02/05/2025', None]
+    assert raw['Entry_Time'].tolist() == [time(9, 0), time(10, 45), time(9, 15), None, time(8, 5)]
+    assert raw['Status'].where(raw['Status'].notna(), None).tolist() == ['Present', 'Late', 'Half Day', None, 'Remote']
+    assert raw['Name'].where(raw['Name'].notna(), None).tolist() == ['Ann', 'Bob', 'Ann', 'Cid', None]
+
+    # A second pass changes nothing
+    pd.testing.assert_frame_equal(from_typed(to_typed(raw)), raw)
+
+
+def test_typed_columns_are_compact():
+    typed = to_typed(RAW)
+    assert typed['Entry_Minute'].dtype == np.int16
+    assert isinstance(typed['Date'].dtype, pd.CategoricalDtype) and typed['Date'].cat.ordered
+    assert isinstance(typed['Status'].dtype, pd.CategoricalDtype)
+    assert list(typed['Status'].cat.categories[-1:]) == ['Remote']
+
+
+def test_concat_unions_categories_and_filters_dates():
+    typed = concat_typed([to_typed(RAW.iloc[:2]), to_typed(RAW.iloc[2:])])
+    assert isinstance(typed['Employee ID'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(from_typed(typed), from_typed(to_typed(RAW)).reset_index(drop=True))
+
+    may = filter_dates(typed, '01/05/2025', '2025-05-31')
+    assert from_typed(may)['Employee ID'].tolist() == ['102', '101', 'E7']
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.xlsx'])
+def test_file_round_trip(tmp_path, suffix):
+    path = str(tmp_path / f'attendance{suffix}')
+    typed = to_typed(RAW.iloc[:4])
+    write_attendance_file(typed, path)
+    pd.testing.assert_frame_equal(from_typed(read_attendance_file(path)), from_typed(typed).reset_index(drop=True))
@@ -0,0 +1,102 @@
+import os
+import time
+
+import pytest
+
+from modules.spool import CLAIMED_DIR, FAILED_DIR, SpoolConsumer, write_spool_batch
+
+
+def accept_all_saved(outcome):
+    return not outcome['failed_entries']
+
+
+@pytest.fixture
+def make_consumer(tmp_path):
+    consumers = []
+
+    def make(handler, **kwargs):
+        kwargs.setdefault('poll_interval', 0.01)
+        consumer = SpoolConsumer(str(tmp_path / 'spool'), handler, accept=accept_all_saved, **kwargs)
+        consumers.append(consumer)
+        return consumer
+
+    yield make
+    for consumer in consumers:
+        consumer.stop()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def files(consumer, sub_dir):
+    return [name for name in os.listdir(os.path.join(consumer.spool_dir, sub_dir)) if name.endswith('.json')]
+
+
+def test_handled_batch_is_removed(make_consumer):
+    received = []
+    consumer = make_consumer(lambda entries: received.extend(entries) or {'failed_entries': []})
+    write_spool_batch(consumer.spool_dir, [{'employee_id': 'A'}, {'employee_id': 'B'}])
+
+    wait_for(lambda: consumer.status()['batches'] == 1)
+    assert [entry['employee_id'] for entry in received] == ['A', 'B']
+    assert files(consumer, CLAIMED_DIR) == [] and files(consumer, FAILED_DIR) == []
+    assert consumer.status()['pending'] == 0
+
+
+def test_failing_batch_is_retried_then_kept_in_failed(make_consumer):
+    attempts = []
+
+    def handler(entries):
+        attempts.append(len(entries))
+        raise OSError("store unavailable")
+
+    consumer = make_consumer(handler, retry_delay=0.02, max_attempts=3)
+    write_spool_batch(consumer.spool_dir, [{'employee_id': 'A'}])
+
+    wait_for(lambda: files(consumer, FAILED_DIR))
+    assert attempts == [1, 1, 1]
+    assert files(consumer, CLAIMED_DIR) == []
+    assert consumer.status()['failed'] == 1
+    assert all(result['error'] == "store unavailable" for result in consumer.results_since(0))
+
+
+def test_batch_with_unsaved_entries_is_kept(make_consumer):
+    consumer = make_consumer(lambda entries: {'failed_entries': [{'employee_id': 'A'}]}, retry_delay=60)
+    write_spool_batch(consumer.spool_dir, [{'employee_id': 'A'}])
+
+    wait_for(lambda: consumer.status()['retrying'] == 1)
+    assert len(files(consumer, CLAIMED_DIR)) == 1
+    assert consumer.results_since(0)[-1]['error']
+
+
+def test_batch_recovers_after_a_failure(make_consumer):
+    attempts = []
+
+    def handler(entries):
+        attempts.append(len(entries))
+        if len(attempts) == 1:
+            raise OSError("store unavailable")
+        return {'failed_entries': []}
+
+    consumer = make_consumer(handler, retry_delay=0.02)
+    write_spool_batch(consumer.spool_dir, [{'employee_id': 'A'}])
+
+    wait_for(lambda: len(attempts) == 2 and consumer.status()['retrying'] == 0)
+    assert files(consumer, CLAIMED_DIR) == [] and files(consumer, FAILED_DIR) == []
+
+
+def test_retry_failed_requeues(make_consumer):
+    healthy = []
+    consumer = make_consumer(lambda entries: {'failed_entries': [] if healthy else ['A']},
+                             retry_delay=0.01, max_attempts=1)
+    write_spool_batch(consumer.spool_dir, [{'employee_id': 'A'}])
+    wait_for(lambda: files(consumer, FAILED_DIR))
+
+    healthy.append(True)
+    assert consumer.retry_failed() == 1
+    wait_for(lambda: consumer.status()['pending'] == 0 and not files(consumer, FAILED_DIR))
+    assert consumer.results_since(0)[-1]['error'] is None
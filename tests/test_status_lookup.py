@@ -0,0 +1,68 @@
+import os
+import shutil
+from datetime import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import status_lookup
+from modules.status_lookup import FEATURES, MINUTES_PER_DAY, StatusLookup, get_status_lookup, lookup_features
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'best_rf_model.pkl')
+
+pytestmark = pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="best_rf_model.pkl not available")
+
+
+@pytest.fixture(scope='module')
+def model():
+    return joblib.load(MODEL_PATH)
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    path = tmp_path / 'model.pkl'
+    shutil.copy(MODEL_PATH, path)
+    return str(path)
+
+
+def test_table_matches_model_for_every_minute(model, model_path):
+    lookup = get_status_lookup(model_path, load_model=joblib.load)
+    features = lookup_features()
+    assert len(features) == MINUTES_PER_DAY + 1
+
+    expected = np.asarray(model.predict(features[FEATURES])).astype(str)
+    minutes = np.append(np.arange(MINUTES_PER_DAY), -1)
+    assert (lookup.predict_minutes(minutes) == expected).all()
+    assert lookup.validate(model).empty
+
+
+def test_entry_times_match_predict_attendance(model, model_path):
+    lookup = get_status_lookup(model_path, load_model=joblib.load)
+    entry_times = pd.Series(["08:00", "10:30", "10:31:59", "9:45 AM", "01:15 PM", "23:59:59", None, "bad", time(11, 0)])
+    assert lookup.validate(model, entry_times).empty
+    assert lookup.predict("10:45") == lookup.predict_many(pd.Series(["10:45"]))[0]
+
+
+def test_table_is_reused_until_the_model_changes(model_path, tmp_path):
+    table_path = str(tmp_path / 'table.npz')
+    calls = []
+
+    def load_model(path):
+        calls.append(path)
+        return joblib.load(path)
+
+    first = get_status_lookup(model_path, table_path, load_model=load_model)
+    saved = StatusLookup.load(table_path)
+    assert np.array_equal(saved.codes, first.codes) and np.array_equal(saved.classes, first.classes)
+
+    # A fresh process loads the saved table without touching the model
+    status_lookup._compiled.clear()
+    get_status_lookup(model_path, table_path, load_model=load_model)
+    assert len(calls) == 1
+
+    # A replaced model file (new mtime) recompiles the table
+    os.utime(model_path, ns=(0, 0))
+    get_status_lookup(model_path, table_path, load_model=load_model)
+    assert len(calls) == 2
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.schema import to_typed
+from modules.status_summary import SUMMARY_COLUMNS, STATUSES, status_totals, summarize_status_counts
+
+
+def loop_summary(df, employee_df):
+    """The per-employee loop the monthly report used before it was vectorized."""
+    summary = []
+    for _, emp_row in employee_df.iterrows():
+        emp_entries = df[df['Employee ID'] == emp_row['Employee ID']]
+        summary.append({
+            'Employee ID': emp_row['Employee ID'],
+            'Name': emp_row['Name'],
+            'Total Present': len(emp_entries[emp_entries['Status'] == 'Present']),
+            'Total Late': len(emp_entries[emp_entries['Status'] == 'Late']),
+            'Total Absent': len(emp_entries[emp_entries['Status'] == 'Absent']),
+            'Total Leave': len(emp_entries[emp_entries['Status'] == 'Leave']),
+            'Total Entries': len(emp_entries),
+        })
+    return pd.DataFrame(summary, columns=SUMMARY_COLUMNS)
+
+
+def month(rows=3000, employees=60, seed=3):
+    rng = np.random.default_rng(seed)
+    statuses = np.array(STATUSES + ['Half Day', None], dtype=object)
+    return pd.DataFrame({
+        'Employee ID': [f'E{i:03d}' for i in rng.integers(0, employees, rows)],
+        'Name': '',
+        'Date': [f'{day:02d}/05/2025' for day in rng.integers(1, 32, rows)],
+        'Entry_Time': '09:00',
+        'Status': statuses[rng.integers(0, len(statuses), rows)],
+    })
+
+
+def roster(employees=70):
+    # A few roster employees have no entries at all
+    return pd.DataFrame({'Employee ID': [f'E{i:03d}' for i in range(employees)],
+                         'Name': [f'Employee {i}' for i in range(employees)]})
+
+
+@pytest.mark.parametrize('typed', [False, True])
+def test_matches_the_per_employee_loop(typed):
+    df = month()
+    expected = loop_summary(df, roster())
+    result = summarize_status_counts(to_typed(df) if typed else df, roster())
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_rows_without_status_still_count_as_entries():
+    df = pd.DataFrame({'Employee ID': ['A', 'B', 'B'], 'Name': ['Ann', 'Bob', 'Bob'],
+                       'Date': ['01/05/2025'] * 3, 'Status': [np.nan, 'Late', None]})
+    result = summarize_status_counts(df, pd.DataFrame({'Employee ID': ['A', 'B'], 'Name': ['Ann', 'Bob']}))
+    assert result['Total Entries'].tolist() == [1, 2]
+    assert result['Total Late'].tolist() == [0, 1]
+    pd.testing.assert_frame_equal(result, loop_summary(df, pd.DataFrame({'Employee ID': ['A', 'B'],
+                                                                         'Name': ['Ann', 'Bob']})),
+                                  check_dtype=False)
+
+
+def test_numeric_roster_ids_join_text_ids():
+    df = pd.DataFrame({'Employee ID': ['1', ' 2'], 'Name': ['Ann', 'Bob'], 'Date': ['01/05/2025'] * 2,
+                       'Status': ['Present', 'Late']})
+    result = summarize_status_counts(df, pd.DataFrame({'Employee ID': [1, 2, 3], 'Name': ['Ann', 'Bob', 'Cy']}))
+    assert result['Employee ID'].tolist() == [1, 2, 3]
+    assert result['Total Entries'].tolist() == [1, 1, 0]
+
+
+def test_date_range_and_totals():
+    df = month()
+    in_range = df[df['Date'].str[:2].astype(int) <= 10]
+    pd.testing.assert_frame_equal(summarize_status_counts(df, roster(), start='01/05/2025', end='10/05/2025'),
+                                  loop_summary(in_range, roster()), check_dtype=False)
+    totals = status_totals(df)
+    assert totals['Total'] == len(df)
+    assert totals['Late'] == int((df['Status'] == 'Late').sum())